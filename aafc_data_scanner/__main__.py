@@ -4,6 +4,8 @@ user with a complete inventory of datasets and resources in csv files.
 """
 
 import atexit
+import multiprocessing
+import shutil
 from typing import List, NoReturn
 import warnings
 from colorama import Fore
@@ -11,7 +13,9 @@ from pathlib import Path
 
 from .constants import REGISTRY_BASE_URL, CATALOGUE_BASE_URL, AAFC_ORG_ID
 from .tools import RequestsDataCatalogue, DriverDataCatalogue
+from .helper_functions import fill_missing
 from .inventories import Inventory
+from .previous import PreviousInventory
 
 
 
@@ -19,7 +23,6 @@ from .inventories import Inventory
 warnings.filterwarnings('ignore', category=FutureWarning)
 
 
-@atexit.register
 def display_exit_message() -> NoReturn:
     """Closes WebDriver(s) and asks user to click enter when program ends, so 
     user has time to read all logged messages if needed before closing 
@@ -38,6 +41,9 @@ def display_exit_message() -> NoReturn:
 def main() -> NoReturn:
     """Main code."""
 
+    # (registered here, not when parsing processes import this module)
+    atexit.register(display_exit_message)
+
     print()
     print(Fore.YELLOW + '\tAAFC Data Scanner' + Fore.RESET)
 
@@ -54,8 +60,21 @@ def main() -> NoReturn:
               'installed on your computer \nand allows you to automatically',
               'authenticate as an AAFC employee.')
 
+    # prompts user for bounded memory (for very large scans)
+    spill_dir = None
+    print('\nDo you wish to keep memory bounded by spilling collected rows',
+          'to disk (for very large scans)?')
+    print(Fore.CYAN + 'Enter y for yes:' + Fore.RESET, end=" ")
+    response = str(input())
+    if response.lower() == 'y':
+        spill_dir = './inventories/spill/'
+
     print('\nCommencing scan.')
-    inventory = Inventory()
+    # unchanged datasets and resources are taken from the latest inventories
+    previous = PreviousInventory.load('./inventories/')
+    print(f'{len(previous.datasets)} datasets and {len(previous.resources)}',
+          'resources were loaded from the latest inventories.')
+    inventory = Inventory(previous=previous, spill_dir=spill_dir)
 
 
 
@@ -114,30 +133,50 @@ def main() -> NoReturn:
 
     # FINISHING
 
-    # Announcing total number of datasets and resources
-    print()
-    print(Fore.YELLOW + f'{len(inventory.datasets)}' + Fore.RESET,
-            'datasets and',
-            Fore.YELLOW + f'{len(inventory.resources)}' + Fore.RESET,
-            'resources were found.')
-
-    # Adding modified dates and compliances checks
-    inventory.complete_missing_fields()
-    # Completing empty fields
-    inventory.datasets = inventory.datasets.fillna({
+    fill_values = {
         'on_registry': False,
         'on_catalogue': False,
         'org': 'aafc-aac',
-        'org_title': 'Agriculture and Agri-Food Canada'})
-
-    # Exporting inventories
-    print()
-    inventory.export_datasets(path='./inventories/')
-    inventory.export_resources(path='./inventories/')
-    inventory.export_datasets(path='./inventories/',
-                              filename='_latest_datasets_inventory.csv')
-    inventory.export_resources(path='./inventories/',
-                               filename='_latest_resources_inventory.csv')
+        'org_title': 'Agriculture and Agri-Food Canada'}
+
+    if spill_dir:
+        # Completing, filling, validating and exporting spilled inventories
+        # chunk by chunk
+        datasets_path, resources_path = inventory.export_spilled(
+            path='./inventories/', fill_values=fill_values)
+        shutil.copyfile(datasets_path,
+                        './inventories/_latest_datasets_inventory.csv')
+        shutil.copyfile(resources_path,
+                        './inventories/_latest_resources_inventory.csv')
+        inventory.discard_spilled()
+    else:
+        # Announcing total number of datasets and resources
+        print()
+        print(Fore.YELLOW + f'{len(inventory.datasets)}' + Fore.RESET,
+                'datasets and',
+                Fore.YELLOW + f'{len(inventory.resources)}' + Fore.RESET,
+                'resources were found.')
+
+        # Adding modified dates and compliances checks
+        inventory.complete_missing_fields()
+        # Completing empty fields
+        inventory.datasets = fill_missing(inventory.datasets, fill_values)
+
+        # Validating inventories against their schemas
+        inventory.validate()
+
+        # Exporting inventories
+        print()
+        inventory.export_datasets(path='./inventories/')
+        inventory.export_resources(path='./inventories/')
+        inventory.export_datasets(path='./inventories/',
+                                  filename='_latest_datasets_inventory.csv')
+        inventory.export_resources(path='./inventories/',
+                                   filename='_latest_resources_inventory.csv')
+    inventory.export_hosts_telemetry(path='./inventories/',
+                                     filename='_latest_hosts_telemetry.csv')
+    inventory.export_violations(path='./inventories/',
+                                filename='_latest_violations.csv')
 
     check_broken_links = False
     print('\n\nWould you like a report on the current broken links\nwithin the Catalogue?')
@@ -151,4 +190,5 @@ def main() -> NoReturn:
         checkbrokenlinks()
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # for parsing processes, once frozen
     main()
@@ -0,0 +1,192 @@
+"""Contains AsyncLinkChecker class, an asyncio engine checking the urls of
+very large resource sets with thousands of requests in flight (requires
+aiohttp, see the async extra).
+"""
+
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests.structures import CaseInsensitiveDict
+import validators
+
+from .constants import (ASYNC_MAX_CONNECTIONS, ASYNC_PER_HOST_CONNECTIONS,
+                        HEAD_FALLBACK_STATUSES, URL_STATUS_CIRCUIT_OPEN)
+from .tools import TenaciousSession, UrlInfo, UrlRule
+
+
+def _import_aiohttp() -> Any:
+    """Returns the aiohttp module, an optional dependency."""
+    try:
+        import aiohttp # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError('The async link engine requires aiohttp: install '
+                          'it with the async extra (e.g. poetry install -E '
+                          'async) or use the threads link engine.') from e
+    return aiohttp
+
+
+class _ConnectionFailure(Exception):
+    """Raised when a host cannot be connected to or does not answer in
+    time (counted by the circuit breaker, like requests' ConnectionError
+    and Timeout).
+    """
+
+
+@dataclass
+class AsyncLinkChecker:
+    """Checks urls with aiohttp, keeping thousands of HEAD requests in flight
+    with a small memory footprint: a fixed pool of max_connections worker
+    coroutines taking the urls one by one, and a connection pool limited per
+    host, reusing keep-alive connections. Results have the same semantics as
+    TenaciousSession.get_url_info (url rules, -1 and -2 codes, GET fallback
+    and per-host method memory, retries on connection errors and statuses
+    429/5xx, redirects followed, proxies of the HTTP(S)_PROXY and NO_PROXY
+    environment variables), share its circuit breaker and are recorded in
+    its telemetry.
+    """
+
+    max_connections: int = ASYNC_MAX_CONNECTIONS
+    """Maximum number of requests in flight."""
+
+    per_host: int = ASYNC_PER_HOST_CONNECTIONS
+    """Maximum number of requests in flight to the same host."""
+
+    skip_ssl: bool = True
+    """If SSL certificates must not be verified."""
+
+    connect_timeout: float = 5
+    """Connect timeout of each request, in seconds."""
+
+    read_timeout: float = 10
+    """Read timeout of each request (unless set by a url rule), in seconds."""
+
+    retries: int = 2
+    """Number of retries on connection errors and statuses 429/5xx."""
+
+    backoff_factor: float = 0.5
+    """Backoff factor between retries (as for urllib3's Retry)."""
+
+    max_redirects: int = 30
+    """Maximum number of redirects followed for each url."""
+
+    user_agent: str = 'AAFC-Scanner/1.0 (+asyncio)'
+    """User-Agent header sent with each request."""
+
+    def check_all(self, urls: Iterable[str],
+                  deadline: Optional[float] = None) -> Dict[str, UrlInfo]:
+        """Checks the given urls (each distinct url once) and returns their
+        results by url. If a deadline is given (as time.monotonic() value),
+        no new url is sent once it is reached; the urls left out are not
+        part of the result.
+        """
+        unique_urls: List[str] = [url for url in dict.fromkeys(urls)
+                                  if isinstance(url, str)]
+        return asyncio.run(self._check_all(unique_urls, deadline))
+
+    async def _check_all(self, urls: List[str],
+                         deadline: Optional[float]) -> Dict[str, UrlInfo]:
+        aiohttp = _import_aiohttp()
+        results: Dict[str, UrlInfo] = {}
+        # (shared by the workers: each url is taken by a single one)
+        pending: Iterator[str] = iter(urls)
+        connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                         limit_per_host=self.per_host,
+                                         ssl=not self.skip_ssl)
+        async with aiohttp.ClientSession(
+                connector=connector, trust_env=True,
+                headers={'User-Agent': self.user_agent}) as session:
+
+            async def work() -> None:
+                for url in pending:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return
+                    results[url] = await self.get_url_info(session, url)
+
+            await asyncio.gather(*(work() for _ in range(
+                min(self.max_connections, len(urls)))))
+        return results
+
+    async def get_url_info(self, session: Any, url: str) -> UrlInfo:
+        """Returns the result of the url check (see
+        TenaciousSession.get_url_info), requested with the given aiohttp
+        ClientSession.
+        """
+        rule: Optional[UrlRule] = TenaciousSession.url_classifier.classify(url)
+        if rule is not None and rule.status is not None:
+            return UrlInfo(rule.status)
+        if not validators.url(url):
+            return UrlInfo(-1)
+        read_timeout: float = (rule.timeout if rule is not None and
+                               rule.timeout is not None else self.read_timeout)
+
+        host: str = urlsplit(url).netloc.lower()
+        breaker = TenaciousSession.circuit_breaker
+        if not breaker.allow(host):
+            return UrlInfo(URL_STATUS_CIRCUIT_OPEN)
+        method: str = ((rule.method if rule is not None else None)
+                       or TenaciousSession.host_methods.get(host, 'HEAD'))
+        try:
+            status, headers = await self._send_and_retry(session, method, url,
+                                                         read_timeout)
+            if method == 'HEAD' and status in HEAD_FALLBACK_STATUSES:
+                # host may reject HEAD only: double checks with a GET
+                status, headers = await self._send_and_retry(
+                    session, 'GET', url, read_timeout)
+                if status not in HEAD_FALLBACK_STATUSES:
+                    TenaciousSession.host_methods[host] = 'GET'
+        except _ConnectionFailure:
+            breaker.record_failure(host)
+            return UrlInfo(-1)
+        except Exception: # pylint: disable=broad-exception-caught
+            breaker.release(host)
+            return UrlInfo(-1)
+        breaker.record_success(host)
+        if (rule is not None and rule.found_status is not None
+                and status != 404):
+            status, headers = rule.found_status, CaseInsensitiveDict()
+        return UrlInfo.from_headers(status, headers)
+
+    async def _send_and_retry(self, session: Any, method: str, url: str,
+                              read_timeout: float
+                              ) -> Tuple[int, CaseInsensitiveDict]:
+        """Sends the request (a ranged GET for GET requests), following
+        redirects and retrying on connection errors and statuses 429/5xx,
+        records it in the telemetry and returns the final status and headers
+        (the body is never read).
+        """
+        aiohttp = _import_aiohttp()
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                        sock_read=read_timeout)
+        request_headers: Dict[str, str] = ({'Range': 'bytes=0-0'}
+                                           if method == 'GET' else {})
+        start = time.perf_counter()
+        attempt: int = 0
+        while True:
+            try:
+                async with session.request(
+                        method, url, headers=request_headers, timeout=timeout,
+                        max_redirects=self.max_redirects) as response:
+                    status: int = response.status
+                    headers = CaseInsensitiveDict(response.headers)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientHttpProxyError,
+                    asyncio.TimeoutError) as e:
+                # (refused proxy tunnels count as connection failures, as
+                # requests' ProxyError)
+                if attempt >= self.retries:
+                    TenaciousSession.telemetry.record(
+                        url, method, time.perf_counter() - start, None,
+                        attempt, type(e).__name__)
+                    raise _ConnectionFailure(url) from e
+            else:
+                if (status not in (429, 500, 502, 503, 504)
+                        or attempt >= self.retries):
+                    TenaciousSession.telemetry.record(
+                        url, method, time.perf_counter() - start, status,
+                        attempt, None)
+                    return status, headers
+            attempt += 1
+            if attempt > 1:
+                await asyncio.sleep(self.backoff_factor * 2 ** (attempt - 1))
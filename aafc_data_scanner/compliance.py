@@ -0,0 +1,355 @@
+"""Contains ResourceGroups, Rule and Compliance classes, completing the
+datasets' compliance columns with a registry of rules evaluated over a
+single grouping of the resources by dataset.
+"""
+
+from dataclasses import dataclass, field
+import datetime as dt
+from functools import cached_property
+import time
+from typing import Any, Callable, Dict, List, NoReturn, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .constants import SPEC_TITLE_PATTERN
+from .data import FORMATS, FORMAT_ALIASES
+from .helper_functions import date_ago, normalize_formats, parse_dates
+
+
+def _formats_index() -> pd.DataFrame:
+    """Returns FORMATS' format types and openness by normalized format name
+    (see normalize_formats), their aliases (FORMAT_ALIASES) included.
+    """
+    names: List[str] = list(FORMATS['format']) + list(FORMAT_ALIASES)
+    formats: pd.DataFrame = (
+        FORMATS.set_index('format')
+        .loc[list(FORMATS['format']) + list(FORMAT_ALIASES.values()),
+             ['format_type', 'open']])
+    formats.index = normalize_formats(pd.Series(names)).to_numpy()
+    return formats
+
+
+FORMATS_INDEX: pd.DataFrame = _formats_index()
+"""Index of files formats' types and openness, built once."""
+
+
+def frequency_cutoff(frequency: Any,
+                     now: dt.datetime) -> Optional[dt.datetime]:
+    """Returns the oldest last date modified of an up to date dataset, given
+    its update frequency (stored in formats as P1D, P3W, P6M, P1Y, etc.), or
+    None if no update is planned or the frequency cannot be read (such
+    datasets being considered up to date).
+    """
+    if isinstance(frequency, str) and frequency.startswith("P") and frequency != "PT1S":
+        full_unit: Dict[str, str] = {"D": "day", "W": "week", "M": "month", "Y": "year"}
+        try:
+            unit: str = full_unit[frequency[-1]]
+            n: float = float(frequency[1:-1])  # e.g., 1, 2, 0.5 ...
+        except Exception:
+            # Malformed frequency → treat like "no plan" (up to date)
+            return None
+        return date_ago(n, unit, from_=now)
+    # No update explicitly planned → up to date
+    return None
+
+
+@dataclass
+class ResourceGroups:
+    """Resources grouped by dataset once (dataset ids factorized into group
+    codes), shared by all the compliance rules: rules aggregate resources'
+    values by group, then map the groups' results onto the datasets.
+    """
+
+    datasets: pd.DataFrame
+    """Datasets whose columns are completed (rules see the columns completed
+    by the rules evaluated before them).
+    """
+
+    resources: pd.DataFrame
+    """Resources of the datasets."""
+
+    reports: Dict[str, Any] = field(default_factory=dict)
+    """Findings reported by the rules (e.g. unknown formats), by name."""
+
+    @classmethod
+    def group(cls, datasets: pd.DataFrame,
+              resources: pd.DataFrame) -> 'ResourceGroups':
+        """Returns the given resources grouped by dataset (grouped once, when
+        first aggregated).
+        """
+        return cls(datasets, resources)
+
+    def prepare(self) -> None:
+        """Groups the resources now, rather than when first aggregated (e.g.
+        to time the grouping apart from the rules).
+        """
+        _ = self.dataset_groups
+
+    @cached_property
+    def _factorized(self) -> Tuple[np.ndarray, pd.Index]:
+        codes, ids = pd.factorize(self.resources['dataset_id'].astype(object))
+        return codes, pd.Index(ids)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Group of each resource (-1 for resources without dataset id)."""
+        return self._factorized[0]
+
+    @property
+    def ids(self) -> pd.Index:
+        """Dataset id of each group."""
+        return self._factorized[1]
+
+    @cached_property
+    def dataset_groups(self) -> np.ndarray:
+        """Group of each dataset (-1 for datasets without resources)."""
+        return self.ids.get_indexer(pd.Index(self.datasets['id'],
+                                             dtype=object))
+
+    def column(self, name: str) -> pd.Series:
+        """Returns the named column of the resources (missing values only,
+        if they do not have it).
+        """
+        if name in self.resources.columns:
+            return self.resources[name]
+        return pd.Series(None, index=self.resources.index, dtype=object)
+
+    def count(self, mask: pd.Series) -> np.ndarray:
+        """Returns the number of resources in mask, by group."""
+        grouped: np.ndarray = self.codes >= 0
+        return np.bincount(self.codes[grouped],
+                           weights=mask.to_numpy(dtype=bool)[grouped],
+                           minlength=len(self.ids)).astype(int)
+
+    def any(self, mask: pd.Series) -> np.ndarray:
+        """Returns whether any resource is in mask, by group."""
+        return self.count(mask) > 0
+
+    def all_by(self, mask: pd.Series, by: pd.Series) -> np.ndarray:
+        """Returns whether, by group, each distinct value of by (of its
+        resources) has at least one resource in mask (resources whose by is
+        missing being ignored).
+        """
+        values, uniques = pd.factorize(by.astype(object))
+        grouped: np.ndarray = (self.codes >= 0) & (values >= 0)
+        keys: np.ndarray = (self.codes[grouped] * len(uniques)
+                            + values[grouped])
+        size: int = len(self.ids) * len(uniques)
+        present: np.ndarray = np.bincount(keys, minlength=size)
+        hits: np.ndarray = np.bincount(
+            keys, weights=mask.to_numpy(dtype=bool)[grouped], minlength=size)
+        lacking: np.ndarray = (present > 0) & (hits == 0)
+        return ~lacking.reshape(len(self.ids), len(uniques)).any(axis=1)
+
+    def max(self, *values: pd.Series) -> pd.Series:
+        """Returns the max of the given resources' values (e.g. dates), by
+        group (missing for groups without any).
+        """
+        grouped: np.ndarray = self.codes >= 0
+        stacked: pd.Series = pd.concat([v[grouped] for v in values],
+                                       ignore_index=True)
+        return (stacked.groupby(np.tile(self.codes[grouped], len(values)))
+                .max().reindex(range(len(self.ids))))
+
+    def for_datasets(self, values: Any, default: Any) -> pd.Series:
+        """Returns the given values by group as values by dataset (indexed as
+        the datasets), datasets without resources getting default.
+        """
+        values = np.asarray(values)
+        result: np.ndarray = np.full(
+            len(self.dataset_groups), default,
+            dtype=object if default is None else values.dtype)
+        has_resources: np.ndarray = self.dataset_groups >= 0
+        result[has_resources] = values[self.dataset_groups[has_resources]]
+        return pd.Series(result, index=self.datasets.index)
+
+
+@dataclass
+class Rule:
+    """Compliance rule completing a column of the datasets table."""
+
+    column: str
+    """Column of the datasets table completed by the rule."""
+
+    message: str
+    """Message printed when the rule is evaluated."""
+
+    evaluate: Callable[[ResourceGroups, dt.datetime], pd.Series]
+    """Function returning the column's values for all datasets (indexed as
+    them), given the resources grouped by dataset and the current time.
+    """
+
+    depends_on_now: bool = False
+    """Whether the rule's values depend on the current time (evaluated for
+    all datasets, even unchanged ones, on incremental evaluations).
+    """
+
+
+def modified(groups: ResourceGroups, _now: dt.datetime) -> pd.Series:
+    """Last date modified of each dataset (see Inventory.infer_modified):
+    the last of its resources' created, metadata_modified and (for non html
+    pages) server_modified dates, as ISO strings.
+    """
+    html: pd.Series = (groups.column('content_type').astype('string')
+                       .str.startswith('text/html').fillna(False))
+    last_modified: pd.Series = groups.max(
+        parse_dates(groups.column('created')),
+        parse_dates(groups.column('metadata_modified')),
+        parse_dates(groups.column('server_modified')).mask(html))
+    dates: pd.Series = last_modified.dt.floor('us').map(
+        lambda date: date.isoformat(), na_action='ignore')
+    return groups.for_datasets(dates.astype(object).where(dates.notna(), None),
+                               None)
+
+
+def up_to_date(groups: ResourceGroups, now: dt.datetime) -> pd.Series:
+    """Currency of each dataset (see Inventory.get_up_to_date), given its
+    frequency and last date modified: oldest valid dates are computed once
+    per distinct frequency.
+    """
+    datasets: pd.DataFrame = groups.datasets
+    frequencies: pd.Series = datasets['frequency'].astype(object)
+    cutoffs: Dict[str, Optional[dt.datetime]] = {
+        frequency: frequency_cutoff(frequency, now)
+        for frequency in frequencies.dropna().unique()}
+    cutoff: pd.Series = pd.to_datetime(frequencies.map(cutoffs))
+    last_modified: pd.Series = parse_dates(datasets['modified'])
+    harvested: pd.Series = datasets['harvested'].map(
+        bool, na_action='ignore').eq(True)
+    return harvested | cutoff.isna() | (last_modified >= cutoff)
+
+
+def official_lang(groups: ResourceGroups, _now: dt.datetime) -> pd.Series:
+    """Official languages compliance of each dataset (see
+    Inventory.get_official_lang): as many resources in English as in French.
+    """
+    langs: pd.Series = groups.column('lang').astype('string')
+    eng: np.ndarray = groups.count(
+        langs.str.contains('eng', regex=False).fillna(False))
+    fra: np.ndarray = groups.count(
+        langs.str.contains('fra', regex=False).fillna(False))
+    return groups.for_datasets(eng == fra, True)
+
+
+def open_formats(groups: ResourceGroups, _now: dt.datetime) -> pd.Series:
+    """Open formats compliance of each dataset (see
+    Inventory.get_open_formats): an open format for each of its format
+    types. Formats unknown to FORMATS are ignored, and reported (numbers of
+    resources by format, as 'unknown_formats').
+    """
+    # (only the distinct formats are normalized and looked up)
+    values, names = pd.factorize(groups.column('format').astype(object))
+    keys: pd.Series = normalize_formats(pd.Series(names, dtype=object))
+    index: pd.DataFrame = FORMATS_INDEX.reindex(keys.to_numpy())
+    unknown: np.ndarray = (index['format_type'].isna().to_numpy()
+                           & (keys.fillna('') != '').to_numpy())
+    # (resources without format, at -1, get the values appended last)
+    formats: pd.DataFrame = pd.DataFrame({
+        'format_type': np.append(index['format_type'].to_numpy(object),
+                                 [None])[values],
+        'open': np.append(index['open'].eq(True).to_numpy(), False)[values],
+        'unknown': np.append(unknown, False)[values],
+    }, index=groups.resources.index)
+    groups.reports['unknown_formats'] = (
+        groups.column('format').astype(object)[formats['unknown']]
+        .value_counts())
+    return groups.for_datasets(
+        groups.all_by(formats['open'], formats['format_type']), True)
+
+
+def spec(groups: ResourceGroups, _now: dt.datetime) -> pd.Series:
+    """Specification / data dictionary compliance of each dataset (see
+    Inventory.get_spec): a specification for datasets with data resources.
+    """
+    data: np.ndarray = groups.any(
+        (groups.column('resource_type').astype('string') == 'dataset')
+        .fillna(False))
+    specification: np.ndarray = groups.any(
+        groups.column('title_en').astype('string')
+        .str.contains(SPEC_TITLE_PATTERN, case=False).fillna(False))
+    return groups.for_datasets(~data | specification, True)
+
+
+RULES: List[Rule] = [
+    Rule('modified', 'Completing datasets\' modified dates.', modified),
+    Rule('up_to_date', 'Verifying datasets\' currency.', up_to_date,
+         depends_on_now=True),
+    Rule('official_lang', 'Verifying official languages compliance.',
+         official_lang),
+    Rule('open_formats', 'Verifying open formats compliance.', open_formats),
+    Rule('spec', 'Verifying specification / data dictionary compliance.',
+         spec),
+]
+"""Default compliance rules, in order of evaluation (up_to_date uses the
+dates completed by modified).
+"""
+
+
+@dataclass
+class Compliance:
+    """Registry of compliance rules, all evaluated over a single grouping of
+    the resources by dataset. Other rules can be registered (see register),
+    each completing its own column.
+    """
+
+    rules: List[Rule] = field(default_factory=lambda: list(RULES))
+    """Registered rules, in order of evaluation."""
+
+    stats: pd.DataFrame = field(default_factory=pd.DataFrame, init=False)
+    """DataFrame of the last evaluation's time per rule (grouping of the
+    resources included), in seconds.
+    """
+
+    def register(self, rule: Rule) -> NoReturn:
+        """Registers the given rule, replacing the rule completing the same
+        column, if any (evaluated last otherwise).
+        """
+        self.rules = [r for r in self.rules if r.column != rule.column]
+        self.rules.append(rule)
+
+    def evaluate(self, datasets: pd.DataFrame, resources: pd.DataFrame,
+                 now: Optional[dt.datetime] = None,
+                 columns: Optional[List[str]] = None,
+                 verbose: bool = False,
+                 changed: Optional[pd.Series] = None) -> Dict[str, Any]:
+        """Completes the datasets' columns of the registered rules (or of
+        the given columns only), in place, and returns the rules' reports.
+        If the mask of the changed datasets is given, rules are only 
+        evaluated for these datasets (and their resources), the others 
+        keeping their values (e.g. carried over from a previous inventory), 
+        except for rules depending on the current time and rules whose 
+        column the datasets do not have yet.
+        """
+        now = now or dt.datetime.now()
+        timings: List[tuple] = []
+        start: float = time.perf_counter()
+        groups = ResourceGroups.group(datasets, resources)
+        changed_groups: Optional[ResourceGroups] = None
+        if changed is not None:
+            changed_datasets: pd.DataFrame = datasets[changed].copy()
+            changed_groups = ResourceGroups.group(
+                changed_datasets, resources[resources['dataset_id'].isin(
+                    changed_datasets['id'].astype(object))])
+        # (resources are grouped here rather than by the first rule, for
+        # the timings; all of them only if not incremental)
+        (changed_groups if changed_groups is not None else groups).prepare()
+        timings.append(('grouping', time.perf_counter() - start))
+        for rule in self.rules:
+            if columns is not None and rule.column not in columns:
+                continue
+            if verbose:
+                print(rule.message)
+            start = time.perf_counter()
+            if (changed_groups is None or rule.depends_on_now
+                    or rule.column not in datasets.columns):
+                datasets[rule.column] = rule.evaluate(groups, now)
+            else:
+                values: pd.Series = rule.evaluate(changed_groups, now)
+                changed_groups.datasets[rule.column] = values
+                datasets.loc[changed, rule.column] = values
+            timings.append((rule.column, time.perf_counter() - start))
+        self.stats = pd.DataFrame(timings, columns=['rule', 'seconds'])
+        if changed_groups is not None:
+            return {**groups.reports, **changed_groups.reports}
+        return groups.reports
@@ -1,5 +1,7 @@
 """This module provides project-wide constants."""
 
+from importlib.util import find_spec
+
 
 REGISTRY_BASE_URL = 'https://open.canada.ca/data/api/3/action/'
 """Base url to send API requests to open.canada.ca"""
@@ -28,6 +30,94 @@ to format with its package/datasets id, along with the resource id
 """
 
 
+HEAD_FALLBACK_STATUSES = frozenset([403, 405, 501])
+"""Statuses returned by servers that reject HEAD requests while serving GET 
+requests normally; urls answering with one of them are checked again with a 
+ranged GET
+"""
+
+URL_RULES = [
+    {'name': 'not a web url', 'pattern': r'^(?!https?://)', 'status': -1},
+    {'name': 'atlas services', 'pattern': r'atlas/rest|atlas/services',
+     'found_status': 300},
+]
+"""Rules classifying urls before any web request, evaluated in order (first 
+match wins). A rule matches on any of a regex 'pattern' (searched in the url, 
+case insensitive), a 'host' (or its subdomains) and a 'scheme', and gives 
+either a fixed 'status' (no request sent), or a check policy: 'method' 
+('HEAD' or 'GET'), read 'timeout' in seconds, e.g. for a known-slow host: 
+{'name': 'slow host', 'host': 'slow.example.ca', 'method': 'GET', 
+'timeout': 60}, and/or 'found_status', given instead of the status of the 
+urls found (any answer but 404). Urls that are not web urls (internal file 
+paths, shares, file:// or ftp:// links) get -1, and ArcGIS REST services on 
+the atlas get 300 (web services, not downloadable files) unless missing.
+"""
+
+TELEMETRY_LATENCY_SAMPLES = 1_000
+"""Number of latest requests per host whose latencies are kept for the 
+percentiles of the requests telemetry (counts and totals cover all requests)
+"""
+
+URL_STATUS_CIRCUIT_OPEN = -2
+"""Status given without any request to urls whose host is considered down 
+by the circuit breaker (-1 being used for urls that could not be reached)
+"""
+CIRCUIT_BREAKER_THRESHOLD = 5
+"""Number of consecutive connection failures to a host after which its 
+remaining urls are no longer requested
+"""
+CIRCUIT_BREAKER_COOLDOWN = 60
+"""Seconds after which a host considered down is probed again with a single 
+request, to decide whether its urls can be requested again
+"""
+
+LINK_CHECK_WORKERS = 64
+"""Default number of urls checked at once when refreshing links statuses 
+of an existing resources inventory
+"""
+ASYNC_MAX_CONNECTIONS = 1000
+"""Maximum number of urls checked at once by the asyncio link checker"""
+ASYNC_PER_HOST_CONNECTIONS = 8
+"""Maximum number of urls of the same host checked at once by the asyncio 
+link checker
+"""
+PIPELINE_FETCH_WORKERS = 16
+"""Default number of datasets fetched at once from a data catalogue"""
+PIPELINE_PARSE_WORKERS = 2
+"""Default number of threads parsing fetched datasets"""
+PIPELINE_LINK_WORKERS = 32
+"""Default number of resources urls checked at once while collecting"""
+PIPELINE_PARSE_BATCH_BYTES = 4_000_000
+"""Size of the batches of raw payloads sent at once to a parsing process, 
+in bytes (parsing in bulk amortizes the cost of building dataframes)
+"""
+PIPELINE_QUEUE_SIZE = 256
+"""Maximum number of items waiting between two stages of the collection 
+pipeline
+"""
+REUSED_URL_STATUS_MAX_AGE_DAYS = 7
+"""Age of the url checks of a previous inventory (in days) up to which the 
+url statuses of its unchanged resources are reused instead of checked again
+"""
+SPILL_RUN_ROWS = 50_000
+"""Number of collected rows kept in memory before being spilled to disk as
+a sorted run, when inventories are spilled
+"""
+SPILL_BLOCK_ROWS = 2_000
+"""Number of rows of the blocks spilled runs are written and read back in
+(a single block per run being in memory while runs are merged)
+"""
+SPILL_CHUNK_ROWS = 20_000
+"""Number of datasets finalized (compliance columns) and exported at once
+from spilled inventories
+"""
+SPEC_TITLE_PATTERN = (r'(?:data dictionary|specification|^dd[_\-]'
+                      r'|[_\-]dd.)')
+"""Pattern of the (English) titles of specification / data dictionary 
+resources (case insensitive; non-capturing, as matched with str.contains)
+"""
+
+
 AAFC_ORG_ID = '2ABCCA59-6C57-4886-99E7-85EC6C719218'
 """ID of the organization AAFC on the Open Registry"""
 
@@ -55,43 +145,50 @@ DATASETS_COLS = [
     'state',
     'subject'
 ]
+LONG_TEXT_DTYPE = 'string[pyarrow]' if find_spec('pyarrow') else 'string'
+"""Dtype of long text columns: Arrow-backed strings (compact, contiguous 
+buffers) if pyarrow is installed (see the arrow extra), python strings 
+otherwise
+"""
 DATASETS_DTYPES = {
     'id': 'string', 'title_en': 'string', 'title_fr': 'string', 
     'published': 'string', 'modified': 'string',
     'metadata_created': 'string', 'metadata_modified': 'string', 
     'num_resources': 'Int64', 'on_registry': 'boolean', 
-    'on_catalogue': 'boolean', 'org': 'string', 'org_title': 'string', 
-    'aafc_org': 'string', 'aafc_org_title': 'string', 
+    'on_catalogue': 'boolean', 'org': 'category', 'org_title': 'category', 
+    'aafc_org': 'category', 'aafc_org_title': 'category', 
     'maintainer_email': 'string', 'maintainer_name': 'string', 
-    'collection': 'string', 'frequency': 'string', 'harvested': 'boolean', 
+    'collection': 'category', 'frequency': 'category', 'harvested': 'boolean', 
     'internal': 'boolean', 'up_to_date': 'boolean', 
     'official_lang': 'boolean', 'open_formats': 'boolean', 'spec': 'boolean', 
     'registry_link': 'string', 'catalogue_link': 'string',
     'creator': 'string',
     'data_steward_email': 'string',
     'elegible_for_release': 'string',
-    'jurisdiction': 'string',
-    'license_title': 'string',
-    'notes_en': 'string',
-    'notes_fr': 'string',
+    'jurisdiction': 'category',
+    'license_title': 'category',
+    'notes_en': LONG_TEXT_DTYPE,
+    'notes_fr': LONG_TEXT_DTYPE,
     'odi_reference_number' : 'string',
-    'organization_description' : 'string',
+    'organization_description' : 'category',
     'procured_data': 'string',
-    'procured_data_organization_name':'string',
-    'publication': 'string',
-    'state':'string',
-    'subject': 'string',
+    'procured_data_organization_name':'category',
+    'publication': 'category',
+    'state':'category',
+    'subject': 'category',
 }
 RESOURCES_COLS = [
     'id', 'title_en', 'title_fr', 'created', 
     'metadata_modified', 'format', 'lang', 
-    'dataset_id', 'resource_type', 'url', 'url_status', 'https',
-    'registry_link', 'catalogue_link'
+    'dataset_id', 'resource_type', 'url', 'url_status', 'url_checked', 'https',
+    'registry_link', 'catalogue_link', 'size', 'content_type', 'server_modified'
 ]
 RESOURCES_DTYPES = {
     'id': 'string', 'title_en': 'string', 'title_fr': 'string', 
     'created': 'string', 'metadata_modified': 'string',
-    'format': 'string', 'lang': 'string', 'dataset_id': 'string',
-    'resource_type': 'string', 'url': 'string', 'url_status': 'Int64',
-    'https': 'string', 'registry_link': 'string', 'catalogue_link': 'string'
+    'format': 'category', 'lang': 'category', 'dataset_id': 'string',
+    'resource_type': 'category', 'url': 'string', 'url_status': 'Int64',
+    'url_checked': 'string',
+    'https': 'string', 'registry_link': 'string', 'catalogue_link': 'string',
+    'size': 'Int64', 'content_type': 'string', 'server_modified': 'string'
 }
@@ -3,6 +3,8 @@ stored in helper files, but exporting the project as a single executable
 file requires no attached data, only code).
 """
 
+from typing import Any, Dict
+
 import pandas as pd
 
 ISO639_MAP = {
@@ -282,6 +284,24 @@ FORMATS = pd.DataFrame(
 """DataFrame containing info about files formats (type of format and openness)
 """
 
+FORMAT_ALIASES = {
+    'ESRI Shapefile': 'Shapefile',
+    'FGDB': 'FGDB/GDB',
+    'GDB': 'FGDB/GDB',
+    'GPKG': 'GeoPackage',
+    'HTM': 'HTML',
+    'NC': 'NetCDF',
+    'SAV': 'SAV (SPSS)',
+    'SPSS': 'SAV (SPSS)',
+    'SQLite': 'SQL Lite',
+    'SQLite3': 'SQL Lite3',
+    'TEXT': 'TXT',
+    'YML': 'YAML',
+}
+"""Dictionary mapping other names given to files formats to their name in 
+FORMATS (case, spaces, dashes and underscores aside).
+"""
+
 REGISTRY_ORGS = pd.DataFrame(
     [
         ['9ced415c-3060-4d20-ab3c-302f38367037', '2canl', '2875039 Canada Limited'],
@@ -648,3 +668,116 @@ REGISTRY_ORGS = pd.DataFrame(
 on open.canada.ca (e.g.: ['2ABCCA59-6C57-4886-99E7-85EC6C719218', 'aafc-aac', 
 'Agriculture and Agri-Food Canada'])
 """
+
+DATASETS_SCHEMA: Dict[str, Any] = {
+    'fields': [
+        {'name': 'id', 'type': 'string', 'constraints': {'required': True}},
+        {'name': 'title_en', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'title_fr', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'published', 'type': 'datetime',
+         'constraints': {'required': True}},
+        {'name': 'modified', 'type': 'datetime',
+         'constraints': {'required': True}},
+        {'name': 'metadata_created', 'type': 'datetime',
+         'constraints': {'required': True}},
+        {'name': 'metadata_modified', 'type': 'datetime',
+         'constraints': {'required': True}},
+        {'name': 'num_resources', 'type': 'integer',
+         'constraints': {'required': True, 'minimum': 1}},
+        {'name': 'on_registry', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'on_catalogue', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'org', 'type': 'string', 'constraints': {'required': True}},
+        {'name': 'org_title', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'aafc_org', 'type': 'string',
+         'constraints': {'required': False}},
+        {'name': 'aafc_org_title', 'type': 'string',
+         'constraints': {'required': False}},
+        {'name': 'maintainer_email', 'type': 'string', 'format': 'email',
+         'constraints': {'required': True}},
+        {'name': 'maintainer_name', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'collection', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'frequency', 'type': 'duration',
+         'constraints': {'required': True}},
+        {'name': 'harvested', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'internal', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'up_to_date', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'official_lang', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'open_formats', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'spec', 'type': 'boolean', 'constraints': {'required': True}},
+        {'name': 'registry_link', 'type': 'string', 'format': 'uri',
+         'constraints': {'required': False}},
+        {'name': 'catalogue_link', 'type': 'string', 'format': 'uri',
+         'constraints': {'required': False}},
+    ],
+    'primaryKey': 'id',
+}
+"""Table schema of the datasets inventory (frictionless data format, as
+documented in documentation/datasets_inventories_schema.json, without the
+fields' descriptions)
+"""
+
+RESOURCES_SCHEMA: Dict[str, Any] = {
+    'fields': [
+        {'name': 'id', 'type': 'string', 'constraints': {'required': True}},
+        {'name': 'title_en', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'title_fr', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'created', 'type': 'datetime',
+         'constraints': {'required': True}},
+        {'name': 'metadata_modified', 'type': 'datetime',
+         'constraints': {'required': False}},
+        {'name': 'format', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'lang', 'type': 'string',
+         'constraints': {'required': True,
+                         'pattern': '[a-z]{3}(/[a-z]{3})*'}},
+        {'name': 'dataset_id', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'resource_type', 'type': 'string',
+         'constraints': {'required': True}},
+        {'name': 'url', 'type': 'string', 'format': 'uri',
+         'constraints': {'required': True}},
+        {'name': 'url_status', 'type': 'integer',
+         'constraints': {'required': True}},
+        {'name': 'url_checked', 'type': 'datetime',
+         'constraints': {'required': False}},
+        {'name': 'https', 'type': 'boolean',
+         'constraints': {'required': True}},
+        {'name': 'registry_link', 'type': 'string', 'format': 'uri',
+         'constraints': {'required': False}},
+        {'name': 'catalogue_link', 'type': 'string', 'format': 'uri',
+         'constraints': {'required': False}},
+        {'name': 'size', 'type': 'integer',
+         'constraints': {'required': False}},
+        {'name': 'content_type', 'type': 'string',
+         'constraints': {'required': False}},
+        {'name': 'server_modified', 'type': 'datetime',
+         'constraints': {'required': False}},
+    ],
+    'primaryKey': 'id',
+    'foreignKeys': [
+        {'fields': 'dataset_id',
+         'reference': {'resource': 'datasets', 'fields': 'id'}},
+    ],
+}
+"""Table schema of the resources inventory (frictionless data format, as
+documented in documentation/resources_inventory_schema.json, without the
+fields' descriptions)
+"""
+
+FREQUENCY_SPECIAL_VALUES = ['continual', 'as_needed', 'irregular',
+                            'not_planned', 'unknown']
+"""Values of the datasets' frequency that are not ISO 8601 durations"""
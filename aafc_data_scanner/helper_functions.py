@@ -4,7 +4,9 @@ import calendar
 import datetime as dt
 import os
 import re
-from typing import List
+from typing import Any, Dict, List
+
+import pandas as pd
 
 
 def check_and_create_path(path: str) -> None:
@@ -92,3 +94,80 @@ def infer_name_from_email(email: str) -> str:
         return name
     else:
         return ''
+
+
+def infer_names_from_emails(emails: pd.Series) -> pd.Series:
+    """(Utility method) Vectorized version of infer_name_from_email, over a
+    whole column of email addresses (missing ones give '').
+    """
+    names: pd.Series = (emails.fillna('').astype(str)
+                        .str.split('@').str[0].str.lower()
+                        .str.replace(r'[.\-_]', ' ', regex=True)
+                        .str.title()
+                        .str.replace(r'(Ma?c)([a-z])',
+                                     lambda m: m.group(1) + m.group(2).upper(),
+                                     regex=True)
+                        .str.replace(r'^MacKenzie', 'Mackenzie', regex=True))
+    return names
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """(Utility method) Vectorized parsing of a whole column of dates 
+    (strings in any format, each inferred separately), as naive UTC 
+    datetimes (NaT for missing or unreadable ones).
+    """
+    strings: pd.Series = values.astype('string').str.strip()
+    strings = strings.where(strings != '')
+    # (not 'ISO8601', whose parsing carries a value's UTC offset over to the
+    # next values without one)
+    dates: pd.Series = pd.to_datetime(strings, errors='coerce', utc=True,
+                                      format='mixed')
+    return dates.dt.tz_convert(None)
+
+
+def normalize_formats(formats: pd.Series) -> pd.Series:
+    """(Utility method) Returns the given files formats' names normalized 
+    (casefolded, without leading dot, spaces, dashes and underscores), so 
+    that e.g. 'GeoJSON', 'geojson' and '.geo_json' are the same format.
+    """
+    return (formats.astype('string').str.strip().str.casefold()
+            .str.lstrip('.').str.replace(r'[\s_\-]+', '', regex=True))
+
+
+def add_categories(df: pd.DataFrame, values: Dict[str, Any]) -> None:
+    """(Utility method) Adds the given values (by column: a value or a list
+    of values) to the categories of df's categorical columns that do not 
+    have them yet, so that they can be assigned to these columns.
+    """
+    for column, value in values.items():
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        new: List[str] = [
+            v for v in dict.fromkeys(value if isinstance(value, list)
+                                     else [value])
+            if isinstance(v, str) and v not in df[column].cat.categories]
+        if new:
+            df[column] = df[column].cat.add_categories(new)
+
+
+def fill_missing(df: pd.DataFrame, values: Dict[str, Any]) -> pd.DataFrame:
+    """(Utility method) Returns df with its missing values filled with the 
+    given values by column (as DataFrame.fillna, categorical columns 
+    included).
+    """
+    df = df.copy()
+    add_categories(df, values)
+    return df.fillna(values)
+
+
+def as_dtypes(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """(Utility method) Returns df with its columns cast to the given dtypes.
+    Columns cast to categories are cast to strings first, so that their 
+    categories are strings (any value, e.g. a list, is taken as its string 
+    representation, as with the 'string' dtype).
+    """
+    strings: Dict[str, str] = {
+        column: 'string' for column, dtype in dtypes.items()
+        if dtype == 'category' and column in df.columns
+        and not isinstance(df[column].dtype, pd.CategoricalDtype)}
+    return df.astype(strings).astype(dtypes)
@@ -3,21 +3,29 @@
 import concurrent.futures
 from dataclasses import dataclass, field
 import datetime as dt
+import json
+import multiprocessing
 import re
-import threading
 import time
 from tqdm import tqdm
-from typing import Any, Dict, List, Optional, NoReturn
+from typing import (Any, Callable, Dict, Iterable, List, Optional, NoReturn, 
+                    Tuple)
 import urllib3
-import validators
-import warnings
 
 import pandas as pd
 from colorama import Fore, init
 
 from .constants import * # pylint: disable=import-error
-from .data import ISO639_MAP, FORMATS
+from .data import ISO639_MAP
 from .tools import TenaciousSession, DataCatalogue, DriverDataCatalogue
+from .async_links import AsyncLinkChecker
+from .compliance import FORMATS_INDEX, Compliance, frequency_cutoff
+from .link_checks import check_urls
+from .pipeline import Pipeline, Stage
+from .previous import PreviousInventory
+from .records import DatasetRecord, ResourceRecord
+from .spill import ChunkWriter, SpillFile, iter_matched_chunks
+from .validation import VIOLATIONS_COLS, validate_inventory
 from .helper_functions import * # pylint: disable=import-error
 
 @dataclass
@@ -29,59 +37,119 @@ class Inventory:
 
     datasets: pd.DataFrame = field(
         default_factory=lambda: (pd.DataFrame(columns=DATASETS_COLS)
-                                 .astype(DATASETS_DTYPES))
+                                 .pipe(as_dtypes, DATASETS_DTYPES))
     )
     """DataFrame storing the datasets' information."""
 
     resources: pd.DataFrame = field(
         default_factory=lambda: (pd.DataFrame(columns=RESOURCES_COLS)
-                                 .astype(RESOURCES_DTYPES))
+                                 .pipe(as_dtypes, RESOURCES_DTYPES))
     )
     """DataFrame storing the resources' information."""
 
+    link_engine: str = 'threads'
+    """Engine checking the resources' urls: 'threads' (urls checked by the
+    link check stage of the collection pipeline) or 'async' (all urls checked
+    at once by AsyncLinkChecker once the collection is over, for very large 
+    resource sets)
+    """
+
+    fetch_workers: int = PIPELINE_FETCH_WORKERS
+    """Number of threads fetching datasets from the data catalogue (a 
+    single one for a DriverDataCatalogue).
+    """
+
+    parse_workers: int = PIPELINE_PARSE_WORKERS
+    """Number of threads parsing fetched datasets into records."""
+
+    link_workers: int = PIPELINE_LINK_WORKERS
+    """Number of threads checking resources' urls (threads engine only)."""
+
+    parse_processes: int = 0
+    """Number of processes parsing raw datasets payloads (see parse_payloads),
+    for CPU-bound bulk parsing; if 0, datasets are parsed in threads.
+    """
+
+    pipeline_stats: pd.DataFrame = field(default_factory=pd.DataFrame)
+    """DataFrame of the last collection's statistics per pipeline stage 
+    (see Pipeline.stats).
+    """
+
+    hosts_telemetry: pd.DataFrame = field(default_factory=pd.DataFrame)
+    """DataFrame summarizing the web requests sent so far, per host (see 
+    RequestTelemetry.summary).
+    """
+
+    unknown_formats: pd.Series = field(
+        default_factory=lambda: pd.Series(dtype=int))
+    """Numbers of resources by format, for the formats unknown to FORMATS 
+    found by the last open formats check (see compliance.open_formats).
+    """
+
+    compliance: Compliance = field(default_factory=Compliance)
+    """Compliance rules completing the datasets' compliance columns (see 
+    complete_missing_fields).
+    """
+
+    violations: pd.DataFrame = field(default_factory=pd.DataFrame)
+    """DataFrame of the last validation's violations of the inventories' 
+    schemas (see validate).
+    """
+
+    previous: Optional[PreviousInventory] = None
+    """Index of a previous inventory, whose rows are reused for the datasets
+    and resources unchanged since (along with fresh url statuses), instead of
+    being parsed and checked again; if None, all are parsed and checked.
+    """
+
+    spill_dir: Optional[str] = None
+    """Directory where collected datasets and resources are spilled to disk
+    in sorted runs instead of being added to self dataframes, keeping memory
+    bounded for very large inventories (see export_spilled); if None, they
+    are kept in memory.
+    """
+
+    datasets_spill: Optional[SpillFile] = field(default=None, repr=False)
+    """Spilled datasets (sorted by id), if self spill_dir is set."""
+
+    resources_spill: Optional[SpillFile] = field(default=None, repr=False)
+    """Spilled resources (sorted by dataset_id), if self spill_dir is set. 
+    Urls that were not checked while collecting (async link_engine or parsing
+    processes) are checked run by run, before each run is spilled.
+    """
+
+    platform_patches: List[Tuple[List[str], pd.DataFrame, pd.Series]] = field(
+        default_factory=list, repr=False)
+    """Platform info collected by update_platform_info while self spill_dir 
+    is set (columns updated, datasets' values and resources' links, by id), 
+    applied to the spilled rows chunk by chunk by export_spilled.
+    """
+
 
     @staticmethod
-    def add_dataset(dataset: dict, datasets: pd.DataFrame,
-                lock: threading.Lock,
-                from_catalogue: bool = False) -> NoReturn:
-        """Adds the given dataset's information to the datasets dataframe.
-        The lock argument is a mutex on the datasets dataframe."""
+    def parse_dataset(dataset: dict, 
+                      from_catalogue: bool = False) -> DatasetRecord:
+        """Returns the record of the given dataset's information (CKAN 
+        package), with raw values left to normalize_datasets."""
+
+        # extras are looked up by key, built once per dataset
+        extras: Dict[str, Any] = {e.get('key'): e.get('value')
+                                  for e in dataset.get('extras', [])
+                                  if isinstance(e, dict)}
 
         def check_extra(dataset: dict, key: str, default=""):
-            extras = {e.get("key"): e.get("value") for e in dataset.get("extras", []) if isinstance(e, dict)}
             return dataset.get(key) or extras.get(key, default)
-        
-        def _one_line(s):
-            if not isinstance(s, str): return ""
-            s = re.sub(r"[\r\n]+", " ", s)
-            return re.sub(r"\s+", " ", s).strip()
-        
-        empty_row = []
                 
+        record = DatasetRecord()
         try:
 
-            record: Dict[str, Any] = {}
             record['id'] = dataset.get('id')
             record['title_en'] = (dataset.get('title_translated', {}).get('en')
                       or dataset.get('title') or '')
             record['title_fr'] = dataset.get('title_translated', {}).get('fr') or ''
 
-            dp = dataset.get('date_published')
-            if isinstance(dp, str) and dp:
-                ts = pd.to_datetime(dp, errors="coerce", utc=True)
-                if pd.isna(ts):
-                    record['published'] = dp
-                else:
-                    try:
-                        ts = ts.tz_convert(None)
-                    except Exception:
-                        try:
-                            ts = ts.tz_localize(None)
-                        except Exception:
-                            pass
-                    record['published'] = ts.isoformat()
-            else:
-                record['published'] = None
+            # raw value, parsed by normalize_datasets
+            record['published'] = dataset.get('date_published')
 
             record['metadata_created'] = dataset.get('metadata_created')
             record['metadata_modified'] = dataset.get('metadata_modified')
@@ -92,10 +160,7 @@ class Inventory:
                 or ''
             )
 
-            ds_email = dataset.get('data_steward_email') or ''
-            record['data_steward_email'] = (
-                ds_email.lower() if isinstance(ds_email, str) else ''
-            )
+            record['data_steward_email'] = dataset.get('data_steward_email')
 
             record['elegible_for_release'] = as_bool(
                 dataset.get('elegible_for_release'),
@@ -105,16 +170,11 @@ class Inventory:
             record['jurisdiction'] = dataset.get('jurisdiction') or ''
             record['license_title'] = dataset.get('license_title') or ''
 
-            # clean notes to one line to fix messy csv
+            # notes are cleaned to one line by normalize_datasets
             notes_translated = dataset.get('notes_translated') or {}
-            record['notes_en'] = _one_line(
-                notes_translated.get('en')
-                or dataset.get('notes')
-                or ''
-            )
-            record['notes_fr'] = _one_line(
-                notes_translated.get('fr') or ''
-            )
+            record['notes_en'] = (notes_translated.get('en')
+                                  or dataset.get('notes'))
+            record['notes_fr'] = notes_translated.get('fr')
 
             record['odi_reference_number'] = check_extra(
                 dataset, 'odi_reference_number', ''
@@ -142,11 +202,9 @@ class Inventory:
             # metadata specific to each platform
             org_obj = dataset.get('organization') or {}
             org = org_obj.get('name', '')
-            org_title_raw = org_obj.get('title', '')
-            org_title = (
-                re.sub(r'([^\|]+) \| ([^\|]+)', r'\1', org_title_raw)
-                if isinstance(org_title_raw, str) else ''
-            )
+            org_title = org_obj.get('title', '')  # see normalize_datasets
+            if not isinstance(org_title, str):
+                org_title = ''
 
             if from_catalogue:
                 record['on_catalogue'] = True
@@ -176,43 +234,46 @@ class Inventory:
 
             # inconsistent metadata fields
 
-            email = (dataset.get('maintainer_email')
-                    or dataset.get('data_steward_email')
-                    or dataset.get('author_email')
-                    or '')
-            record['maintainer_email'] = email.lower() if isinstance(email, str) else ''
-            record['maintainer_name'] = infer_name_from_email(record['maintainer_email'])
+            # lowercased, and name inferred from, by normalize_datasets
+            record['maintainer_email'] = (dataset.get('maintainer_email')
+                                          or dataset.get('data_steward_email')
+                                          or dataset.get('author_email'))
 
             try:
                 record['collection'] = dataset['collection']
             except KeyError:
                 record['collection'] = None
 
+            # (invalid values are reported by validate)
             record['frequency'] = dataset.get('frequency')
-            if not isinstance(record['frequency'], str):
-                print(f"Error for id {record['id']}: frequency is {record['frequency']} (not str)")
 
             # 'modified', 'up_to_date', 'official_lang', 'open_formats' and 'spec' 
             # will be added to the record later on
 
         except Exception as e: # pylint: disable=bare-except
-            print(f'!!! Exception in add_dataset for id={record.get("id")}: {e}')
+            print(f'!!! Exception in parse_dataset for id={record.get("id")}: {e}')
 
+        return record
 
-        lock.acquire()
-        datasets.loc[len(datasets)] = record # type: ignore
-        lock.release()
+    @staticmethod
+    def datasets_frame(rows: Iterable[Tuple[Any, ...]]) -> pd.DataFrame:
+        """Returns the datasets dataframe of the given rows (values of 
+        DatasetRecord, see parse_dataset), normalized in one pass and with 
+        the inventory dtypes."""
+        return as_dtypes(Inventory.normalize_datasets(
+            pd.DataFrame.from_records(list(rows), columns=DATASETS_COLS)),
+            DATASETS_DTYPES)
 
     @staticmethod
-    def add_resource(resource: dict, resources: pd.DataFrame, 
-                    lock: threading.Lock, 
-                    from_catalogue: bool = False) -> NoReturn:
-        """Inserts the given resource's information in the resources dataframe.
-        The lock argument is a mutex on the given resources dataframe."""
+    def parse_resource(resource: dict, 
+                       from_catalogue: bool = False) -> ResourceRecord:
+        """Returns the record of the given resource's information, with raw 
+        values left to normalize_resources and url columns left to 
+        check_resource_url."""
 
+        record = ResourceRecord()
         try:
 
-            record: Dict[str, Any] = {}
             record['id'] = resource['id']
             record['title_en'] = resource['name']
             record['created'] = resource['created']
@@ -220,22 +281,9 @@ class Inventory:
             record['dataset_id'] = resource['package_id']
             record['resource_type'] = resource['resource_type']
             record['url'] = resource.get('url') or ''
-            record['https'] = record['url'].startswith('https') or record['url'].startswith('file')
 
-            # checking url state
-            if validators.url(record['url']):
-                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-                record['url_status'] = TenaciousSession(skip_ssl=True).get_status_code(record['url'])
-            else:
-                # not a url (most likely an internal file path)
-                record['url_status'] = -1
-
-            # languages mapping to iso639-3 and concatenation
-            langs = resource.get('language') or []
-            if isinstance(langs, str):
-                langs = [langs]
-            lang_mapped = [ISO639_MAP.get(x, x) for x in langs]
-            record['lang'] = '/'.join(lang_mapped) if lang_mapped else ''
+            # raw languages, mapped to iso639-3 by normalize_resources
+            record['lang'] = resource.get('language')
 
             # metadata specific to each platform
             if from_catalogue:
@@ -254,16 +302,106 @@ class Inventory:
                 record['title_fr'] = resource['name_translated']['fr-t-en'] 
 
         except Exception as e: # pylint: disable=bare-except
-            print(f'!!! An exception occurred in add_resource:\n{e}')
+            print(f'!!! An exception occurred in parse_resource:\n{e}')
+
+        return record
+
+    @staticmethod
+    def check_resource_url(record: ResourceRecord) -> NoReturn:
+        """Checks the url of the given resource record and completes its url 
+        columns."""
+        if not isinstance(record['url'], str):
+            return  # resource could not be parsed
+        # checking url state (-1 if not a url, most likely an internal 
+        # file path), keeping what the response headers tell of the file
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        url_info = TenaciousSession(skip_ssl=True).get_url_info(record['url'])
+        record['url_status'] = url_info.status
+        record['size'] = url_info.size
+        record['content_type'] = url_info.content_type
+        record['server_modified'] = url_info.last_modified
+        record['url_checked'] = dt.datetime.now().isoformat(timespec='seconds')
+
+    @staticmethod
+    def resources_frame(rows: Iterable[Tuple[Any, ...]]) -> pd.DataFrame:
+        """Returns the resources dataframe of the given rows (values of 
+        ResourceRecord, see parse_resource and check_resource_url), 
+        normalized in one pass and with the inventory dtypes."""
+        return as_dtypes(Inventory.normalize_resources(
+            pd.DataFrame.from_records(list(rows), columns=RESOURCES_COLS)),
+            RESOURCES_DTYPES)
+
+    @staticmethod
+    def normalize_datasets(datasets: pd.DataFrame) -> pd.DataFrame:
+        """Normalizes the raw values parsed by parse_dataset, over whole 
+        columns at once: publication dates parsed to ISO format (kept as is 
+        if unreadable), notes on one line, emails lowercased, maintainers' 
+        names inferred from their emails and organizations' titles kept to 
+        their first part. Returns the normalized dataframe (a copy).
+        """
+        datasets = datasets.copy()
+
+        # parses publication dates as naive UTC datetimes
+        raw: pd.Series = _strings(datasets['published']).replace('', None)
+        published = pd.to_datetime(raw, errors='coerce', utc=True,
+                                   format='ISO8601')
+        others: pd.Series = raw.notna() & published.isna()
+        if others.any():
+            # dates in other formats, parsed one by one
+            published = published.astype(object)
+            published[others] = raw[others].map(
+                lambda d: pd.to_datetime(d, errors='coerce', utc=True))
+            published = pd.to_datetime(published, utc=True)
+        published = published.dt.tz_convert(None)
+        datasets['published'] = (
+            published.map(lambda ts: ts.isoformat(), na_action='ignore')
+            .astype(object).where(published.notna(), raw))
+
+        # cleans notes to one line to fix messy csv
+        for column in ('notes_en', 'notes_fr'):
+            datasets[column] = (_strings(datasets[column]).fillna('')
+                                .str.replace(r'\s+', ' ', regex=True)
+                                .str.strip())
+
+        for column in ('maintainer_email', 'data_steward_email'):
+            datasets[column] = _strings(datasets[column]).fillna('').str.lower()
+        datasets['maintainer_name'] = infer_names_from_emails(
+            datasets['maintainer_email'])
+
+        # keeps titles' first part (e.g. english title of a bilingual one)
+        for column in ('org_title', 'aafc_org_title'):
+            datasets[column] = _strings(datasets[column]).str.replace(
+                r'([^\|]+) \| ([^\|]+)', r'\1', regex=True)
+        return datasets
+
+    @staticmethod
+    def normalize_resources(resources: pd.DataFrame) -> pd.DataFrame:
+        """Normalizes the raw values parsed by parse_resource, over whole 
+        columns at once: languages mapped to ISO 639-3 and concatenated 
+        (e.g. 'eng/fra') and https flags set from urls. Returns the 
+        normalized dataframe (a copy).
+        """
+        resources = resources.copy()
+
+        langs: pd.Series = pd.Series(resources['lang'].to_numpy(),
+                                     dtype=object)
+        langs = langs.where(langs.map(type) != str, langs.map(lambda x: [x]))
+        langs = langs.explode().dropna()
+        mapped: pd.Series = langs.map(ISO639_MAP).fillna(langs).astype(str)
+        resources['lang'] = (mapped.groupby(level=0).agg('/'.join)
+                             .reindex(range(len(resources)), fill_value='')
+                             .to_numpy())
 
-        lock.acquire()
-        resources.loc[len(resources)] = record # type: ignore
-        lock.release()
+        urls: pd.Series = resources['url'].fillna('').astype(str)
+        resources['https'] = urls.str.startswith(('https', 'file'))
+        return resources
 
     @staticmethod
     def infer_modified(ds: pd.Series, all_resources: pd.DataFrame) -> str:
         """Infers last date modified of the dataset ds, given the created 
-        and modified_metadata dates of its resources.
+        and modified_metadata dates of its resources, along with the last 
+        modified date given by their server (ignored for html pages, which 
+        are often generated on the fly).
         """
         
         key = "dataset_id" if "dataset_id" in all_resources.columns else (
@@ -310,7 +448,10 @@ class Inventory:
         for _, res in resources.iterrows():
             created_dt = parse_any(res.get("created"))
             meta_dt    = parse_any(res.get("metadata_modified"))
-            pair = [d for d in (created_dt, meta_dt) if d is not None]
+            server_dt  = None
+            if not str(res.get("content_type")).startswith("text/html"):
+                server_dt = parse_any(res.get("server_modified"))
+            pair = [d for d in (created_dt, meta_dt, server_dt) if d is not None]
             if pair:
                 modified_dates.append(max(pair))
 
@@ -338,18 +479,9 @@ class Inventory:
             return True
 
         # 2) Parse update frequency; if not a planned update, treat as up to date
-        frequency: str = getattr(ds, "frequency", None)
-        if isinstance(frequency, str) and frequency.startswith("P") and frequency != "PT1S":
-            full_unit: Dict[str, str] = {"D": "day", "W": "week", "M": "month", "Y": "year"}
-            try:
-                unit: str = full_unit[frequency[-1]]
-                n: float = float(frequency[1:-1])  # e.g., 1, 2, 0.5 ...
-            except Exception:
-                # Malformed frequency → treat like "no plan" (up to date)
-                return True
-            oldest_valid_update: dt.datetime = date_ago(n, unit, from_=now)
-        else:
-            # No update explicitly planned → up to date
+        oldest_valid_update: Optional[dt.datetime] = frequency_cutoff(
+            getattr(ds, "frequency", None), now)
+        if oldest_valid_update is None:
             return True
 
         # 3) Safely read/parse the dataset's last modified timestamp
@@ -397,10 +529,11 @@ class Inventory:
         assuming each format type contains the same data, that at least one
         type is open).
         """
-        resources = all_resources[all_resources.dataset_id == ds.id].copy()
-        # FORMATS = pd.read_csv('./helper_tables/formats.csv')
-        resources = resources.merge(FORMATS, how='left', on='format')
-        for elem in resources.groupby('format_type').open.unique():
+        resources = all_resources[all_resources.dataset_id == ds.id]
+        # (formats unknown to FORMATS have no type and are ignored)
+        formats: pd.DataFrame = FORMATS_INDEX.reindex(
+            normalize_formats(resources['format']).to_numpy())
+        for elem in formats.groupby('format_type').open.unique():
             if True not in elem:
                 # if a format type doesn't have a single resource in an open format
                 return False
@@ -415,47 +548,14 @@ class Inventory:
         include "data dictionary" or "specification", or with a title that starts 
         or ends with "dd_" / "_dd" respectively; if not, is non-compliant).
         """
-        warnings.filterwarnings('ignore', category=UserWarning)
-        resources = all_resources[all_resources.dataset_id == ds.id].copy()
+        resources = all_resources[all_resources.dataset_id == ds.id]
         if 'dataset' in list(resources.resource_type):
-            if resources['title_en'].str.contains(
-                    r'(data dictionary|specification|^dd[_\-]|[_\-]dd.)', 
-                    case=False).sum():      
+            if resources['title_en'].str.contains(SPEC_TITLE_PATTERN,
+                                                  case=False).sum():
                 return True
             return False
         return True
 
-    def _collect_dataset_with_resources(
-            self, dc: DataCatalogue, id: str,
-            datasets_lock: threading.Lock,
-            resources_lock: threading.Lock,
-            driver_lock: Optional[threading.Lock] = None,
-            pbar: Optional[tqdm] = None) -> NoReturn:
-        """Fetches the information of the id'd dataset from the given 
-        DataCatalogue dc, along with its resources information, and stores it 
-        in self datasets and resources dataframes. Both of these need a 
-        provided mutex/lock in the arguments.
-        """
-        if driver_lock:
-            driver_lock.acquire()
-        dataset: dict = dc.get_dataset(id)
-        if driver_lock:
-            driver_lock.release()
-        # determines if fetch is from catalogue
-        # (considers it as fetched from the registry by default)
-        from_catalogue = False 
-        if dc.base_url.startswith('https://data-catalogue-donnees.agr.gc.ca/'):
-            from_catalogue = True
-        # adds dataset to the common dataframe
-        Inventory.add_dataset(
-            dataset, self.datasets, datasets_lock, from_catalogue)
-        for resource in dataset['resources']:
-            # adds resource to the common dataframe
-            Inventory.add_resource(
-                resource, self.resources, resources_lock, from_catalogue)
-        if pbar:
-            pbar.update()
-
     def inventory(self, dc: DataCatalogue,
                   datasets_ids: Optional[List[str]] = None) -> NoReturn:
         """Fetches information of all datasets and resources of the given 
@@ -474,86 +574,476 @@ class Inventory:
         pbar = tqdm(desc='Processed Datasets', total=len(datasets_ids),
                     colour='green', ncols=100, ascii=' -=')
 
-        # in parallel threads, collects relevant information of
-        # each dataset and associated resources
-        datasets_lock = threading.Lock()
-        resources_ids_lock = threading.Lock()
-        driver_lock = None
-        if isinstance(dc, DriverDataCatalogue):
-            driver_lock = threading.Lock()
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            for id in datasets_ids:
-                executor.submit(self._collect_dataset_with_resources, dc, id, 
-                                datasets_lock, resources_ids_lock, 
-                                driver_lock, pbar)
-            executor.shutdown(wait=True)
+        from_catalogue: bool = dc.base_url.startswith(
+            'https://data-catalogue-donnees.agr.gc.ca/')
+        # (a DriverDataCatalogue's web driver can only fetch one at a time)
+        fetch_workers: int = (1 if isinstance(dc, DriverDataCatalogue)
+                              else self.fetch_workers)
+        if self.parse_processes:
+            datasets, resources = self._collect_chunks(
+                datasets_ids, from_catalogue, pbar,
+                lambda id: [dc.get_dataset_raw(id)], fetch_workers)
+        else:
+            datasets, resources = self._collect_records(
+                dc, datasets_ids, from_catalogue, pbar, fetch_workers)
         pbar.close()
         end = time.time() # ends datasets collection timer
-
-        self.datasets = (self.datasets
+        self._add_collected(datasets, resources)
+        print(f'All information was collected.  ({end-start:.2f}s)')
+        print(self.pipeline_stats.to_string(index=False))
+        if self.previous:
+            reused = self.previous.reused
+            print(f'Reused from the previous inventory: {reused["datasets"]} '
+                  f'datasets, {reused["resources"]} resources and '
+                  f'{reused["url statuses"]} url statuses.')
+
+        if self.spill_dir:
+            self._spill_files()[1].spill()
+        elif self.link_engine == 'async' or self.parse_processes:
+            self.check_links(self.resources.url_status.isna())
+
+        # summarizing time spent per host by the requests sent
+        self.hosts_telemetry = TenaciousSession.telemetry.summary()
+        print('Hosts taking the most time:')
+        print(self.hosts_telemetry
+              .head(5)[['host', 'requests', 'p50_s', 'p95_s', 'total_s',
+                        'timeouts', 'errors']]
+              .to_string(index=False))
+
+
+    def _collect_records(self, dc: DataCatalogue, datasets_ids: List[str],
+                         from_catalogue: bool, pbar: tqdm,
+                         fetch_workers: int
+                         ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Collects relevant information of each id'd dataset and associated
+        resources through a pipeline of threads stages: fetch, parse, link 
+        check (urls of the threads engine) and sink (a single thread 
+        buffering the records, or spilling them). Returns the datasets and 
+        resources collected.
+        """
+        checking_urls: bool = self.link_engine != 'async'
+        datasets_rows: List[Tuple[Any, ...]] = []
+        resources_rows: List[Tuple[Any, ...]] = []
+        # (rows are buffered by the sink thread only, or spilled by it)
+        add_dataset_row: Callable[[Tuple[Any, ...]], Any]
+        add_resource_row: Callable[[Tuple[Any, ...]], Any]
+        if self.spill_dir:
+            add_dataset_row, add_resource_row = (
+                spill.append for spill in self._spill_files())
+        else:
+            add_dataset_row = datasets_rows.append
+            add_resource_row = resources_rows.append
+
+        def fetch(id: str) -> List[dict]:
+            return [dc.get_dataset(id)]
+
+        def parse(dataset: dict) -> List[DatasetRecord | ResourceRecord]:
+            # (rows of unchanged datasets and resources are reused, if any)
+            reused: List[Optional[ResourceRecord]] = [
+                self.previous.resource_record(resource, from_catalogue)
+                if self.previous else None
+                for resource in dataset['resources']]
+            records: List[DatasetRecord | ResourceRecord] = [
+                record or Inventory.parse_resource(resource, from_catalogue)
+                for record, resource in zip(reused, dataset['resources'])]
+            dataset_record: Optional[DatasetRecord] = (
+                self.previous.dataset_record(dataset, from_catalogue)
+                if self.previous else None)
+            if self.previous:
+                # (compliance of unchanged datasets is carried over)
+                self.previous.track(dataset, dataset_record, reused)
+            # dataset record last: counted as processed when it gets sunk
+            records.append(dataset_record
+                           or Inventory.parse_dataset(dataset, from_catalogue))
+            return records
+
+        def check_link(record: DatasetRecord | ResourceRecord
+                       ) -> List[DatasetRecord | ResourceRecord]:
+            # (url statuses reused from the previous inventory are kept)
+            if (isinstance(record, ResourceRecord)
+                    and record['url_status'] is None):
+                Inventory.check_resource_url(record)
+            return [record]
+
+        def sink(record: DatasetRecord | ResourceRecord) -> List[Any]:
+            if isinstance(record, ResourceRecord):
+                add_resource_row(record.as_tuple())
+            else:
+                add_dataset_row(record.as_tuple())
+                pbar.update()
+            return []
+
+        stages: List[Stage] = [Stage('fetch', fetch, fetch_workers),
+                               Stage('parse', parse, self.parse_workers)]
+        if checking_urls:
+            stages.append(Stage('link check', check_link, self.link_workers))
+        stages.append(Stage('sink', sink))
+        pipeline = Pipeline(stages)
+        pipeline.run(datasets_ids)
+        self.pipeline_stats = pipeline.stats()
+
+        return (Inventory.datasets_frame(datasets_rows),
+                Inventory.resources_frame(resources_rows))
+
+    def _collect_chunks(self, items: Iterable[Any], from_catalogue: bool,
+                        pbar: tqdm,
+                        fetch: Optional[Callable[[Any], List[bytes]]] = None,
+                        fetch_workers: int = 1
+                        ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Collects the datasets and resources of raw CKAN API responses 
+        (see parse_payloads) through a pipeline of stages: fetch (if a fetch 
+        function is given, returning the payloads of an item), batch 
+        (payloads grouped up to PIPELINE_PARSE_BATCH_BYTES), parse (in a pool
+        of self parse_processes processes, if any) and sink (a single thread 
+        gathering the column chunks, or spilling them). Urls are not checked
+        (unless spilled). Returns the datasets and resources collected.
+        """
+        batch: List[bytes] = []
+        batch_bytes: int = 0
+        datasets_chunks: List[pd.DataFrame] = []
+        resources_chunks: List[pd.DataFrame] = []
+
+        def add_to_batch(payload: bytes) -> List[List[bytes]]:
+            nonlocal batch_bytes
+            batch.append(payload)
+            batch_bytes += len(payload)
+            if batch_bytes < PIPELINE_PARSE_BATCH_BYTES:
+                return []
+            return flush_batch()
+
+        def flush_batch() -> List[List[bytes]]:
+            nonlocal batch, batch_bytes
+            full_batch, batch, batch_bytes = batch, [], 0
+            return [full_batch] if full_batch else []
+
+        if self.spill_dir:
+            add_datasets, add_resources = (
+                spill.append_frame for spill in self._spill_files())
+        else:
+            add_datasets = datasets_chunks.append
+            add_resources = resources_chunks.append
+
+        def sink(chunks: Tuple[pd.DataFrame, pd.DataFrame]) -> List[Any]:
+            add_datasets(chunks[0])
+            add_resources(self.previous.reuse_url_statuses(chunks[1])
+                          if self.previous else chunks[1])
+            pbar.update(len(chunks[0]))
+            return []
+
+        # (processes are spawned: forking this multi-threaded process could 
+        # copy locks held by other threads)
+        with concurrent.futures.ProcessPoolExecutor(
+                self.parse_processes or 1,
+                mp_context=multiprocessing.get_context('spawn')) as executor:
+
+            def parse(payloads: List[bytes]) -> List[Tuple[pd.DataFrame,
+                                                           pd.DataFrame]]:
+                if not self.parse_processes:
+                    return [parse_payloads(payloads, from_catalogue)]
+                return [executor.submit(parse_payloads, payloads,
+                                        from_catalogue).result()]
+
+            stages: List[Stage] = []
+            if fetch:
+                stages.append(Stage('fetch', fetch, fetch_workers))
+            # (a thread per process keeps the pool busy)
+            stages += [Stage('batch', add_to_batch, 1, flush_batch),
+                       Stage('parse', parse,
+                             self.parse_processes or self.parse_workers),
+                       Stage('sink', sink)]
+            pipeline = Pipeline(stages)
+            pipeline.run(items)
+        self.pipeline_stats = pipeline.stats()
+
+        # (categories of chunks are merged back after concatenation)
+        datasets: pd.DataFrame = as_dtypes(
+            pd.concat(datasets_chunks, ignore_index=True) if datasets_chunks
+            else pd.DataFrame(columns=DATASETS_COLS), DATASETS_DTYPES)
+        resources: pd.DataFrame = as_dtypes(
+            pd.concat(resources_chunks, ignore_index=True) if resources_chunks
+            else pd.DataFrame(columns=RESOURCES_COLS), RESOURCES_DTYPES)
+        return datasets, resources
+
+    def _add_collected(self, datasets: pd.DataFrame,
+                       resources: pd.DataFrame) -> NoReturn:
+        """Adds the given collected datasets and resources to self datasets 
+        and resources dataframes.
+        """
+        # (categories of both parts are merged back after concatenation)
+        self.datasets = (self._append(self.datasets, datasets)
                          .sort_values(by='id')
                          .reset_index(drop=True)
-                         .astype(DATASETS_DTYPES)
+                         .pipe(as_dtypes, DATASETS_DTYPES)
         )
-        self.resources = (self.resources
+        self.resources = (self._append(self.resources, resources)
                           .sort_values(by='dataset_id')
                           .reset_index(drop=True)
+                          .pipe(as_dtypes, RESOURCES_DTYPES)
         )
-        print(f'All information was collected.  ({end-start:.2f}s)')
 
+    def reprocess(self, payloads: Iterable[bytes],
+                  from_catalogue: bool = False) -> NoReturn:
+        """Parses the given raw CKAN API responses (e.g. replayed archives of
+        package_show or package_search responses, see parse_payloads) in self 
+        parse_processes processes, if any, adds their datasets and resources 
+        to self dataframes and checks the new urls (with self link_engine).
+        """
+        print()
+        print('Reprocessing datasets payloads ...')
+        start = time.time()
+        pbar = tqdm(desc='Processed Datasets', colour='green', ncols=100,
+                    ascii=' -=')
+        datasets, resources = self._collect_chunks(payloads, from_catalogue,
+                                                   pbar)
+        pbar.close()
+        self._add_collected(datasets, resources)
+        print(f'All payloads were reprocessed.  ({time.time()-start:.2f}s)')
+        print(self.pipeline_stats.to_string(index=False))
+        if self.spill_dir:
+            self._spill_files()[1].spill()
+        else:
+            self.check_links(self.resources.url_status.isna())
+
+    @staticmethod
+    def _append(df: pd.DataFrame, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """Returns df with the new rows appended (concatenating only if df 
+        already has rows, to keep dtypes of empty frames out of the way).
+        """
+        if df.empty:
+            return new_rows
+        if new_rows.empty:
+            return df
+        return pd.concat([df, new_rows], ignore_index=True)
+
+    def check_links(self, mask: Optional[pd.Series] = None) -> NoReturn:
+        """Checks the urls of all resources (or of the resources selected by 
+        the given mask) at once, with AsyncLinkChecker (async link_engine) or
+        self link_workers threads (threads link_engine), and completes their 
+        'url_status', 'url_checked', 'size', 'content_type' and 
+        'server_modified' columns.
+        """
+        if mask is None:
+            mask = pd.Series(True, index=self.resources.index)
+        urls = self.resources.loc[mask, 'url'].fillna('')
+        print(f'Checking {urls.nunique()} urls ...')
+        start = time.time()
+        self.resources = self._check_urls(self.resources, mask)
+        print(f'All urls were checked.  ({time.time()-start:.2f}s)')
+
+    def _check_urls(self, resources: pd.DataFrame,
+                    mask: pd.Series) -> pd.DataFrame:
+        """Returns the given resources with the url columns of the resources
+        selected by mask completed (see check_links).
+        """
+        url_cols = ['url_status', 'url_checked', 'size', 'content_type',
+                    'server_modified']
+        resources = resources.astype(
+            {col: RESOURCES_DTYPES[col] for col in url_cols})
+        urls = resources.loc[mask, 'url'].fillna('')
+        if self.link_engine == 'async':
+            infos = urls.map(AsyncLinkChecker().check_all(urls))
+        else:
+            infos = urls.map(check_urls(urls, self.link_workers))
+        resources.loc[mask, 'url_status'] = infos.map(
+            lambda info: info.status)
+        resources.loc[mask, 'url_checked'] = (
+            dt.datetime.now().isoformat(timespec='seconds'))
+        resources.loc[mask, 'size'] = infos.map(lambda info: info.size)
+        resources.loc[mask, 'content_type'] = infos.map(
+            lambda info: info.content_type)
+        resources.loc[mask, 'server_modified'] = infos.map(
+            lambda info: info.last_modified)
+        return resources
+
+    def _spill_files(self) -> Tuple[SpillFile, SpillFile]:
+        """Returns self datasets and resources spill files (created in self
+        spill_dir on first call).
+        """
+        if self.datasets_spill is None:
+            self.datasets_spill = SpillFile.create(
+                self.spill_dir, 'datasets', DATASETS_COLS, DATASETS_DTYPES,
+                'id', Inventory.normalize_datasets)
+        if self.resources_spill is None:
+
+            def check_new_urls(resources: pd.DataFrame) -> pd.DataFrame:
+                if self.link_engine == 'async' or self.parse_processes:
+                    return self._check_urls(resources,
+                                            resources.url_status.isna())
+                return resources
+
+            self.resources_spill = SpillFile.create(
+                self.spill_dir, 'resources', RESOURCES_COLS, RESOURCES_DTYPES,
+                'dataset_id', Inventory.normalize_resources, check_new_urls)
+        return self.datasets_spill, self.resources_spill
+
+    def export_spilled(self, path: str = './', datasets_filename: str = '',
+                       resources_filename: str = '',
+                       fill_values: Optional[Dict[str, Any]] = None,
+                       now: Optional[dt.datetime] = None) -> Tuple[str, str]:
+        """Exports the spilled datasets and resources chunk by chunk (see 
+        spill_dir): datasets are merged back in id order SPILL_CHUNK_ROWS at a
+        time, along with their resources, and each chunk gets the platform 
+        info collected meanwhile (see update_platform_info), its missing 
+        fields completed (see complete_missing_fields) and filled with the 
+        given fill_values (see fill_missing), and is validated (see validate),
+        before being appended to the csv files (or Parquet files, for 
+        filenames ending with '.parquet', which require pyarrow). Returns the
+        paths of both files.
+        """
+        datasets_spill, resources_spill = self._spill_files()
+        now = now or dt.datetime.now()
+        datasets_path: str = self._export_path(path, datasets_filename,
+                                               'datasets')
+        resources_path: str = self._export_path(path, resources_filename,
+                                                'resources')
+        print()
+        print(f'Finalizing {datasets_spill.rows} datasets and '
+              f'{resources_spill.rows} resources ...')
+        start = time.time()
+        unknown_formats: List[pd.Series] = []
+        violations: List[pd.DataFrame] = []
+        datasets_rows: int = 0
+        resources_rows: int = 0
+        with ChunkWriter(datasets_path) as datasets_writer, \
+                ChunkWriter(resources_path) as resources_writer:
+            for datasets, resources in iter_matched_chunks(
+                    datasets_spill, resources_spill, SPILL_CHUNK_ROWS):
+                part = Inventory(datasets=datasets, resources=resources,
+                                 compliance=self.compliance,
+                                 previous=self.previous)
+                if not datasets.empty:
+                    for patch in self.platform_patches:
+                        part._apply_platform_info(*patch)
+                    # (unknown formats are reported once, for all chunks)
+                    part._complete(now=now, incremental=True,
+                                   report_formats=False)
+                    unknown_formats.append(part.unknown_formats)
+                    if fill_values:
+                        part.datasets = fill_missing(part.datasets,
+                                                     fill_values)
+                # (rows numbered as in the exported files)
+                violations.append(validate_inventory(
+                    part.datasets.set_axis(range(
+                        datasets_rows, datasets_rows + len(part.datasets))),
+                    part.resources.set_axis(range(
+                        resources_rows,
+                        resources_rows + len(part.resources)))))
+                datasets_rows += len(part.datasets)
+                resources_rows += len(part.resources)
+                datasets_writer.write(part.datasets)
+                resources_writer.write(part.resources)
+            # (headers only, if nothing was spilled)
+            if not datasets_writer.chunks:
+                datasets_writer.write(datasets_spill.to_frame([]))
+            if not resources_writer.chunks:
+                resources_writer.write(resources_spill.to_frame([]))
+        init()
+        print(Fore.GREEN + f'Spilled inventories were successfully exported '
+              f'to {datasets_path} and {resources_path}.  '
+              f'({time.time()-start:.2f}s)' + Fore.RESET)
+        if unknown_formats:
+            self.unknown_formats = (pd.concat(unknown_formats)
+                                    .groupby(level=0).sum()
+                                    .sort_values(ascending=False))
+            self._report_unknown_formats()
+        # (a missing column is reported once, not once per chunk)
+        violations = [v for v in violations if not v.empty]
+        self.violations = (pd.concat(violations, ignore_index=True)
+                           if violations
+                           else pd.DataFrame(columns=VIOLATIONS_COLS))
+        self.violations = self.violations[
+            ~(self.violations.check.eq('missing column')
+              & self.violations.duplicated(['table', 'field', 'check']))
+        ].reset_index(drop=True)
+        self._report_violations()
+        return datasets_path, resources_path
+
+    def discard_spilled(self) -> NoReturn:
+        """Removes the files of the spilled datasets and resources."""
+        for spill in (self.datasets_spill, self.resources_spill):
+            if spill is not None:
+                spill.remove()
+        self.datasets_spill = self.resources_spill = None
+
+    def _complete(self, columns: Optional[List[str]] = None,
+                  now: Optional[dt.datetime] = None,
+                  verbose: bool = False,
+                  incremental: bool = False,
+                  report_formats: bool = True) -> NoReturn:
+        """Completes the given columns of the datasets table (all those of 
+        self compliance rules, if none given) by evaluating their rules, and
+        reports the formats unknown to the open formats check, if any (and 
+        report_formats). If incremental, the columns of the datasets found 
+        unchanged since the previous inventory (see PreviousInventory.track)
+        are carried over from it instead (those depending on the current 
+        time aside).
+        """
+        changed: Optional[pd.Series] = None
+        if incremental and self.previous and self.previous.unchanged:
+            changed = ~self.datasets['id'].isin(list(self.previous.unchanged))
+            if verbose:
+                print(f'Compliance of {len(changed) - changed.sum()} '
+                      'unchanged datasets is carried over from the previous '
+                      f'inventory ({changed.sum()} changed datasets).')
+        reports: Dict[str, Any] = self.compliance.evaluate(
+            self.datasets, self.resources, now, columns, verbose, changed)
+        if 'unknown_formats' in reports:
+            self.unknown_formats = reports['unknown_formats']
+            if report_formats:
+                self._report_unknown_formats()
+
+    def _report_unknown_formats(self) -> NoReturn:
+        """Prints the formats of self unknown_formats, if any."""
+        if not self.unknown_formats.empty:
+            print(f'{self.unknown_formats.sum()} resources have formats '
+                  'unknown to the open formats check (ignored): '
+                  + ', '.join(f'{format} ({n})' for format, n
+                              in self.unknown_formats.head(10).items())
+                  + (', ...' if len(self.unknown_formats) > 10 else ''))
 
     def complete_modified(self) -> NoReturn:
-        """Completes column 'modified' of the datasets table."""
-        self.datasets.modified = self.datasets.apply(
-            lambda ds: Inventory.infer_modified(ds, self.resources), axis=1
-        )
+        """Completes column 'modified' of the datasets table (see 
+        infer_modified).
+        """
+        self._complete(['modified'])
 
     def complete_up_to_date(self, 
                             now: dt.datetime = dt.datetime.now()) -> NoReturn:
-        """Completes 'up_to_date' column of the datasets table."""
-        self.datasets.up_to_date = self.datasets.apply(
-            lambda ds: Inventory.get_up_to_date(ds, now), axis=1
-        )
+        """Completes 'up_to_date' column of the datasets table (see 
+        get_up_to_date).
+        """
+        self._complete(['up_to_date'], now)
 
     def complete_official_lang(self) -> NoReturn:
-        """Completes 'official_lang' column of the datasets table."""
-        self.datasets.official_lang = self.datasets.apply(
-            lambda ds: Inventory.get_official_lang(ds, self.resources), axis=1
-        )
+        """Completes 'official_lang' column of the datasets table (see 
+        get_official_lang).
+        """
+        self._complete(['official_lang'])
 
     def complete_open_formats(self) -> NoReturn:
-        """Completes 'open_formats' column of the datasets table."""
-        self.datasets.open_formats = self.datasets.apply(
-            lambda ds: Inventory.get_open_formats(ds, self.resources), axis=1
-        )
+        """Completes 'open_formats' column of the datasets table (see 
+        get_open_formats). Formats unknown to FORMATS are ignored, and 
+        reported (see self unknown_formats).
+        """
+        self._complete(['open_formats'])
 
     def complete_spec(self) -> NoReturn:
-        """Completes 'spec' column of the datasets table."""
-        self.datasets.spec = self.datasets.apply(
-            lambda ds: Inventory.get_spec(ds, self.resources), axis=1
-        )
+        """Completes 'spec' column of the datasets table (see get_spec)."""
+        self._complete(['spec'])
 
-    def complete_missing_fields(self) -> NoReturn:
+    def complete_missing_fields(self,
+                                now: Optional[dt.datetime] = None
+                                ) -> NoReturn:
         """Completes columns of datasets inventory: 'modified', 'up_to_date', 
         'official_lang', 'open_formats' and 'spec' (details given in getters 
-        documentation).
+        documentation), along with the columns of any other rule registered 
+        in self compliance, all evaluated over a single grouping of the 
+        resources by dataset. Only the datasets that changed since the 
+        previous inventory, if any, are evaluated (see _complete).
         """
-        # Computing modified for datasets
         print()
-        print('Completing datasets\' modified dates.')
-        self.complete_modified()
-        # Checking currency for datasets
-        print('Verifying datasets\' currency.')
-        self.complete_up_to_date()
-        # Checking official languages compliancy
-        print('Verifying official languages compliance.')
-        self.complete_official_lang()
-        # Checking open formats compliancy
-        print('Verifying open formats compliance.')
-        self.complete_open_formats()
-        # Checking specification
-        print('Verifying specification / data dictionary compliance.')
-        self.complete_spec()
+        self._complete(now=now, verbose=True, incremental=True)
+        print(self.compliance.stats.round(3).to_string(index=False))
         print("Inventories are ready.")
 
     def update_platform_info(self, platform: str, dc: DataCatalogue,
@@ -561,9 +1051,13 @@ class Inventory:
         """Updates the registry or catalogue info (platform passed in the 
         arguments) of the datasets whose id is in the given list, along
         with the platform links of their associated resources. If no list 
-        given, checks all the datasets.
+        given, checks all the datasets (a list is required when self 
+        spill_dir is set: spilled rows are updated by export_spilled).
         """
         if not id_list:
+            if self.spill_dir:
+                raise ValueError('id_list parameter is required when '
+                                 'inventories are spilled')
             id_list = list(self.datasets.id)
 
         pbar = tqdm(desc='Processed Datasets', total=len(id_list), 
@@ -584,29 +1078,80 @@ class Inventory:
                 raise ValueError('platform parameter must be either'
                                  ' "registry" or "catalogue"')
 
+        # collects the platform's values, applied at once afterwards
+        datasets_values: List[Tuple[str, bool, str, str, str]] = []
+        resources_links: Dict[str, str] = {}
         for id in id_list:
             try:
                 dataset = dc.get_dataset(id)
 
-                # update dataset
+                # dataset's values
                 org = dataset['organization']['name']
                 org_title = re.sub(r'([^\|]+) \| ([^\|]+)', r'\1',
                                    dataset['organization']['title'])
-                link = datasets_base_url.format(id)
-                self.datasets.loc[self.datasets.id == id, 
-                                  cols_to_update] = True, org, org_title, link
-
-                # update resources links
-                resources_ids = [res['id'] for res in dataset['resources']]
-                self.resources[cols_to_update[-1]] = self.resources.apply(
-                    lambda row: (resources_base_url
-                                 .format(id, row.id) if row.id in resources_ids # pylint: disable=cell-var-from-loop
-                                 else row.catalogue_link), axis=1)
+                datasets_values.append((id, True, org, org_title,
+                                        datasets_base_url.format(id)))
+
+                # resources' links
+                for res in dataset['resources']:
+                    resources_links[res['id']] = resources_base_url.format(
+                        id, res['id'])
             except: # pylint: disable=bare-except
                 pass
             finally:
                 pbar.update()
+        pbar.close()
 
+        patch: pd.DataFrame = (
+            pd.DataFrame.from_records(datasets_values,
+                                      columns=['id'] + cols_to_update)
+            .drop_duplicates('id', keep='last')
+            .set_index('id'))
+        links = pd.Series(resources_links, dtype='string')
+        if self.spill_dir:
+            # (spilled rows are updated chunk by chunk, see export_spilled)
+            self.platform_patches.append((cols_to_update, patch, links))
+        else:
+            self._apply_platform_info(cols_to_update, patch, links)
+
+    def _apply_platform_info(self, cols_to_update: List[str],
+                             patch: pd.DataFrame,
+                             links: pd.Series) -> NoReturn:
+        """Updates the given platform columns of self datasets with the 
+        patch's values, and the platform links of self resources with the 
+        given links (both by id).
+        """
+        # updates datasets and resources in one pass each, keyed by id
+        add_categories(self.datasets, {column: list(patch[column])
+                                       for column in cols_to_update})
+        patched: pd.Series = self.datasets.id.isin(patch.index)
+        patched_ids: pd.Series = self.datasets.loc[patched, 'id']
+        for column in cols_to_update:
+            self.datasets.loc[patched, column] = patched_ids.map(
+                patch[column])
+
+        linked: pd.Series = self.resources.id.isin(links.index)
+        self.resources.loc[linked, cols_to_update[-1]] = (
+            self.resources.loc[linked, 'id'].map(links))
+
+    def validate(self) -> NoReturn:
+        """Validates self datasets and resources against their schemas (see 
+        validate_inventory) and stores their violations in self violations,
+        summarizing them by field and check.
+        """
+        self.violations = validate_inventory(self.datasets, self.resources)
+        self._report_violations()
+
+    def _report_violations(self) -> NoReturn:
+        """Prints the summary of self violations, by field and check."""
+        print()
+        if self.violations.empty:
+            print('Inventories are valid.')
+            return
+        print(f'{len(self.violations)} values violate the inventories\' '
+              'schemas:')
+        print(self.violations.groupby(['table', 'field', 'check'], sort=False)
+              .size().rename('values').reset_index().to_string(index=False))
 
     def export_datasets(self, path: str = './', filename: str = '') -> NoReturn:
         """Exports self datasets dataframe as a csv file at the given path, if
@@ -620,12 +1165,27 @@ class Inventory:
         """
         self._export_to_csv(self.resources, 'resources', path, filename)
 
-    def _export_to_csv(self, df: pd.DataFrame, df_name: str, 
-                       path: str, filename: str) -> NoReturn:
-        """Exports DataFrame df as a csv file to the given path, if any. 
-        Needs also the name of df as a string for outputs.
+    def export_hosts_telemetry(self, path: str = './',
+                               filename: str = '') -> NoReturn:
+        """Exports self hosts telemetry dataframe as a csv file at the given 
+        path, if any; if none given, exports it in the current folder.
+        """
+        self._export_to_csv(self.hosts_telemetry, 'hosts telemetry', path,
+                            filename)
+
+    def export_violations(self, path: str = './',
+                          filename: str = '') -> NoReturn:
+        """Exports self violations dataframe as a csv file at the given path, 
+        if any; if none given, exports it in the current folder.
         """
+        self._export_to_csv(self.violations, 'violations', path, filename)
 
+    @staticmethod
+    def _export_path(path: str, filename: str, df_name: str) -> str:
+        """Returns the full path of the file exported to the given path (a 
+        timestamped csv file named after df_name, if no filename is given), 
+        creating its directories if needed.
+        """
         # makes sure there is no backslash issue in path name
         if path != './':
             path = re.sub(r'[\\]+', '/', path)
@@ -636,7 +1196,16 @@ class Inventory:
         if filename == '':
             timestamp: str = dt.datetime.now().strftime("%Y-%m-%d_%H%M%S")
             filename = f'{timestamp}_{df_name}_inventory.csv'
-        full_path: str = path + filename
+        return path + filename
+
+    def _export_to_csv(self, df: pd.DataFrame, df_name: str, 
+                       path: str, filename: str) -> NoReturn:
+        """Exports DataFrame df as a csv file to the given path, if any. 
+        Needs also the name of df as a string for outputs.
+        """
+
+        full_path: str = self._export_path(path, filename, df_name)
+        filename = full_path.rsplit('/', 1)[-1]
         msg: str
         init()
         try:
@@ -666,4 +1235,38 @@ def as_bool(x, default=False):
         # handles 0/1, numpy ints, etc.
         return bool(int(x))
     except Exception:
-        return bool(x)
\ No newline at end of file
+        return bool(x)
+
+
+def _strings(column: pd.Series) -> pd.Series:
+    """Returns the given column with its non-string values set to None."""
+    return column.astype(object).where(column.map(type) == str, None)
+
+
+def parse_payloads(payloads: List[bytes], from_catalogue: bool = False
+                   ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Parses the given raw CKAN API responses (package_show's dataset, 
+    package_search's page of datasets, or a JSON list of datasets) and 
+    returns their datasets and resources as column chunks: normalized 
+    dataframes with the inventories dtypes (categories keep them compact to 
+    send back from another process). Urls are not checked. (Note: defined at 
+    module level to be run in a process pool.)
+    """
+    datasets: List[Tuple[Any, ...]] = []
+    resources: List[Tuple[Any, ...]] = []
+    for payload in payloads:
+        data: Any = json.loads(payload)
+        if isinstance(data, dict) and 'result' in data:
+            assert data.get('success'), \
+                'CKAN API Error: request\'s success is False'
+            data = data['result']
+        if isinstance(data, dict):
+            data = data['results'] if 'results' in data else [data]
+        for dataset in data:
+            datasets.append(
+                Inventory.parse_dataset(dataset, from_catalogue).as_tuple())
+            resources.extend(
+                Inventory.parse_resource(resource, from_catalogue).as_tuple()
+                for resource in dataset.get('resources', []))
+    return (Inventory.datasets_frame(datasets),
+            Inventory.resources_frame(resources))
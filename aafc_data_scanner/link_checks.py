@@ -6,13 +6,39 @@ filter rows whose 'url_status' indicates a broken link, and list a report in
 Redirects (301/302/307/308) are NOT treated as broken but the filter
 can be altered easily.
 
+With --refresh, the 'url' column of the inventory is re-checked first (in 
+parallel, by a bounded pool of workers) and 'url_status' is rewritten in 
+place, so links health can be refreshed without a full CKAN rescan:
+  py -m aafc_data_scanner.link_checks --refresh [--workers 64] [inventories]
+
+Adding --budget SECONDS bounds the refresh to a wall-clock budget: urls never 
+checked come first, then the ones broken last time, then the ones with the 
+oldest 'url_checked' timestamp. Urls left when the budget runs out keep their 
+previous status and are checked first by the next runs.
+
+Adding --engine async checks the urls with the asyncio engine, holding up to 
+thousands of requests at once instead of one thread per request.
+
 """
 from __future__ import annotations
 
+import argparse
+import concurrent.futures
+from dataclasses import dataclass
+import datetime as dt
 import sys
+import threading
+import time
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 import pandas as pd
+import urllib3
 from colorama import Fore
+from tqdm import tqdm
+
+from .async_links import AsyncLinkChecker
+from .constants import LINK_CHECK_WORKERS
+from .tools import TenaciousSession, UrlInfo
 
 def resolve_inventories_dir(arg: str | None) -> Path:
     if arg:
@@ -24,20 +50,205 @@ def resolve_inventories_dir(arg: str | None) -> Path:
     return script_inv
 
 
-def main() -> int:
-    inventories_dir = resolve_inventories_dir(sys.argv[1] if len(sys.argv) > 1 else None)
-    in_csv = Path(__file__).resolve().parent.parent / "inventories" / "_latest_resources_inventory.csv"
-    out_csv = Path(__file__).resolve().parent.parent / "inventories" / "_latest_broken_links.csv"
+_DONE: Any = object()
+"""Marks the end of the urls taken by check_urls' workers."""
+
+
+def check_url(session: TenaciousSession, url: str) -> UrlInfo:
+    """Returns the status code of the given url (-1 if it is not a valid url, 
+    most likely an internal file path), along with the size, content type 
+    and last modified date given by the response headers.
+    """
+    if not isinstance(url, str):
+        return UrlInfo(-1)
+    return session.get_url_info(url)
+
+
+def check_urls(urls: Iterable[str],
+               max_workers: int = LINK_CHECK_WORKERS,
+               deadline: Optional[float] = None) -> Dict[str, UrlInfo]:
+    """Checks the given urls in parallel (each distinct url once, in the given
+    order) with a pool of max_workers threads, each sending one request at 
+    a time, and returns their results (see check_url) by url. If a deadline 
+    is given (as time.monotonic() value), no new url is sent once it is 
+    reached; the urls left out are not part of the result.
+    """
+    unique_urls: List[str] = list(dict.fromkeys(urls))
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    session = TenaciousSession(skip_ssl=True, pool_maxsize=max_workers)
+    statuses: Dict[str, UrlInfo] = {}
+    pbar = tqdm(desc='Checked Urls', total=len(unique_urls),
+                colour='green', ncols=100, ascii=' -=')
+    # (shared by the workers: each url is taken by a single one)
+    pending: Iterator[str] = iter(unique_urls)
+    lock = threading.Lock()
+
+    def work() -> None:
+        while deadline is None or time.monotonic() < deadline:
+            with lock:
+                url = next(pending, _DONE)
+            if url is _DONE:
+                return
+            info: UrlInfo = check_url(session, url)
+            with lock:
+                statuses[url] = info
+                pbar.update()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        workers = [executor.submit(work)
+                   for _ in range(min(max_workers, len(unique_urls)))]
+        for worker in workers:
+            worker.result()
+    pbar.close()
+    return statuses
+
+
+@dataclass
+class LinkCheckScheduler:
+    """Decides which urls of a resources inventory get re-checked in a run, 
+    given a wall-clock budget, and carries forward the previous status of 
+    the ones deferred to future runs.
+    """
+
+    budget: Optional[float] = None
+    """Wall-clock budget of a run, in seconds (no limit if None). Requests 
+    still in flight when it runs out are awaited.
+    """
+
+    max_workers: int = LINK_CHECK_WORKERS
+    """Maximum number of urls checked at once (by the threads engine)."""
+
+    engine: str = 'threads'
+    """Engine checking the urls: 'threads' (one thread per url in flight) or
+    'async' (AsyncLinkChecker, for very large resource sets).
+    """
+
+    @staticmethod
+    def prioritize(df: pd.DataFrame) -> List[str]:
+        """Returns the distinct urls of the resources inventory df, ordered by 
+        priority: never checked first, then broken last time, then by oldest 
+        check timestamp.
+        """
+        urls = df[df["url"].notna()]
+        status_num = pd.to_numeric(urls["url_status"], errors="coerce")
+        if "url_checked" in urls.columns:
+            checked = pd.to_datetime(urls["url_checked"], errors="coerce")
+        else:
+            checked = pd.Series(pd.NaT, index=urls.index)
+        tiers = pd.DataFrame({
+            "url": urls["url"],
+            "tier": 2 - is_broken(status_num).astype(int)
+                    - status_num.isna().astype(int),
+            "checked": checked,
+        })
+        tiers = (tiers.groupby("url", sort=False)
+                 .agg(tier=("tier", "min"), checked=("checked", "min"))
+                 .sort_values(["tier", "checked"], na_position="first",
+                              kind="stable"))
+        return list(tiers.index)
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Re-checks as many urls of the resources inventory df as the budget 
+        allows (by priority) and updates their 'url_status', 'url_checked', 
+        'size', 'content_type' and 'server_modified' columns; other rows keep 
+        their previous values.
+        """
+        deadline = (time.monotonic() + self.budget
+                    if self.budget is not None else None)
+        urls = LinkCheckScheduler.prioritize(df)
+        if self.engine == 'async':
+            statuses = AsyncLinkChecker().check_all(urls, deadline)
+        else:
+            statuses = check_urls(urls, self.max_workers, deadline)
+        checked_at = dt.datetime.now().isoformat(timespec='seconds')
+
+        checked = df["url"].isin(statuses.keys())
+        infos = df.loc[checked, "url"].map(statuses)
+        for col in ["url_checked", "size", "content_type", "server_modified"]:
+            if col not in df.columns:
+                df[col] = None
+        df.loc[checked, "url_status"] = infos.map(
+            lambda info: str(info.status))
+        df.loc[checked, "url_checked"] = checked_at
+        df.loc[checked, "size"] = infos.map(
+            lambda info: None if info.size is None else str(info.size))
+        df.loc[checked, "content_type"] = infos.map(
+            lambda info: info.content_type)
+        df.loc[checked, "server_modified"] = infos.map(
+            lambda info: info.last_modified)
+        # rows without url are not links
+        df.loc[df["url"].isna(), "url_status"] = "-1"
+
+        deferred = len(urls) - len(statuses)
+        if deferred:
+            print(Fore.YELLOW + f"Budget reached: {deferred} urls deferred "
+                  "to the next runs (previous statuses kept)." + Fore.RESET)
+        return df
+
+
+def is_broken(status_num: pd.Series) -> pd.Series:
+    """Returns the mask of broken links, given their numeric url statuses."""
+    # Broken when: NaN OR negative (-1 unreachable, -2 host down) OR >= 400
+    return status_num.isna() | (status_num < 0) | (status_num >= 400)
+
+
+def refresh_url_statuses(df: pd.DataFrame,
+                         max_workers: int = LINK_CHECK_WORKERS,
+                         budget: Optional[float] = None,
+                         engine: str = 'threads') -> pd.DataFrame:
+    """Re-checks the 'url' column of the given resources inventory and 
+    rewrites its 'url_status' column accordingly (within the given budget in 
+    seconds, if any).
+    """
+    return LinkCheckScheduler(budget, max_workers, engine).run(df)
+
+
+def read_inventory(in_csv: Path) -> pd.DataFrame:
+    try:
+        return pd.read_csv(in_csv, dtype=str, encoding="utf-8-sig")
+    except UnicodeDecodeError:
+        return pd.read_csv(in_csv, dtype=str, encoding="latin-1")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Lists the broken links of the latest resources inventory.")
+    parser.add_argument("inventories_dir", nargs="?", default=None,
+                        help="folder containing _latest_resources_inventory.csv")
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-check all urls and rewrite 'url_status' first")
+    parser.add_argument("--workers", type=int, default=LINK_CHECK_WORKERS,
+                        help="maximum number of urls checked at once")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="wall-clock budget of the refresh, in seconds")
+    parser.add_argument("--engine", choices=["threads", "async"],
+                        default="threads",
+                        help="engine checking the urls")
+    args = parser.parse_args(argv if argv is not None else [])
+
+    if args.inventories_dir:
+        inventories_dir = resolve_inventories_dir(args.inventories_dir)
+    else:
+        inventories_dir = Path(__file__).resolve().parent.parent / "inventories"
+    in_csv = inventories_dir / "_latest_resources_inventory.csv"
+    out_csv = inventories_dir / "_latest_broken_links.csv"
 
 
     if not in_csv.exists():
         print(f"[error] Not found: {in_csv}", file=sys.stderr)
         return 1
 
-    try:
-        df = pd.read_csv(in_csv, dtype=str, encoding="utf-8-sig")
-    except UnicodeDecodeError:
-        df = pd.read_csv(in_csv, dtype=str, encoding="latin-1")
+    df = read_inventory(in_csv)
+
+    if args.refresh:
+        if "url" not in df.columns:
+            print("[error] Column 'url' not found in input CSV.", file=sys.stderr)
+            return 1
+        print(f"Refreshing url statuses of {in_csv}")
+        df = refresh_url_statuses(df, args.workers, args.budget,
+                                  args.engine)
+        df.to_csv(in_csv, index=False, encoding="utf-8-sig")
+        print(Fore.GREEN + f"Url statuses were rewritten in {in_csv}" + Fore.RESET)
 
     if "url_status" not in df.columns:
         print("[error] Column 'url_status' not found in input CSV.", file=sys.stderr)
@@ -45,8 +256,7 @@ def main() -> int:
 
     status_num = pd.to_numeric(df["url_status"], errors="coerce")
 
-    # Broken when: NaN OR -1 OR >= 400
-    broken_mask = status_num.isna() | (status_num == -1) | (status_num >= 400)
+    broken_mask = is_broken(status_num)
     broken_df = df[broken_mask].copy()
 
 
@@ -66,4 +276,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,154 @@
+"""Contains Stage and Pipeline classes, running items through stages of
+worker threads connected by bounded queues.
+"""
+
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, NoReturn, Optional
+
+import pandas as pd
+
+from .constants import PIPELINE_QUEUE_SIZE
+
+
+_DONE = object()
+"""Sentinel put in a stage's queue, once per worker, when no item is left."""
+
+
+@dataclass
+class Stage:
+    """Step of a Pipeline: its workers take items from the stage's queue and
+    pass each item to the stage's function, whose returned items (none, one
+    or many) are put in the next stage's queue.
+    """
+
+    name: str
+    """Name of the stage (in the statistics)."""
+
+    function: Callable[[Any], Iterable[Any]]
+    """Function processing an item and returning the items it produces."""
+
+    workers: int = 1
+    """Number of worker threads of the stage."""
+
+    flush: Optional[Callable[[], Iterable[Any]]] = None
+    """Function called by each worker once no item is left, whose returned 
+    items are passed on too (e.g. the last partial batch of a batching stage).
+    """
+
+    items_in: int = field(default=0, init=False)
+    """Number of items processed by the stage."""
+
+    items_out: int = field(default=0, init=False)
+    """Number of items produced by the stage."""
+
+    errors: int = field(default=0, init=False)
+    """Number of items whose processing raised an exception."""
+
+    busy: float = field(default=0, init=False)
+    """Total time spent by the workers in the stage's function, in seconds."""
+
+    wall: float = field(default=0, init=False)
+    """Time from the pipeline's start to the stage's end, in seconds."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock, init=False,
+                                 repr=False)
+    """Mutex on the stage's statistics."""
+
+
+@dataclass
+class Pipeline:
+    """Runs items through the given stages, each stage's workers feeding the
+    next stage's queue. Queues are bounded, so that a slow stage holds its
+    upstream stages back (backpressure) instead of letting pending items
+    pile up in memory. Items produced by the last stage are dropped (it is
+    expected to be a sink storing them).
+    """
+
+    stages: List[Stage]
+    """Stages of the pipeline, in order."""
+
+    queue_size: int = PIPELINE_QUEUE_SIZE
+    """Maximum number of items waiting in each stage's queue."""
+
+    def run(self, items: Iterable[Any]) -> NoReturn:
+        """Feeds the given items to the first stage and returns once every
+        stage is done with them.
+        """
+        start: float = time.perf_counter()
+        queues: List[queue.Queue] = [queue.Queue(maxsize=self.queue_size)
+                                     for _ in self.stages]
+        threads: List[List[threading.Thread]] = []
+        for i, stage in enumerate(self.stages):
+            output: Optional[queue.Queue] = (queues[i + 1]
+                                             if i + 1 < len(queues) else None)
+            stage_threads = [threading.Thread(target=self._work, daemon=True,
+                                              args=(stage, queues[i], output),
+                                              name=f'{stage.name}-{n}')
+                             for n in range(stage.workers)]
+            for thread in stage_threads:
+                thread.start()
+            threads.append(stage_threads)
+
+        for item in items:
+            queues[0].put(item)
+        # stops stages one after the other, once their upstream stage is done
+        for stage, stage_queue, stage_threads in zip(self.stages, queues,
+                                                     threads):
+            for _ in stage_threads:
+                stage_queue.put(_DONE)
+            for thread in stage_threads:
+                thread.join()
+            stage.wall = time.perf_counter() - start
+
+    @staticmethod
+    def _work(stage: Stage, input: queue.Queue,
+              output: Optional[queue.Queue]) -> NoReturn:
+        """Worker loop of the given stage."""
+        items_in, items_out, errors, busy = 0, 0, 0, 0.0
+        while True:
+            item: Any = input.get()
+            done: bool = item is _DONE
+            if done and stage.flush is None:
+                break
+            start: float = time.perf_counter()
+            try:
+                if done and stage.flush is not None:
+                    results: List[Any] = list(stage.flush())
+                else:
+                    items_in += 1
+                    results = list(stage.function(item))
+            except Exception as e: # pylint: disable=broad-except
+                print(f'!!! Exception in {stage.name} stage for {item!r:.80}:'
+                      f' {e}')
+                errors += 1
+                results = []
+            busy += time.perf_counter() - start
+            items_out += len(results)
+            if output is not None:
+                for result in results:
+                    output.put(result)
+            if done:
+                break
+        with stage.lock:
+            stage.items_in += items_in
+            stage.items_out += items_out
+            stage.errors += errors
+            stage.busy += busy
+
+    def stats(self) -> pd.DataFrame:
+        """Returns a DataFrame of each stage's statistics: workers, items in
+        and out, errors, busy and wall times (s), throughput (items in per
+        second) and utilization of its workers.
+        """
+        stats = pd.DataFrame(
+            [(s.name, s.workers, s.items_in, s.items_out, s.errors, s.busy,
+              s.wall) for s in self.stages],
+            columns=['stage', 'workers', 'items_in', 'items_out', 'errors',
+                     'busy_s', 'wall_s'])
+        wall: pd.Series = stats['wall_s'].where(stats['wall_s'] > 0)
+        stats['items_per_s'] = stats['items_in'] / wall
+        stats['utilization'] = stats['busy_s'] / (stats['workers'] * wall)
+        return stats.round(3)
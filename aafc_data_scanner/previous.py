@@ -0,0 +1,202 @@
+"""Contains PreviousInventory class, hash indexes of a previous inventory's
+rows, reused for the datasets and resources unchanged since.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+import datetime as dt
+import os
+import threading
+from typing import Any, Dict, List, NoReturn, Optional, Set, Tuple, cast
+
+import pandas as pd
+
+from .constants import (DATASETS_COLS, DATASETS_DTYPES, RESOURCES_COLS,
+                        RESOURCES_DTYPES, REUSED_URL_STATUS_MAX_AGE_DAYS)
+from .records import DatasetRecord, ResourceRecord
+
+
+_DatasetKey = Tuple[str, str]
+_ResourceKey = Tuple[str, str, str]
+
+_URL_COLS = ['url_status', 'url_checked', 'size', 'content_type',
+             'server_modified']
+"""Resources' columns completed by url checks."""
+
+_PLATFORM_COLS = {
+    True: ['on_catalogue', 'aafc_org', 'aafc_org_title', 'catalogue_link'],
+    False: ['on_registry', 'org', 'org_title', 'registry_link'],
+}
+"""Datasets' columns specific to each platform (by from_catalogue)."""
+
+
+def _key_part(value: Any) -> str:
+    """Returns the given value as part of a key (missing values as '')."""
+    return '' if value is None or pd.isna(value) else str(value)
+
+
+@dataclass
+class PreviousInventory:
+    """Rows of a previous inventory (e.g. the _latest_* csv files), indexed
+    by dataset (id, metadata_modified) and by resource (id,
+    metadata_modified, url), so that datasets and resources unchanged since
+    are taken from it instead of being parsed again. The url columns of a
+    resource are reused too if its url was checked less than
+    REUSED_URL_STATUS_MAX_AGE_DAYS days before loading (its url is checked
+    again otherwise).
+    """
+
+    datasets: Dict[_DatasetKey, Dict[str, Any]] = field(default_factory=dict)
+    """Previous datasets' rows (by column), by key."""
+
+    resources: Dict[_ResourceKey, Dict[str, Any]] = field(
+        default_factory=dict)
+    """Previous resources' rows (by column, url columns cleared if their
+    check is not fresh), by key.
+    """
+
+    dataset_resources: Counter = field(default_factory=Counter)
+    """Numbers of previous resources, by dataset id."""
+
+    reused: Counter = field(default_factory=Counter, init=False)
+    """Numbers of datasets, resources and url statuses reused so far."""
+
+    unchanged: Set[str] = field(default_factory=set, init=False)
+    """Ids of the datasets found unchanged so far (see track), whose
+    compliance columns need not be computed again.
+    """
+
+    lock: threading.Lock = field(default_factory=threading.Lock, init=False,
+                                 repr=False)
+    """Mutex on the reused counters and the unchanged datasets."""
+
+    @classmethod
+    def load(cls, path: str = './inventories/',
+             datasets_filename: str = '_latest_datasets_inventory.csv',
+             resources_filename: str = '_latest_resources_inventory.csv',
+             now: Optional[dt.datetime] = None) -> 'PreviousInventory':
+        """Returns the index of the datasets and resources inventories
+        exported to the given path (empty if they do not exist).
+        """
+        datasets = cls._read(os.path.join(path, datasets_filename),
+                             DATASETS_COLS, DATASETS_DTYPES)
+        resources = cls._read(os.path.join(path, resources_filename),
+                              RESOURCES_COLS, RESOURCES_DTYPES)
+
+        # url checks older than the max age are dropped
+        cutoff = ((now or dt.datetime.now())
+                  - dt.timedelta(days=REUSED_URL_STATUS_MAX_AGE_DAYS))
+        checked = pd.to_datetime(resources['url_checked'], errors='coerce',
+                                 format='ISO8601')
+        resources.loc[~(checked >= cutoff), _URL_COLS] = None
+
+        # (rows keyed by column name)
+        datasets_rows = cast(List[Dict[str, Any]], datasets.to_dict('records'))
+        resources_rows = cast(List[Dict[str, Any]],
+                              resources.to_dict('records'))
+        return cls(
+            {(_key_part(id), _key_part(modified)): row for id, modified, row
+             in zip(datasets['id'], datasets['metadata_modified'],
+                    datasets_rows)},
+            {(_key_part(id), _key_part(modified), _key_part(url)): row
+             for id, modified, url, row
+             in zip(resources['id'], resources['metadata_modified'],
+                    resources['url'], resources_rows)},
+            Counter(map(_key_part, resources['dataset_id'])))
+
+    @staticmethod
+    def _read(path: str, columns: list, dtypes: Dict[str, str]
+              ) -> pd.DataFrame:
+        """Returns the inventory exported to the given path (with the given
+        columns and dtypes, as far as it has them), or an empty one.
+        """
+        if not os.path.isfile(path):
+            return pd.DataFrame(columns=columns)
+        header: pd.Index = pd.read_csv(path, nrows=0,
+                                       encoding='utf_8_sig').columns
+        df = pd.read_csv(path, encoding='utf_8_sig', keep_default_na=False,
+                         na_values=[''],
+                         dtype={col: dtype for col, dtype in dtypes.items()
+                                if col in header})
+        df = df.reindex(columns=columns)
+        return df.astype(object).where(df.notna(), None)
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        with self.lock:
+            self.reused[counter] += n
+
+    def dataset_record(self, dataset: dict, from_catalogue: bool = False
+                       ) -> Optional[DatasetRecord]:
+        """Returns the record of the given dataset (CKAN package) from its
+        previous row, if it is unchanged (None otherwise). As when parsing,
+        the other platform's columns are left empty.
+        """
+        row: Optional[Dict[str, Any]] = self.datasets.get(
+            (_key_part(dataset.get('id')),
+             _key_part(dataset.get('metadata_modified'))))
+        if row is None:
+            return None
+        record = DatasetRecord.from_mapping(row)
+        for column in _PLATFORM_COLS[not from_catalogue]:
+            record[column] = None
+        self._count('datasets')
+        return record
+
+    def resource_record(self, resource: dict, from_catalogue: bool = False
+                        ) -> Optional[ResourceRecord]:
+        """Returns the record of the given resource from its previous row,
+        if it is unchanged (None otherwise). As when parsing, the other
+        platform's link is left empty.
+        """
+        row: Optional[Dict[str, Any]] = self.resources.get(
+            (_key_part(resource.get('id')),
+             _key_part(resource.get('metadata_modified')),
+             _key_part(resource.get('url'))))
+        if row is None:
+            return None
+        record = ResourceRecord.from_mapping(row)
+        record['registry_link' if from_catalogue else 'catalogue_link'] = None
+        self._count('resources')
+        if record['url_status'] is not None:
+            self._count('url statuses')
+        return record
+
+    def track(self, dataset: dict, dataset_record: Optional[DatasetRecord],
+              resource_records: List[Optional[ResourceRecord]]) -> NoReturn:
+        """Notes the given dataset (CKAN package) as unchanged if its record
+        and the records of all its resources were reused (None if not), url
+        statuses included, and it has as many resources as before (none 
+        lost).
+        """
+        if (dataset_record is not None
+                and all(record is not None and record['url_status'] is not None
+                        for record in resource_records)
+                and len(resource_records) == self.dataset_resources[
+                    _key_part(dataset.get('id'))]):
+            with self.lock:
+                self.unchanged.add(_key_part(dataset.get('id')))
+
+    def reuse_url_statuses(self, resources: pd.DataFrame) -> pd.DataFrame:
+        """Returns the given resources with the url columns of the unchanged
+        ones completed from their previous rows, when fresh.
+        """
+        rows: List[Optional[Dict[str, Any]]] = [
+            self.resources.get(key) for key in zip(
+                map(_key_part, resources['id']),
+                map(_key_part, resources['metadata_modified']),
+                map(_key_part, resources['url']))]
+        reused = pd.Series([row is not None and row['url_status'] is not None
+                            for row in rows], index=resources.index,
+                           dtype=bool)
+        if not reused.any():
+            return resources
+        resources = resources.astype(
+            {col: RESOURCES_DTYPES[col] for col in _URL_COLS})
+        previous = pd.DataFrame.from_records(
+            [tuple(row[col] for col in RESOURCES_COLS)
+             for row, r in zip(rows, reused) if r and row is not None],
+            index=resources.index[reused], columns=RESOURCES_COLS)
+        for column in _URL_COLS:
+            resources.loc[reused, column] = previous[column]
+        self._count('url statuses', int(reused.sum()))
+        return resources
@@ -0,0 +1,92 @@
+"""Contains DatasetRecord and ResourceRecord classes, compact records of a
+dataset's or a resource's information between its parsing from a CKAN
+response and its insertion in the inventory's dataframes.
+"""
+
+from typing import Any, Dict, Iterator, Mapping, Tuple, Type, TypeVar
+
+from .constants import DATASETS_COLS, RESOURCES_COLS
+
+
+_R = TypeVar('_R', bound='_Record')
+
+
+class _Record:
+    """Base of the record classes: one slot per column of the dataframe the
+    records end up in (None until set), with dict-like access by column name.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    columns: Tuple[str, ...] = ()
+    """Columns of the dataframe, in order (same as the slots)."""
+
+    def __init__(self) -> None:
+        for column in self.columns:
+            object.__setattr__(self, column, None)
+
+    def __getitem__(self, column: str) -> Any:
+        try:
+            return getattr(self, column)
+        except AttributeError:
+            raise KeyError(column) from None
+
+    def __setitem__(self, column: str, value: Any) -> None:
+        try:
+            setattr(self, column, value)
+        except AttributeError:
+            raise KeyError(column) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __eq__(self, other: object) -> bool:
+        return (type(other) is type(self) and
+                self.as_tuple() == other.as_tuple()) # type: ignore
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{c}={getattr(self, c)!r}' for c in self.columns)
+        return f'{type(self).__name__}({values})'
+
+    def get(self, column: str, default: Any = None) -> Any:
+        """Returns the column's value, or default if it is not a column."""
+        return getattr(self, column, default)
+
+    def keys(self) -> Tuple[str, ...]:
+        """Returns the columns of the record."""
+        return self.columns
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Returns the record's values, in the order of its columns."""
+        return tuple(getattr(self, column) for column in self.columns)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the record as a dict of values by column."""
+        return {column: getattr(self, column) for column in self.columns}
+
+    @classmethod
+    def from_mapping(cls: Type[_R], mapping: Mapping[str, Any]) -> _R:
+        """Returns a record with the values of the given mapping's columns
+        (its other keys are ignored).
+        """
+        record = cls()
+        for column in cls.columns:
+            if column in mapping:
+                setattr(record, column, mapping[column])
+        return record
+
+
+class DatasetRecord(_Record):
+    """Record of a dataset's information (see DATASETS_COLS)."""
+
+    __slots__ = tuple(DATASETS_COLS)
+    columns = tuple(DATASETS_COLS)
+
+
+class ResourceRecord(_Record):
+    """Record of a resource's information (see RESOURCES_COLS)."""
+
+    __slots__ = tuple(RESOURCES_COLS)
+    columns = tuple(RESOURCES_COLS)
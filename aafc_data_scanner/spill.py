@@ -0,0 +1,266 @@
+"""Contains SpillFile and ChunkWriter classes, keeping the memory of very
+large inventories bounded: collected rows are spilled to disk in sorted runs,
+merged back in order chunk by chunk, and exported chunk by chunk.
+"""
+
+from dataclasses import dataclass, field
+import heapq
+from importlib.util import find_spec
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .constants import SPILL_BLOCK_ROWS, SPILL_RUN_ROWS
+from .helper_functions import as_dtypes
+
+
+def _sort_key(value: Any) -> Tuple[bool, Any]:
+    """Returns the merge key of a value (missing values last, as when
+    sorting dataframes).
+    """
+    return (True, '') if pd.isna(value) else (False, value)
+
+
+@dataclass
+class SpillFile:
+    """Collects rows in memory until SPILL_RUN_ROWS of them are buffered,
+    then spills them to disk as a run sorted by the key column (written in
+    blocks of SPILL_BLOCK_ROWS rows). Rows of all runs are read back in key
+    order by merging the runs, reading a single block of each run at a time.
+    """
+
+    directory: str
+    """Directory of the runs' files."""
+
+    columns: List[str]
+    """Columns of the rows."""
+
+    dtypes: Dict[str, str]
+    """Dtypes of the columns in the chunks read back."""
+
+    key: str
+    """Column the rows are sorted by."""
+
+    normalize: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+    """Function normalizing the raw rows appended one by one (see append),
+    before their run is spilled.
+    """
+
+    complete: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+    """Function completing the rows of a run (e.g. checking urls), before
+    it is spilled.
+    """
+
+    run_rows: int = SPILL_RUN_ROWS
+    """Number of rows buffered before being spilled."""
+
+    block_rows: int = SPILL_BLOCK_ROWS
+    """Number of rows of the blocks of a run."""
+
+    rows: int = field(default=0, init=False)
+    """Number of rows appended so far."""
+
+    runs: List[str] = field(default_factory=list, init=False)
+    """Paths of the runs spilled so far."""
+
+    _raw: List[Tuple[Any, ...]] = field(default_factory=list, init=False,
+                                        repr=False)
+    """Raw rows waiting to be spilled."""
+
+    _frames: List[pd.DataFrame] = field(default_factory=list, init=False,
+                                        repr=False)
+    """Chunks of rows waiting to be spilled."""
+
+    _buffered: int = field(default=0, init=False, repr=False)
+    """Number of rows waiting to be spilled."""
+
+    def append(self, row: Tuple[Any, ...]) -> None:
+        """Appends a raw row (tuple of column values, normalized with the
+        other raw rows of its run).
+        """
+        self._raw.append(row)
+        self._added(1)
+
+    def append_frame(self, frame: pd.DataFrame) -> None:
+        """Appends a chunk of (already normalized) rows."""
+        if not frame.empty:
+            self._frames.append(frame)
+            self._added(len(frame))
+
+    def _added(self, n: int) -> None:
+        self.rows += n
+        self._buffered += n
+        if self._buffered >= self.run_rows:
+            self.spill()
+
+    def spill(self) -> None:
+        """Spills the buffered rows, if any, to disk as a sorted run."""
+        if not self._buffered:
+            return
+        frames: List[pd.DataFrame] = self._frames
+        if self._raw:
+            raw = pd.DataFrame.from_records(self._raw, columns=self.columns)
+            frames.append(self.normalize(raw) if self.normalize else raw)
+        self._raw, self._frames, self._buffered = [], [], 0
+        # (categories of chunks are merged back after concatenation)
+        run: pd.DataFrame = as_dtypes(pd.concat(frames, ignore_index=True),
+                                      self.dtypes)
+        if self.complete:
+            run = self.complete(run)
+        run = run.sort_values(by=self.key, kind='stable', na_position='last')
+        path: str = os.path.join(self.directory,
+                                 f'{self.key}-run-{len(self.runs):05d}.pkl')
+        with open(path, 'wb') as file:
+            for start in range(0, len(run), self.block_rows):
+                pickle.dump(run.iloc[start:start + self.block_rows], file,
+                            pickle.HIGHEST_PROTOCOL)
+        self.runs.append(path)
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple[Any, ...]]:
+        """Yields the rows of a run, reading one block at a time."""
+        with open(path, 'rb') as file:
+            while True:
+                try:
+                    block: pd.DataFrame = pickle.load(file)
+                except EOFError:
+                    return
+                yield from block.itertuples(index=False, name=None)
+
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Spills the buffered rows and yields all rows in key order (rows
+        with the same key in the order they were appended).
+        """
+        self.spill()
+        i: int = self.columns.index(self.key)
+        return heapq.merge(*(self._read_run(path) for path in self.runs),
+                           key=lambda row: _sort_key(row[i]))
+
+    def iter_chunks(self, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Yields all rows in key order (see iter_rows), as dataframes of up
+        to chunk_rows rows.
+        """
+        chunk: List[Tuple[Any, ...]] = []
+        for row in self.iter_rows():
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield self.to_frame(chunk)
+                chunk = []
+        if chunk:
+            yield self.to_frame(chunk)
+
+    def to_frame(self, rows: List[Tuple[Any, ...]]) -> pd.DataFrame:
+        """Returns the given rows as a dataframe with self dtypes."""
+        return as_dtypes(pd.DataFrame.from_records(rows, columns=self.columns),
+                         self.dtypes)
+
+    def remove(self) -> None:
+        """Removes the runs' files and directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.runs.clear()
+
+    @classmethod
+    def create(cls, parent: str, name: str, *args, **kwargs) -> 'SpillFile':
+        """Returns a SpillFile whose runs are stored in a new temporary
+        directory (named after name) of the parent directory.
+        """
+        os.makedirs(parent, exist_ok=True)
+        directory: str = tempfile.mkdtemp(prefix=f'{name}-', dir=parent)
+        return cls(directory, *args, **kwargs)
+
+
+@dataclass
+class ChunkWriter:
+    """Writes a dataframe chunk by chunk to a csv file, or to a Parquet file
+    if the path ends with '.parquet' (requires pyarrow, see the arrow extra).
+    """
+
+    path: str
+    """Path of the file written."""
+
+    _writer: Any = field(default=None, init=False, repr=False)
+    """pyarrow's ParquetWriter of a Parquet file."""
+
+    _schema: Any = field(default=None, init=False, repr=False)
+    """Arrow schema of a Parquet file (the first chunk's)."""
+
+    chunks: int = field(default=0, init=False)
+    """Number of chunks written so far."""
+
+    def __post_init__(self) -> None:
+        if self.path.endswith('.parquet') and not find_spec('pyarrow'):
+            raise ImportError('Writing Parquet files requires pyarrow: '
+                              'install it with the arrow extra (e.g. poetry '
+                              f'install -E arrow), or export {self.path} '
+                              'to a csv file instead.')
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Appends the chunk to the file (with the header, if first)."""
+        if self.path.endswith('.parquet'):
+            self._write_parquet(chunk)
+        elif self.chunks == 0:
+            chunk.to_csv(self.path, index=False, encoding='utf_8_sig')
+        else:
+            chunk.to_csv(self.path, index=False, header=False, mode='a',
+                         encoding='utf_8')
+        self.chunks += 1
+
+    def _write_parquet(self, chunk: pd.DataFrame) -> None:
+        # (optional dependency, without type stubs)
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa # type: ignore[import-not-found,import-untyped]
+        import pyarrow.parquet as pq # type: ignore[import-not-found,import-untyped]
+
+        # (categories differ between chunks: written as plain strings)
+        chunk = chunk.astype({col: 'string' for col in chunk.columns
+                              if isinstance(chunk[col].dtype,
+                                            pd.CategoricalDtype)})
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema.remove_metadata()
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self) -> None:
+        """Closes the file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> 'ChunkWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def iter_matched_chunks(left: SpillFile, right: SpillFile, chunk_rows: int
+                        ) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Yields the rows of left in key order, as dataframes of up to
+    chunk_rows rows (see SpillFile.iter_chunks), each with a dataframe of the
+    rows of right whose key is up to the chunk's last key (e.g. datasets with
+    their resources, when left is keyed by id and right by dataset_id). Rows
+    of right left over (matching no row of left) come last, with no row of
+    left.
+    """
+    right_rows: Iterator[Tuple[Any, ...]] = right.iter_rows()
+    i: int = right.columns.index(right.key)
+    pending: Optional[Tuple[Any, ...]] = next(right_rows, None)
+    for chunk in left.iter_chunks(chunk_rows):
+        last: Tuple[bool, Any] = _sort_key(chunk[left.key].iloc[-1])
+        matched: List[Tuple[Any, ...]] = []
+        while pending is not None and _sort_key(pending[i]) <= last:
+            matched.append(pending)
+            pending = next(right_rows, None)
+        yield chunk, right.to_frame(matched)
+    left_over: List[Tuple[Any, ...]] = []
+    while pending is not None:
+        left_over.append(pending)
+        pending = next(right_rows, None)
+        if len(left_over) >= chunk_rows or pending is None:
+            yield left.to_frame([]), right.to_frame(left_over)
+            left_over = []
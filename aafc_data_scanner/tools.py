@@ -2,9 +2,12 @@
 datasets information.
 """
 
-from typing import Any, List
+from typing import Any, ClassVar, Dict, List, Optional
 from abc import ABC, abstractmethod
+from collections import Counter, deque
 from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+import datetime as dt
 import json
 import re
 import requests
@@ -13,12 +16,20 @@ import tempfile
 import time
 import sys
 import subprocess
+import threading
+import pandas as pd
+import validators
 from requests.adapters import HTTPAdapter, Retry
 from selenium.webdriver import Edge
 from selenium.webdriver import EdgeOptions
 from selenium.webdriver.edge.service import Service
 from pathlib import Path
 from shutil import which
+from urllib.parse import urlsplit
+
+from .constants import (HEAD_FALLBACK_STATUSES, URL_RULES,
+                        URL_STATUS_CIRCUIT_OPEN, TELEMETRY_LATENCY_SAMPLES,
+                        CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN)
 
 #imports to keep WebDriver up to date
 from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
@@ -161,6 +172,223 @@ def _resolve_edgedriver_path_unchecked() -> str:
     )
 
 
+@dataclass
+class HostTelemetry:
+    """Running totals of the web requests sent to a host, along with the 
+    latencies of the latest ones.
+    """
+
+    requests: int = 0
+    """Number of requests sent."""
+
+    total_s: float = 0
+    """Total time spent by the requests, in seconds."""
+
+    timeouts: int = 0
+    """Number of requests that timed out."""
+
+    errors: Counter = field(default_factory=Counter)
+    """Numbers of requests that failed, by error class."""
+
+    retries: int = 0
+    """Total number of retries."""
+
+    latencies: deque = field(
+        default_factory=lambda: deque(maxlen=TELEMETRY_LATENCY_SAMPLES))
+    """Elapsed seconds of the latest TELEMETRY_LATENCY_SAMPLES requests."""
+
+
+@dataclass
+class RequestTelemetry:
+    """Thread-safe totals of the web requests sent by TenaciousSession(s) 
+    (timing, status, retries and error class of each request), summarized 
+    per host to see which hosts take up the scan's time. Memory is bounded 
+    by the number of hosts, whatever the number of requests.
+    """
+
+    hosts: Dict[str, HostTelemetry] = field(default_factory=dict)
+    """Totals of the requests sent, by host."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    """Mutex on the hosts' totals."""
+
+    def record(self, url: str, method: str, elapsed: float,
+               status: int | None, retries: int | None,
+               error: str | None) -> None:
+        host: str = urlsplit(url).netloc.lower()
+        with self.lock:
+            totals: HostTelemetry = self.hosts.setdefault(host,
+                                                          HostTelemetry())
+            totals.requests += 1
+            totals.total_s += elapsed
+            totals.latencies.append(elapsed)
+            totals.retries += retries or 0
+            if error is not None:
+                totals.errors[error] += 1
+                totals.timeouts += 'Timeout' in error
+
+    def summary(self) -> pd.DataFrame:
+        """Returns one row per host with its number of requests, latency 
+        percentiles (in seconds, of its latest requests), total time spent,
+        number of timeouts, errors (by class) and retries, hosts taking the 
+        most time first.
+        """
+        with self.lock:
+            rows: List[tuple] = [
+                (host, totals.requests,
+                 *pd.Series(totals.latencies, dtype='float64')
+                 .quantile([0.50, 0.95, 0.99]),
+                 totals.total_s, totals.timeouts, totals.errors.total(),
+                 '/'.join(f'{e}:{n}' for e, n
+                          in totals.errors.most_common()),
+                 totals.retries)
+                for host, totals in self.hosts.items()]
+        summary = pd.DataFrame(rows, columns=[
+            'host', 'requests', 'p50_s', 'p95_s', 'p99_s', 'total_s',
+            'timeouts', 'errors', 'error_classes', 'retries'])
+        return (summary.sort_values(by='total_s', ascending=False)
+                .round(3).reset_index(drop=True))
+
+
+@dataclass(frozen=True)
+class UrlRule:
+    """A rule of the url classifier (see constants.URL_RULES)."""
+
+    name: str
+    """Name of the rule, for reference."""
+
+    pattern: Optional[str] = None
+    """Regex searched in the url (case insensitive), if any."""
+
+    host: Optional[str] = None
+    """Host (or parent domain of the host) of the url, if any."""
+
+    scheme: Optional[str] = None
+    """Scheme of the url, if any."""
+
+    status: Optional[int] = None
+    """Fixed status given to the matching urls, without any request."""
+
+    method: Optional[str] = None
+    """Method ('HEAD' or 'GET') used to check the matching urls."""
+
+    timeout: Optional[float] = None
+    """Read timeout (in seconds) used to check the matching urls."""
+
+    found_status: Optional[int] = None
+    """Status given to the matching urls found when checked (any answer but
+    404, e.g. web services whose answers are not files).
+    """
+
+
+@dataclass
+class UrlClassifier:
+    """Classifies urls with a table of rules, precompiled at construct time, 
+    before any web request is sent.
+    """
+
+    rules: List[UrlRule]
+    """Rules of the classifier, evaluated in order (first match wins)."""
+
+    def __post_init__(self) -> None:
+        self._compiled = [
+            (re.compile(rule.pattern, re.IGNORECASE) if rule.pattern else None,
+             rule)
+            for rule in self.rules
+        ]
+
+    @classmethod
+    def from_config(cls, rules: List[Dict[str, Any]]) -> 'UrlClassifier':
+        """Builds a classifier from rules given as dictionaries."""
+        return cls([UrlRule(**rule) for rule in rules])
+
+    def classify(self, url: str) -> Optional[UrlRule]:
+        """Returns the first rule matching the given url, if any."""
+        parts = None
+        for regex, rule in self._compiled:
+            if regex is not None and not regex.search(url):
+                continue
+            if rule.scheme or rule.host:
+                parts = parts or urlsplit(url)
+                if rule.scheme and parts.scheme.lower() != rule.scheme:
+                    continue
+                host: str = (parts.hostname or '').lower()
+                if rule.host and not (host == rule.host or
+                                      host.endswith('.' + rule.host)):
+                    continue
+            return rule
+        return None
+
+
+@dataclass
+class CircuitBreaker:
+    """Per-host circuit breaker: opens for a host after a given number of 
+    consecutive connection failures, so its remaining urls are not requested
+    (and do not wait through connect timeouts and retries). Once the cooldown
+    has passed, a single probe request is let through: the circuit closes 
+    again if it reaches the host, or stays open for another cooldown.
+    """
+
+    threshold: int = CIRCUIT_BREAKER_THRESHOLD
+    """Number of consecutive connection failures opening the circuit."""
+
+    cooldown: float = CIRCUIT_BREAKER_COOLDOWN
+    """Seconds before an open circuit lets a probe request through."""
+
+    failures: Dict[str, int] = field(default_factory=dict)
+    """Number of consecutive connection failures, per host."""
+
+    opened_at: Dict[str, float] = field(default_factory=dict)
+    """Time (time.monotonic()) each open circuit was opened at, per host."""
+
+    probing: set = field(default_factory=set)
+    """Hosts whose probe request is in flight."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    """Mutex on the circuits' states."""
+
+    def allow(self, host: str) -> bool:
+        """Returns whether a request can be sent to the given host."""
+        with self.lock:
+            if host not in self.opened_at:
+                return True
+            if (host not in self.probing and
+                    time.monotonic() - self.opened_at[host] >= self.cooldown):
+                self.probing.add(host)
+                return True
+            return False
+
+    def record_success(self, host: str) -> None:
+        """Closes the host's circuit (the host answered a request)."""
+        with self.lock:
+            self.failures.pop(host, None)
+            self.opened_at.pop(host, None)
+            self.probing.discard(host)
+
+    def record_failure(self, host: str) -> None:
+        """Counts a connection failure to the host, opening its circuit if 
+        needed.
+        """
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if host in self.probing:
+                # failed probe: stays open for another cooldown
+                self.probing.discard(host)
+                self.opened_at[host] = time.monotonic()
+            elif (host not in self.opened_at and
+                    self.failures[host] >= self.threshold):
+                self.opened_at[host] = time.monotonic()
+                print(f'Host {host} seems down: its urls are marked '
+                      f'{URL_STATUS_CIRCUIT_OPEN} without being requested.')
+
+    def release(self, host: str) -> None:
+        """Ends the host's probe, if any, without changing its circuit (the 
+        request failed for a reason unrelated to the host's availability).
+        """
+        with self.lock:
+            self.probing.discard(host)
+
+
 @dataclass
 class TenaciousSession:
     """A requests Session set at construct time to retry any request attempt 
@@ -175,6 +403,27 @@ class TenaciousSession:
     Catalogue)
     """
 
+    pool_maxsize: int = 10
+    """Maximum number of connections kept open per host (to raise along 
+    with the number of threads sharing the session)
+    """
+
+    telemetry: ClassVar[RequestTelemetry] = RequestTelemetry()
+    """Log of all requests sent by sessions, shared by all sessions."""
+
+    circuit_breaker: ClassVar[CircuitBreaker] = CircuitBreaker()
+    """Circuit breaker on hosts failing to connect, shared by all sessions."""
+
+    url_classifier: ClassVar[UrlClassifier] = UrlClassifier.from_config(
+        URL_RULES)
+    """Rules applied to urls before checking them, shared by all sessions."""
+
+    host_methods: ClassVar[Dict[str, str]] = {}
+    """Method ('HEAD' or 'GET') known to give a reliable status for each 
+    host, shared by all sessions (hosts rejecting HEAD are remembered so 
+    their next urls are checked with a ranged GET straight away).
+    """
+
     def __post_init__(self) -> None:
         retries = Retry(
             total=2, connect=2, read=2, status=2,
@@ -183,27 +432,162 @@ class TenaciousSession:
             allowed_methods=frozenset(["HEAD", "GET"]),
             raise_on_status=False
         )
-        self.session.mount('http://', HTTPAdapter(max_retries=retries))
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
+        self.session.mount('http://', HTTPAdapter(
+            max_retries=retries, pool_maxsize=self.pool_maxsize))
+        self.session.mount('https://', HTTPAdapter(
+            max_retries=retries, pool_maxsize=self.pool_maxsize))
         if self.skip_ssl:
             self.session.verify = False
         self.session.headers.update({"User-Agent": "AAFC-Scanner/1.0 (+requests)"})
 
-    def get_and_retry(self, url: str) -> requests.Response:
-        return self.session.get(url, allow_redirects=True, timeout=(5, 10))
-
-    def head_and_retry(self, url: str) -> requests.Response:
-        return self.session.head(url, allow_redirects=True, timeout=(5, 10))
+    def request_and_retry(self, method: str, url: str,
+                          **kwargs: Any) -> requests.Response:
+        """Sends the request and records its timing, status and retries in 
+        the shared telemetry.
+        """
+        kwargs.setdefault('timeout', (5, 10))
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, allow_redirects=True,
+                                            **kwargs)
+        except Exception as e:
+            self.telemetry.record(url, method, time.perf_counter() - start,
+                                  None, None, type(e).__name__)
+            raise
+        retries = getattr(response.raw, 'retries', None)
+        self.telemetry.record(url, method, time.perf_counter() - start,
+                              response.status_code,
+                              len(retries.history) if retries is not None else 0,
+                              None)
+        return response
+
+    def get_and_retry(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request_and_retry('GET', url, **kwargs)
+
+    def head_and_retry(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request_and_retry('HEAD', url, **kwargs)
+
+    def range_get_and_retry(self, url: str,
+                            **kwargs: Any) -> requests.Response:
+        """Sends a streamed GET asking for the first byte only and closes the 
+        connection right after the headers are read, so the body of large 
+        data files is never downloaded.
+        """
+        with self.request_and_retry('GET', url, headers={'Range': 'bytes=0-0'},
+                                    stream=True, **kwargs) as response:
+            return response
 
     def get_status_code(self, url: str) -> int:
+        """Returns the status code of the given url: fixed by the url 
+        classifier if a rule gives one, -1 if not a valid url or if it could 
+        not be reached, -2 if its host is considered down.
+        """
+        return self.get_url_info(url).status
+
+    def get_url_info(self, url: str) -> 'UrlInfo':
+        """Returns the status code of the given url (see get_status_code), 
+        along with the size, content type and last modified date given by 
+        the headers of the response, if any (no extra request is sent).
+        """
+        rule: Optional[UrlRule] = self.url_classifier.classify(url)
+        if rule is not None and rule.status is not None:
+            return UrlInfo(rule.status)
+        if not validators.url(url):
+            return UrlInfo(-1)
+        kwargs: Dict[str, Any] = {}
+        if rule is not None and rule.timeout is not None:
+            kwargs['timeout'] = (5, rule.timeout)
+
+        host: str = urlsplit(url).netloc.lower()
+        if not self.circuit_breaker.allow(host):
+            return UrlInfo(URL_STATUS_CIRCUIT_OPEN)
+        method: str = ((rule.method if rule is not None else None)
+                       or self.host_methods.get(host, 'HEAD'))
         try:
-            status_code: int = self.head_and_retry(url).status_code
+            if method == 'GET':
+                response = self.range_get_and_retry(url, **kwargs)
+            else:
+                response = self.head_and_retry(url, **kwargs)
+                if response.status_code in HEAD_FALLBACK_STATUSES:
+                    # host may reject HEAD only: double checks with a GET
+                    response = self.range_get_and_retry(url, **kwargs)
+                    if response.status_code not in HEAD_FALLBACK_STATUSES:
+                        self.host_methods[host] = 'GET'
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout):
+            self.circuit_breaker.record_failure(host)
+            return UrlInfo(-1)  # fast-fail on network/SSL/connect errors
         except Exception:
-            return -1  # fast-fail on network/SSL/connect errors
+            self.circuit_breaker.release(host)
+            return UrlInfo(-1)
+        self.circuit_breaker.record_success(host)
+        status, headers = response.status_code, response.headers
+        if (rule is not None and rule.found_status is not None
+                and status != 404):
+            status, headers = (rule.found_status,
+                               requests.structures.CaseInsensitiveDict())
+        return UrlInfo.from_headers(status, headers)
+
+
+@dataclass(frozen=True)
+class UrlInfo:
+    """Result of a url check: status code, and resource's size, content type
+    and last modified date as given by the headers of the response.
+    """
+
+    status: int
+    """Status code of the url (see TenaciousSession.get_status_code)."""
+
+    size: Optional[int] = None
+    """Size of the resource in bytes (Content-Length, or total length given
+    by Content-Range in answer to a ranged GET)
+    """
+
+    content_type: Optional[str] = None
+    """Media type of the resource (Content-Type, without parameters)."""
 
-        if status_code != 404 and re.search(r'atlas/rest|atlas/services', url):
-            status_code = 300
-        return status_code
+    last_modified: Optional[str] = None
+    """Last modified date given by the server (Last-Modified), as a naive 
+    UTC datetime in ISO 8601 format
+    """
+
+    @classmethod
+    def from_headers(cls, status: int, headers: Any) -> 'UrlInfo':
+        """Builds the result of a url check from the status code and headers
+        of its response (headers of error responses are ignored).
+        """
+        if status == 206:
+            status = 200   # partial content answers our ranged GET
+        if status >= 400:
+            return cls(status)    # headers describe the error page
+
+        def header(name: str) -> Optional[str]:
+            value = headers.get(name) if headers is not None else None
+            return value.strip() if isinstance(value, str) else None
+
+        size: Optional[int] = None
+        content_range = header('Content-Range')
+        content_length = header('Content-Length')
+        if content_range and re.search(r'/\d+$', content_range):
+            size = int(content_range.rsplit('/', 1)[1])
+        elif content_length and content_length.isdigit():
+            size = int(content_length)
+
+        content_type = header('Content-Type')
+        if content_type:
+            content_type = content_type.split(';')[0].strip().lower() or None
+
+        last_modified = header('Last-Modified')
+        if last_modified:
+            try:
+                date = parsedate_to_datetime(last_modified)
+                if date.tzinfo is not None:
+                    date = date.astimezone(dt.timezone.utc).replace(tzinfo=None)
+                last_modified = date.isoformat()
+            except (TypeError, ValueError):
+                last_modified = None
+
+        return cls(status, size, content_type, last_modified)
 
 
 @dataclass
@@ -261,6 +645,13 @@ class DataCatalogue(ABC):
         url: str = self.base_url + f'resource_show?id={id}'
         return self.request_ckan(url)
 
+    def get_dataset_raw(self, id: str) -> bytes:
+        """Returns the raw JSON response of the CKAN API (package_show) for 
+        the given dataset ID, to be parsed later (e.g. in another process)
+        """
+        return json.dumps({'success': True,
+                           'result': self.get_dataset(id)}).encode()
+
 @dataclass
 class RequestsDataCatalogue(DataCatalogue):
     """Subclass of DataCatalogue using TenaciousSession to make requests to 
@@ -283,6 +674,14 @@ class RequestsDataCatalogue(DataCatalogue):
             'CKAN API Error: request\'s success is False'
         return data['result']
 
+    # overrides DataCatalogue's method (response's content sent as is)
+    def get_dataset_raw(self, id: str) -> bytes:
+        url: str = self.base_url + f'package_show?id={id}'
+        response: requests.models.Response = self.session.get_and_retry(url)
+        assert response.status_code == 200, \
+            f'Request Error:\nUnexpected status code: {response.status_code}'
+        return response.content
+
 
 @dataclass
 class DriverDataCatalogue(DataCatalogue):
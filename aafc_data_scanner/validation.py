@@ -0,0 +1,275 @@
+"""Contains Check and Validator classes, validating inventories against their
+table schemas (see DATASETS_SCHEMA and RESOURCES_SCHEMA) with vectorized
+column checks, once over whole tables.
+"""
+
+from dataclasses import dataclass, field
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .data import DATASETS_SCHEMA, FREQUENCY_SPECIAL_VALUES, RESOURCES_SCHEMA
+
+
+VIOLATIONS_COLS = ['table', 'row', 'id', 'field', 'check', 'value']
+"""Columns of the violations tables."""
+
+_DURATION = re.compile(r'P(?=\d|T\d)(\d+(\.\d+)?Y)?(\d+(\.\d+)?M)?'
+                       r'(\d+(\.\d+)?W)?(\d+(\.\d+)?D)?'
+                       r'(T(?=\d)(\d+(\.\d+)?H)?(\d+(\.\d+)?M)?'
+                       r'(\d+(\.\d+)?S)?)?')
+"""ISO 8601 durations (e.g. P1Y, P6M, P2W, PT1S)."""
+
+_FORMATS: Dict[str, str] = {
+    'email': r'[^@\s]+@[^@\s]+\.[^@\s]+',
+    'uri': r'[A-Za-z][A-Za-z0-9+.\-]*://\S+',
+}
+"""Regexes of the string formats."""
+
+
+def _as_strings(values: pd.Series) -> pd.Series:
+    """Returns the given (non missing) values as strings."""
+    return values.astype(str)
+
+
+def _required_errors(values: pd.Series) -> pd.Series:
+    """Returns the mask of the missing or blank values."""
+    return values.isna() | (_as_strings(values).str.strip() == '')
+
+
+def _integer_errors(values: pd.Series) -> pd.Series:
+    """Returns the mask of the values that are not integers."""
+    numbers = pd.to_numeric(values, errors='coerce')
+    return numbers.isna() | (numbers % 1 != 0)
+
+
+def _number_errors(values: pd.Series) -> pd.Series:
+    """Returns the mask of the values that are not numbers."""
+    return pd.to_numeric(values, errors='coerce').isna()
+
+
+def _boolean_errors(values: pd.Series) -> pd.Series:
+    """Returns the mask of the values that are not booleans."""
+    return ~_as_strings(values).str.lower().isin(['true', 'false'])
+
+
+def _datetime_errors(values: pd.Series) -> pd.Series:
+    """Returns the mask of the values that are not ISO 8601 datetimes."""
+    return pd.to_datetime(_as_strings(values), errors='coerce',
+                          format='ISO8601').isna()
+
+
+def _duration_errors(values: pd.Series) -> pd.Series:
+    """Returns the mask of the values that are neither ISO 8601 durations nor
+    special frequency values.
+    """
+    strings = _as_strings(values)
+    return ~(strings.str.fullmatch(_DURATION)
+             | strings.isin(FREQUENCY_SPECIAL_VALUES))
+
+
+_TYPE_ERRORS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    'integer': _integer_errors,
+    'number': _number_errors,
+    'boolean': _boolean_errors,
+    'datetime': _datetime_errors,
+    'duration': _duration_errors,
+}
+"""Functions returning the mask of the (non missing) values that are not of
+the schema type, by type (none for strings or any other type, whose values
+always are).
+"""
+
+
+def _mismatch_errors(regex: str) -> Callable[[pd.Series], pd.Series]:
+    """Returns the function returning the mask of the values not fully
+    matching the given regex.
+    """
+    def errors(values: pd.Series) -> pd.Series:
+        return ~_as_strings(values).str.fullmatch(regex)
+    return errors
+
+
+def _minimum_errors(minimum: float) -> Callable[[pd.Series], pd.Series]:
+    """Returns the function returning the mask of the values that are not
+    numbers greater than or equal to minimum.
+    """
+    def errors(values: pd.Series) -> pd.Series:
+        return ~(pd.to_numeric(values, errors='coerce') >= minimum)
+    return errors
+
+
+def _maximum_errors(maximum: float) -> Callable[[pd.Series], pd.Series]:
+    """Returns the function returning the mask of the values that are not
+    numbers less than or equal to maximum.
+    """
+    def errors(values: pd.Series) -> pd.Series:
+        return ~(pd.to_numeric(values, errors='coerce') <= maximum)
+    return errors
+
+
+def _enum_errors(enum: List[Any]) -> Callable[[pd.Series], pd.Series]:
+    """Returns the function returning the mask of the values that are not
+    in enum.
+    """
+    allowed: List[str] = [str(e) for e in enum]
+
+    def errors(values: pd.Series) -> pd.Series:
+        return ~_as_strings(values).isin(allowed)
+    return errors
+
+
+@dataclass
+class Check:
+    """Vectorized check of a table's column."""
+
+    field: str
+    """Column checked."""
+
+    name: str
+    """Name of the check (e.g. 'required', 'type: datetime')."""
+
+    errors: Callable[[pd.Series], pd.Series]
+    """Function returning the mask of the values violating the check, given
+    the non missing values of the column (or all of them, if the check is
+    'required').
+    """
+
+
+@dataclass
+class Validator:
+    """Validates a table against its schema (frictionless data table schema:
+    fields' types and formats, their 'required', 'minimum', 'maximum',
+    'pattern' and 'enum' constraints, and the primary key's uniqueness),
+    compiled into a list of vectorized column checks.
+    """
+
+    table: str
+    """Name of the table validated."""
+
+    checks: List[Check] = field(default_factory=list)
+    """Checks of the table's columns."""
+
+    primary_key: Optional[str] = None
+    """Column of the table's unique ids, if any."""
+
+    fields: List[str] = field(default_factory=list)
+    """Columns of the table."""
+
+    @classmethod
+    def compile(cls, table: str, schema: Dict[str, Any]) -> 'Validator':
+        """Returns the validator of the given table's schema."""
+        checks: List[Check] = []
+        for spec in schema['fields']:
+            name: str = spec['name']
+            constraints: Dict[str, Any] = spec.get('constraints', {})
+            if constraints.get('required'):
+                checks.append(Check(name, 'required', _required_errors))
+            type_: str = spec.get('type', 'string')
+            if type_ in _TYPE_ERRORS:
+                checks.append(Check(name, f'type: {type_}',
+                                    _TYPE_ERRORS[type_]))
+            if spec.get('format') in _FORMATS:
+                checks.append(Check(name, f'format: {spec["format"]}',
+                                    _mismatch_errors(_FORMATS[spec['format']])))
+            if 'minimum' in constraints:
+                checks.append(Check(name, f'minimum: {constraints["minimum"]}',
+                                    _minimum_errors(constraints['minimum'])))
+            if 'maximum' in constraints:
+                checks.append(Check(name, f'maximum: {constraints["maximum"]}',
+                                    _maximum_errors(constraints['maximum'])))
+            if 'pattern' in constraints:
+                checks.append(Check(name, f'pattern: {constraints["pattern"]}',
+                                    _mismatch_errors(constraints['pattern'])))
+            if 'enum' in constraints:
+                checks.append(Check(name, 'enum',
+                                    _enum_errors(constraints['enum'])))
+        return cls(table, checks, schema.get('primaryKey'),
+                   [spec['name'] for spec in schema['fields']])
+
+    def validate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Returns the table of df's violations of the schema: table, row
+        (index in df), id, field, check and value (one row per value
+        violating a check; a single one, without row, for a missing column).
+        """
+        ids: pd.Series = (df[self.primary_key] if self.primary_key in df
+                          else pd.Series(None, index=df.index, dtype=object))
+        missing: List[str] = [name for name in self.fields
+                              if name not in df.columns]
+        violations: List[pd.DataFrame] = [pd.DataFrame(
+            [[self.table, None, None, name, 'missing column', None]
+             for name in missing], columns=VIOLATIONS_COLS)]
+        for check in self.checks:
+            if check.field in missing:
+                continue
+            values: pd.Series = df[check.field]
+            if check.name != 'required':
+                values = values[values.notna()]
+            errors: pd.Series = check.errors(values).fillna(True).astype(bool)
+            violations.append(self._violations(check.field, check.name,
+                                               values[errors], ids))
+        if self.primary_key is not None and self.primary_key in df.columns:
+            duplicated: pd.Series = (ids.duplicated(keep=False)
+                                     & ids.notna())
+            violations.append(self._violations(self.primary_key, 'unique',
+                                               ids[duplicated], ids))
+        return self._concat(violations)
+
+    def validate_foreign_key(self, df: pd.DataFrame, column: str,
+                             reference: pd.Series) -> pd.DataFrame:
+        """Returns the table of df's violations of a foreign key: values of
+        its column (if not missing) that are not in the reference column.
+        """
+        values: pd.Series = df[column][df[column].notna()]
+        ids: pd.Series = (df[self.primary_key] if self.primary_key in df
+                          else pd.Series(None, index=df.index, dtype=object))
+        errors: pd.Series = ~values.isin(reference)
+        return self._violations(column, 'foreign key', values[errors], ids)
+
+    def _violations(self, column: str, check: str, values: pd.Series,
+                    ids: pd.Series) -> pd.DataFrame:
+        """Returns the violations of the given check by the given values."""
+        return pd.DataFrame({
+            'table': self.table,
+            'row': values.index,
+            'id': ids.loc[values.index].astype(object).to_numpy(),
+            'field': column,
+            'check': check,
+            'value': values.astype(object).to_numpy(),
+        }, columns=VIOLATIONS_COLS)
+
+    @staticmethod
+    def _concat(violations: List[pd.DataFrame]) -> pd.DataFrame:
+        """Returns the given violations tables as a single one."""
+        violations = [v for v in violations if not v.empty]
+        if not violations:
+            return pd.DataFrame(columns=VIOLATIONS_COLS)
+        return pd.concat(violations, ignore_index=True)
+
+
+DATASETS_VALIDATOR = Validator.compile('datasets', DATASETS_SCHEMA)
+"""Validator of datasets inventories."""
+
+RESOURCES_VALIDATOR = Validator.compile('resources', RESOURCES_SCHEMA)
+"""Validator of resources inventories."""
+
+
+def validate_inventory(datasets: pd.DataFrame,
+                       resources: pd.DataFrame) -> pd.DataFrame:
+    """Returns the table of the violations of the given datasets and
+    resources inventories (see Validator.validate), along with the resources'
+    foreign keys to the datasets (as in RESOURCES_SCHEMA).
+    """
+    violations: List[pd.DataFrame] = [DATASETS_VALIDATOR.validate(datasets),
+                                      RESOURCES_VALIDATOR.validate(resources)]
+    foreign_keys: List[Dict[str, Any]] = RESOURCES_SCHEMA.get('foreignKeys', [])
+    for key in foreign_keys:
+        reference: str = key['reference']['fields']
+        if key['fields'] in resources.columns and reference in datasets.columns:
+            violations.append(RESOURCES_VALIDATOR.validate_foreign_key(
+                resources, key['fields'], datasets[reference]))
+    violations = [v for v in violations if not v.empty]
+    if not violations:
+        return pd.DataFrame(columns=VIOLATIONS_COLS)
+    return pd.concat(violations, ignore_index=True)
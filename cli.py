@@ -1,4 +1,7 @@
+import multiprocessing
+
 from aafc_data_scanner.__main__ import main
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # for parsing processes, once frozen
     main()
\ No newline at end of file
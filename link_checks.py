@@ -7,7 +7,7 @@ filter rows whose 'url_status' indicates a broken link, and write
 
 Broken criteria (minimal, adjustable):
   - url_status is NaN / empty
-  - url_status == -1 (scanner error)
+  - url_status < 0 (scanner error: -1 unreachable, -2 host down)
   - url_status >= 400 (HTTP client/server error)
 Redirects (301/302/307/308) are NOT treated as broken.
 
@@ -57,8 +57,8 @@ def main() -> int:
     # Make a numeric view of status for filtering
     status_num = pd.to_numeric(df["url_status"], errors="coerce")
 
-    # Broken when: NaN OR -1 OR >= 400
-    broken_mask = status_num.isna() | (status_num == -1) | (status_num >= 400)
+    # Broken when: NaN OR negative OR >= 400
+    broken_mask = status_num.isna() | (status_num < 0) | (status_num >= 400)
     broken_df = df[broken_mask].copy()
 
     # Write all original columns/rows out
@@ -0,0 +1,108 @@
+"""This code tests the ResourceGroups and Compliance classes implemented in
+compliance.py and is intended to be run from project's top folder using:
+  py -m unittest tests.test_compliance
+Use -v for more verbose.
+"""
+
+from aafc_data_scanner.compliance import *
+from aafc_data_scanner.constants import *
+
+import unittest
+
+
+class TestCompliance(unittest.TestCase):
+
+    def setUp(self):
+        self.datasets = pd.DataFrame({
+            'id': ['a', 'b', 'c'],
+            'frequency': ['P1Y', 'P1M', None],
+            'harvested': [None, True, None],
+        }, columns=DATASETS_COLS)
+        self.resources = pd.DataFrame({
+            'dataset_id': ['a', 'b', 'a', None, 'b'],
+            'created': ['2023-01-01T00:00:00', '2020-05-01T00:00:00',
+                        '2023-02-01T00:00:00', '2024-01-01T00:00:00', None],
+            'lang': ['eng', 'fra', 'fra', 'eng', 'fra'],
+            'format': ['CSV', 'xls', 'PDF', 'CSV', 'Odd'],
+            'resource_type': ['dataset', 'dataset', 'guide', 'dataset',
+                              'guide'],
+            'title_en': ['Data', 'Data', 'Data dictionary', 'Data', 'Data'],
+        }, columns=RESOURCES_COLS)
+
+    def test_resource_groups(self):
+
+        groups = ResourceGroups.group(self.datasets, self.resources)
+        self.assertEqual(list(groups.ids), ['a', 'b'])
+        self.assertEqual(list(groups.dataset_groups), [0, 1, -1])
+        is_eng = self.resources['lang'] == 'eng'
+        self.assertEqual(list(groups.count(is_eng)), [1, 0])
+        # (b has no guide created)
+        self.assertEqual(
+            list(groups.all_by(self.resources['created'].notna(),
+                               self.resources['resource_type'])),
+            [True, False])
+        self.assertEqual(list(groups.for_datasets([5, 7], 0)), [5, 7, 0])
+
+    def test_evaluate(self):
+
+        compliance = Compliance()
+        compliance.register(Rule(
+            'num_resources', 'Counting resources.',
+            lambda groups, now: groups.for_datasets(
+                groups.count(groups.column('dataset_id').notna()), 0)))
+        reports = compliance.evaluate(self.datasets, self.resources,
+                                      dt.datetime(2023, 6, 1))
+        self.assertEqual(list(self.datasets.modified),
+                         ['2023-02-01T00:00:00', '2020-05-01T00:00:00', None])
+        self.assertEqual(list(self.datasets.up_to_date), [True, True, True])
+        self.assertEqual(list(self.datasets.official_lang),
+                         [True, False, True])
+        self.assertEqual(list(self.datasets.open_formats),
+                         [True, False, True])
+        self.assertEqual(list(self.datasets.spec), [True, False, True])
+        self.assertEqual(list(self.datasets.num_resources), [2, 2, 0])
+        self.assertEqual(reports['unknown_formats'].to_dict(), {'Odd': 1})
+        self.assertEqual(list(compliance.stats['rule']),
+                         ['grouping', 'modified', 'up_to_date',
+                          'official_lang', 'open_formats', 'spec',
+                          'num_resources'])
+
+        # a rule registered for an existing column replaces its rule
+        compliance.register(Rule('spec', 'No spec.', lambda groups, now:
+                                 groups.for_datasets([False, False], False)))
+        compliance.evaluate(self.datasets, self.resources,
+                            columns=['spec'])
+        self.assertEqual(list(self.datasets.spec), [False, False, False])
+        self.assertEqual(list(compliance.stats['rule']), ['grouping', 'spec'])
+
+
+    def test_evaluate_incremental(self):
+
+        compliance = Compliance()
+        compliance.evaluate(self.datasets, self.resources,
+                            dt.datetime(2023, 6, 1))
+        # values carried over from a previous inventory
+        self.datasets['official_lang'] = [False, True, False]
+        self.datasets['up_to_date'] = False
+        changed = pd.Series([False, True, False])
+        reports = compliance.evaluate(self.datasets, self.resources,
+                                      dt.datetime(2023, 6, 1),
+                                      changed=changed)
+        self.assertEqual(list(self.datasets.official_lang),
+                         [False, False, False])
+        # up to date depends on the current time so is always evaluated
+        self.assertEqual(list(self.datasets.up_to_date), [True, True, True])
+        self.assertEqual(reports['unknown_formats'].to_dict(), {'Odd': 1})
+
+        # rules of new columns are evaluated for all datasets
+        compliance.register(Rule(
+            'num_eng', 'Counting English resources.',
+            lambda groups, now: groups.for_datasets(
+                groups.count(groups.column('lang') == 'eng'), 0)))
+        compliance.evaluate(self.datasets, self.resources,
+                            changed=pd.Series([False, False, False]))
+        self.assertEqual(list(self.datasets.num_eng), [1, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
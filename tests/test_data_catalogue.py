@@ -8,6 +8,7 @@ from aafc_data_scanner.constants import *
 from aafc_data_scanner.tools import *
 
 import unittest
+from unittest import mock
 
 
 class TestDataCatalogue(unittest.TestCase):
@@ -102,6 +103,141 @@ class TestDataCatalogue(unittest.TestCase):
         result2 = registry.get_resource(id2)
         self.assertEqual(result2['id'], id2)
         self.assertEqual(result2['name'], name2)
-            
+
+    def test_get_status_code_get_fallback(self):
+
+        def response(status_code):
+            return mock.Mock(status_code=status_code)
+
+        session = TenaciousSession()
+        TenaciousSession.host_methods.pop('example.com', None)
+        url = 'https://example.com/data/file.csv'
+
+        # HEAD rejected: ranged GET gives the actual status
+        with mock.patch.object(session, 'head_and_retry',
+                               return_value=response(405)) as head, \
+             mock.patch.object(session, 'range_get_and_retry',
+                               return_value=response(206)) as get:
+            self.assertEqual(session.get_status_code(url), 200)
+            self.assertEqual(head.call_count, 1)
+            self.assertEqual(get.call_count, 1)
+            # host is remembered: no HEAD anymore
+            self.assertEqual(session.get_status_code(url), 200)
+            self.assertEqual(head.call_count, 1)
+            self.assertEqual(get.call_count, 2)
+        self.assertEqual(TenaciousSession.host_methods['example.com'], 'GET')
+
+        # truly forbidden url: GET confirms and host keeps using HEAD
+        TenaciousSession.host_methods.pop('example.com')
+        with mock.patch.object(session, 'head_and_retry',
+                               return_value=response(403)), \
+             mock.patch.object(session, 'range_get_and_retry',
+                               return_value=response(403)):
+            self.assertEqual(session.get_status_code(url), 403)
+        self.assertNotIn('example.com', TenaciousSession.host_methods)
+
+    def test_telemetry_summary(self):
+
+        telemetry = RequestTelemetry()
+        telemetry.record('https://slow.ca/a', 'HEAD', 4.0, None, None,
+                         'ConnectTimeout')
+        telemetry.record('https://slow.ca/b', 'HEAD', 2.0, 200, 1, None)
+        telemetry.record('https://FAST.ca/a', 'GET', 0.5, 404, 0, None)
+
+        summary = telemetry.summary()
+        self.assertEqual(list(summary.host), ['slow.ca', 'fast.ca'])
+        slow = summary.iloc[0]
+        self.assertEqual(slow.requests, 2)
+        self.assertEqual(slow.total_s, 6.0)
+        self.assertEqual(slow.p50_s, 3.0)
+        self.assertEqual(slow.timeouts, 1)
+        self.assertEqual(slow.errors, 1)
+        self.assertEqual(slow.error_classes, 'ConnectTimeout:1')
+        self.assertEqual(slow.retries, 1)
+
+        # latencies kept are bounded, totals are not
+        for _ in range(TELEMETRY_LATENCY_SAMPLES):
+            telemetry.record('https://fast.ca/b', 'GET', 0.1, 200, 0, None)
+        self.assertEqual(len(telemetry.hosts['fast.ca'].latencies),
+                         TELEMETRY_LATENCY_SAMPLES)
+        summary = telemetry.summary().set_index('host')
+        fast = summary.loc['fast.ca']
+        self.assertEqual(fast.requests, TELEMETRY_LATENCY_SAMPLES + 1)
+        self.assertEqual(fast.p99_s, 0.1)
+
+    def test_circuit_breaker(self):
+
+        session = TenaciousSession()
+        url = 'https://down.example.com/service'
+        breaker = CircuitBreaker(threshold=2, cooldown=3600)
+        with mock.patch.object(TenaciousSession, 'circuit_breaker', breaker), \
+             mock.patch.object(session, 'head_and_retry', side_effect=
+                               requests.exceptions.ConnectTimeout) as head:
+            self.assertEqual(session.get_status_code(url), -1)
+            self.assertEqual(session.get_status_code(url), -1)
+            # circuit open: no more requests to the host
+            self.assertEqual(session.get_status_code(url),
+                             URL_STATUS_CIRCUIT_OPEN)
+            self.assertEqual(head.call_count, 2)
+
+            # after cooldown, a single probe closes the circuit if it succeeds
+            breaker.cooldown = 0
+            head.side_effect = None
+            head.return_value = mock.Mock(status_code=200)
+            self.assertEqual(session.get_status_code(url), 200)
+            self.assertTrue(breaker.allow('down.example.com'))
+
+    def test_url_classifier(self):
+
+        classifier = UrlClassifier.from_config(URL_RULES + [
+            {'name': 'slow host', 'host': 'slow.example.ca', 'method': 'GET',
+             'timeout': 60},
+        ])
+        cases = {
+            'file://intranet/share/data.csv': -1,
+            '\\\\server\\share\\data.csv': -1,
+            'ftp://ftp.example.ca/data.zip': -1,
+            '': -1,
+        }
+        for url, status in cases.items():
+            self.assertEqual(classifier.classify(url).status, status)
+        self.assertIsNone(classifier.classify('https://example.ca/data.csv'))
+        rule = classifier.classify('https://maps.slow.example.ca/data.csv')
+        self.assertEqual((rule.method, rule.timeout), ('GET', 60))
+        self.assertIsNone(classifier.classify('https://notslow.example.ca/'))
+
+        # fixed statuses are given without any request
+        session = TenaciousSession()
+        with mock.patch.object(session, 'head_and_retry') as head:
+            self.assertEqual(session.get_status_code(
+                'file://intranet/share/data.csv'), -1)
+            head.assert_not_called()
+
+        # atlas services are checked: 300 if found, 404 if missing
+        url = 'https://agriculture.canada.ca/atlas/services/x'
+        self.assertEqual(classifier.classify(url).found_status, 300)
+        with mock.patch.object(TenaciousSession, 'circuit_breaker',
+                               CircuitBreaker()), \
+             mock.patch.object(session, 'head_and_retry') as head:
+            head.return_value = mock.Mock(status_code=200, headers={})
+            self.assertEqual(session.get_status_code(url), 300)
+            head.return_value = mock.Mock(status_code=404, headers={})
+            self.assertEqual(session.get_status_code(url), 404)
+
+    def test_url_info_from_headers(self):
+
+        info = UrlInfo.from_headers(206, {
+            'Content-Range': 'bytes 0-0/123456',
+            'Content-Length': '1',
+            'Content-Type': 'text/csv; charset=utf-8',
+            'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        })
+        self.assertEqual(info, UrlInfo(200, 123456, 'text/csv',
+                                       '2015-10-21T07:28:00'))
+
+        info = UrlInfo.from_headers(200, {'Content-Length': '42',
+                                          'Last-Modified': 'not a date'})
+        self.assertEqual(info, UrlInfo(200, 42, None, None))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
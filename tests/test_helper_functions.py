@@ -58,7 +58,19 @@ class TestDataCatalogue(unittest.TestCase):
             result = infer_name_from_email(row['email'])
             expected = row['name']
             self.assertEqual(result, expected)
-    
+
+    def test_parse_dates(self):
+        dates = pd.Series(['2022-06-27T23:52:50-05:00', '2022-06-27T23:52:50',
+                           '2024-06-17T19:41:24.045690', ' 2018-12-04 ',
+                           'Wed, 21 Oct 2015 07:28:00 GMT', 'garbage', '',
+                           None], dtype='category')
+        result = parse_dates(dates)
+        self.assertEqual(
+            [None if pd.isna(d) else d.isoformat() for d in result],
+            ['2022-06-28T04:52:50', '2022-06-27T23:52:50',
+             '2024-06-17T19:41:24.045690', '2018-12-04T00:00:00',
+             '2015-10-21T07:28:00', None, None, None])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
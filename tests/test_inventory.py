@@ -7,9 +7,46 @@ Use -v for more verbose.
 from aafc_data_scanner.constants import *
 from aafc_data_scanner.tools import *
 from aafc_data_scanner.inventories import *
+from aafc_data_scanner.records import *
 
+import contextlib
+from dataclasses import dataclass
+import io
+import json
 import numpy as np
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+
+def read_fixture(filename: str) -> pd.DataFrame:
+    """Returns the given test file of tests/io, along with the inventory 
+    columns added since it was written (empty).
+    """
+    df = pd.read_csv(f'tests/io/{filename}', encoding='utf-8-sig')
+    columns = (DATASETS_COLS if filename.startswith('datasets')
+               else RESOURCES_COLS)
+    return df.reindex(columns=list(df.columns)
+                      + [col for col in columns if col not in df.columns])
+
+
+@dataclass
+class Catalogue(DataCatalogue):
+    """Catalogue whose datasets all have a single resource (id'd after the
+    dataset), except for the missing one.
+    """
+    base_url: str = CATALOGUE_BASE_URL
+
+    def request_ckan(self, url):
+        raise ValueError(url)
+
+    def get_dataset(self, id):
+        if id == 'missing':
+            raise ValueError(id)
+        return {'organization': {'name': f'org-{id}',
+                                 'title': 'Title | Titre'},
+                'resources': [{'id': f'{id}-res'}]}
 
 
 class TestDataCatalogue(unittest.TestCase):
@@ -38,53 +75,53 @@ class TestDataCatalogue(unittest.TestCase):
         self.assertTrue(validated)
         
 
-    def test_add_dataset(self):
+    def test_datasets_frame(self):
 
         # datasets fetched for testing are noted as: frequency:"not planned"
         # hence they should not change with time and tests should keep working
-        inventory = Inventory()
         registry = RequestsDataCatalogue(REGISTRY_BASE_URL)
-        lock = threading.Lock()
         test_datasets = pd.read_csv('tests/io/datasets.csv', 
                                     encoding='utf-8-sig')
         
         for i in range(len(test_datasets)):
             id = test_datasets.loc[i, 'id']
             dataset = registry.get_dataset(id)
-            expected = test_datasets.loc[[i]].copy().reset_index(drop=True)
-            actual = pd.DataFrame(columns=DATASETS_COLS)
-            inventory.add_dataset(dataset, actual, lock)
+            expected = as_dtypes(test_datasets.loc[[i]].reset_index(drop=True),
+                                 DATASETS_DTYPES)
+            actual = Inventory.datasets_frame(
+                [Inventory.parse_dataset(dataset).as_tuple()])
             self.assert_and_see_differences(actual, expected)
         
-    def test_add_resource(self):
+    def test_resources_frame(self):
 
         session = TenaciousSession()
         registry = RequestsDataCatalogue(REGISTRY_BASE_URL, session)
-        lock = threading.Lock()
         test_resources = pd.read_csv('tests/io/resources.csv', 
                                      encoding='utf-8-sig')
 
         for i in range(len(test_resources)):
             id = test_resources.loc[i, 'id']
             resource = registry.get_resource(id)
-            expected = test_resources.loc[[i]].copy()
-            expected.reset_index(drop=True, inplace=True)
-            actual = pd.DataFrame(columns=RESOURCES_COLS)
-            Inventory.add_resource(resource, actual, lock)
+            expected = as_dtypes(
+                test_resources.loc[[i]].reset_index(drop=True),
+                RESOURCES_DTYPES)
+            record = Inventory.parse_resource(resource)
+            Inventory.check_resource_url(record)
+            actual = Inventory.resources_frame([record.as_tuple()])
             # to avoid issues with 200/302 when testing
             # result['url'] = None 
             self.assert_and_see_differences(actual, expected)
 
     def test_get_modified(self):
 
-        datasets = pd.read_csv('tests/io/datasets_modified.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_modified.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_modified.csv')
+        resources = read_fixture('resources_modified.csv')
 
         for _, dataset in datasets.iterrows():
             ds = dataset[DATASETS_COLS]
-            expected = dataset['expected_modified']
+            # (no date found: empty in the csv file)
+            expected = (None if pd.isna(dataset['expected_modified'])
+                        else dataset['expected_modified'])
             actual = Inventory.infer_modified(ds, resources)
             if actual != expected:
                 print(f'\n\nDifference for id #{ds['id']}:')
@@ -94,8 +131,7 @@ class TestDataCatalogue(unittest.TestCase):
 
     def test_get_up_to_date(self):
 
-        datasets = pd.read_csv('tests/io/datasets_up_to_date.csv', 
-                               encoding='utf-8-sig')
+        datasets = read_fixture('datasets_up_to_date.csv')
 
         for _, dataset in datasets.iterrows():
             ds = dataset[DATASETS_COLS]
@@ -114,10 +150,8 @@ class TestDataCatalogue(unittest.TestCase):
     
     def test_get_official_lang(self):
 
-        datasets = pd.read_csv('tests/io/datasets_official_lang.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_official_lang.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_official_lang.csv')
+        resources = read_fixture('resources_official_lang.csv')
         
         for _, dataset in datasets.iterrows():
             ds = dataset[DATASETS_COLS]
@@ -131,10 +165,8 @@ class TestDataCatalogue(unittest.TestCase):
     
     def test_get_open_formats(self):
 
-        datasets = pd.read_csv('tests/io/datasets_open_formats.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_open_formats.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_open_formats.csv')
+        resources = read_fixture('resources_open_formats.csv')
         
         for _, dataset in datasets.iterrows():
             ds = dataset[DATASETS_COLS]
@@ -148,10 +180,8 @@ class TestDataCatalogue(unittest.TestCase):
 
     def test_get_spec(self):
 
-        datasets = pd.read_csv('tests/io/datasets_spec.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_spec.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_spec.csv')
+        resources = read_fixture('resources_spec.csv')
         
         for _, dataset in datasets.iterrows():
             ds = dataset[DATASETS_COLS]
@@ -165,10 +195,8 @@ class TestDataCatalogue(unittest.TestCase):
 
     def test_complete_modified(self):
         
-        datasets = pd.read_csv('tests/io/datasets_modified.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_modified.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_modified.csv')
+        resources = read_fixture('resources_modified.csv')
 
         pd.options.mode.chained_assignment = None 
         # to avoid SettingWithCopyWarning
@@ -185,8 +213,7 @@ class TestDataCatalogue(unittest.TestCase):
 
     def test_complete_up_to_date(self):
         
-        datasets = pd.read_csv('tests/io/datasets_up_to_date.csv', 
-                               encoding='utf-8-sig')
+        datasets = read_fixture('datasets_up_to_date.csv')
 
         pd.options.mode.chained_assignment = None 
         # to avoid SettingWithCopyWarning
@@ -205,10 +232,8 @@ class TestDataCatalogue(unittest.TestCase):
 
     def test_complete_official_lang(self):
 
-        datasets = pd.read_csv('tests/io/datasets_official_lang.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_official_lang.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_official_lang.csv')
+        resources = read_fixture('resources_official_lang.csv')
 
         pd.options.mode.chained_assignment = None 
         # to avoid SettingWithCopyWarning
@@ -225,10 +250,8 @@ class TestDataCatalogue(unittest.TestCase):
     
     def test_complete_open_formats(self):
         
-        datasets = pd.read_csv('tests/io/datasets_open_formats.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_open_formats.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_open_formats.csv')
+        resources = read_fixture('resources_open_formats.csv')
 
         pd.options.mode.chained_assignment = None 
         # to avoid SettingWithCopyWarning
@@ -242,13 +265,28 @@ class TestDataCatalogue(unittest.TestCase):
 
         self.assert_and_see_differences(actual.datasets,
                                         expected)
-    
+
+    def test_complete_open_formats_normalized(self):
+
+        inventory = Inventory()
+        inventory.datasets = pd.DataFrame({'id': ['a', 'b', 'c', 'd']},
+                                          columns=DATASETS_COLS)
+        # formats named in any case or by alias are known formats; unknown
+        # ones are ignored, and reported
+        inventory.resources = pd.DataFrame({
+            'dataset_id': ['a', 'a', 'b', 'b', 'c', 'c', 'd'],
+            'format': ['.csv', 'xls', 'Xls', 'ESRI shapefile', 'DOCX', 'foo',
+                       None],
+        })
+        inventory.complete_open_formats()
+        self.assertEqual(list(inventory.datasets.open_formats),
+                         [True, False, False, True])
+        self.assertEqual(inventory.unknown_formats.to_dict(), {'foo': 1})
+
     def test_complete_spec(self):
         
-        datasets = pd.read_csv('tests/io/datasets_spec.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources_spec.csv', 
-                                encoding='utf-8-sig')
+        datasets = read_fixture('datasets_spec.csv')
+        resources = read_fixture('resources_spec.csv')
 
         pd.options.mode.chained_assignment = None 
         # to avoid SettingWithCopyWarning
@@ -263,29 +301,290 @@ class TestDataCatalogue(unittest.TestCase):
         self.assert_and_see_differences(actual.datasets,
                                         expected)
 
-    # UPDATE THIS ONE TO REFLECT _collect_dataset_with_resources
-    def test_collect_dataset_with_resources(self):
-
+    # helper function
+    def edge_cases_inventory(self) -> Inventory:
+        """Returns an inventory of datasets whose compliance columns are 
+        edge cases (c has no resources, a resource of d has no language, 
+        dates have offsets, are unreadable or come from html pages, etc.).
+        """
         inventory = Inventory()
-        dc = RequestsDataCatalogue(REGISTRY_BASE_URL)
-        datasets_lock = threading.Lock()
-        resources_IDs_lock = threading.Lock()
-        datasets = pd.read_csv('tests/io/datasets.csv', 
-                               encoding='utf-8-sig')
-        resources = pd.read_csv('tests/io/resources.csv',
-                                encoding='utf-8-sig')
-
-        for i in range(len(datasets)):
-            id = datasets.loc[i, 'id']
-            inventory._collect_dataset_with_resources(
-                dc, id, datasets_lock, resources_IDs_lock)
-        self.assert_and_see_differences(inventory.datasets, 
-                                        datasets)
-        self.assert_and_see_differences(inventory.resources, 
-                                        resources)
-        
+        inventory.datasets = pd.DataFrame({
+            'id': ['a', 'b', 'c', 'd', 'e', 'f'],
+            'frequency': ['P1Y', 'P1M', 'P1W', None, 'not_planned', 'P1D'],
+            'harvested': [False, False, False, False, False, True],
+        }, columns=DATASETS_COLS)
+        inventory.resources = pd.DataFrame({
+            'dataset_id': ['a', 'a', 'b', 'd', 'd', 'e', 'e', 'f'],
+            'created': ['2022-06-27T23:52:50-05:00', '2022-01-01T00:00:00',
+                        '2014-01-01T00:00:00', '2023-05-30', None,
+                        '2020-01-01T00:00:00', '2020-01-01T00:00:00',
+                        '2023-01-01T00:00:00'],
+            'metadata_modified': ['2022-06-28T01:00:00', None, None, None,
+                                  None, '2021-01-01T00:00:00', None, None],
+            'server_modified': ['Thu, 01 Jun 2023 00:00:00 GMT', None,
+                                'Wed, 21 Oct 2015 07:28:00 GMT', None, None,
+                                None, None, 'garbage'],
+            'content_type': ['text/html; charset=utf-8', None, 'text/csv',
+                             None, None, None, None, 'text/csv'],
+            'lang': ['eng', 'fra', 'eng/fra', 'eng', None, 'eng', 'fra',
+                     'fra'],
+            'format': ['CSV', 'PDF', 'xls', 'CSV', None, 'CSV', 'CSV',
+                       'docx'],
+            'resource_type': ['dataset', 'dataset', 'dataset', 'dataset',
+                              'dataset', 'dataset', 'guide', 'guide'],
+            'title_en': ['Data', 'Data', 'Data', 'Data', 'Data', 'Data',
+                         'Data dictionary', 'Guide'],
+        }, columns=RESOURCES_COLS)
+        return inventory
+
+    def test_complete_modified_edge_cases(self):
+
+        inventory = self.edge_cases_inventory()
+        inventory.complete_modified()
+        # dates of html pages are ignored, offsets are converted to UTC
+        self.assertEqual(list(inventory.datasets.modified),
+                         ['2022-06-28T04:52:50', '2015-10-21T07:28:00', None,
+                          '2023-05-30T00:00:00', '2021-01-01T00:00:00',
+                          '2023-01-01T00:00:00'])
+        self.assertEqual(list(inventory.datasets.modified),
+                         [Inventory.infer_modified(ds, inventory.resources)
+                          for _, ds in inventory.datasets.iterrows()])
+
+    def test_complete_official_lang_edge_cases(self):
+
+        inventory = self.edge_cases_inventory()
+        inventory.complete_official_lang()
+        # (a missing language counts as neither)
+        self.assertEqual(list(inventory.datasets.official_lang),
+                         [True, True, True, False, True, False])
+        resources = inventory.resources.fillna({'lang': ''})
+        self.assertEqual(list(inventory.datasets.official_lang),
+                         [Inventory.get_official_lang(ds, resources)
+                          for _, ds in inventory.datasets.iterrows()])
+
+    def test_complete_spec_edge_cases(self):
+
+        inventory = self.edge_cases_inventory()
+        inventory.complete_spec()
+        # (datasets without 'dataset' resources need no specification)
+        self.assertEqual(list(inventory.datasets.spec),
+                         [False, False, True, False, True, True])
+        self.assertEqual(list(inventory.datasets.spec),
+                         [Inventory.get_spec(ds, inventory.resources)
+                          for _, ds in inventory.datasets.iterrows()])
+
+    def test_complete_up_to_date_edge_cases(self):
+
+        inventory = self.edge_cases_inventory()
+        inventory.complete_modified()
+        now = dt.datetime(2023, 6, 1)
+        inventory.complete_up_to_date(now)
+        # (c has no modified date, f is harvested)
+        self.assertEqual(list(inventory.datasets.up_to_date),
+                         [True, False, False, True, True, True])
+        self.assertEqual(list(inventory.datasets.up_to_date),
+                         [Inventory.get_up_to_date(ds, now)
+                          for _, ds in inventory.datasets.iterrows()])
+
     def test_update_platform_info(self):
-        pass            # TODO
+
+        datasets = pd.DataFrame(columns=DATASETS_COLS)
+        datasets['id'] = ['a', 'b', 'c']
+        datasets['registry_link'] = ['reg-a', 'reg-b', 'reg-c']
+        resources = pd.DataFrame(columns=RESOURCES_COLS)
+        resources['id'] = ['a-res', 'c-res', 'other']
+        resources['dataset_id'] = ['a', 'c', 'c']
+        resources['registry_link'] = ['reg-1', 'reg-2', 'reg-3']
+        resources['catalogue_link'] = [None, 'cat-2', 'cat-3']
+        inventory = Inventory(as_dtypes(datasets, DATASETS_DTYPES),
+                              as_dtypes(resources, RESOURCES_DTYPES))
+
+        inventory.update_platform_info('catalogue', Catalogue(),
+                                       ['c', 'missing', 'a'])
+        self.assertEqual(list(inventory.datasets.on_catalogue),
+                         [True, pd.NA, True])
+        self.assertEqual(list(inventory.datasets.aafc_org),
+                         ['org-a', np.nan, 'org-c'])
+        self.assertEqual(list(inventory.datasets.aafc_org_title.unique()
+                              .dropna()), ['Title'])
+        self.assertEqual(inventory.datasets.catalogue_link[2],
+                         CATALOGUE_DATASETS_BASE_URL.format('c'))
+        self.assertEqual(list(inventory.resources.catalogue_link),
+                         [CATALOGUE_RESOURCES_BASE_URL.format('a', 'a-res'),
+                          CATALOGUE_RESOURCES_BASE_URL.format('c', 'c-res'),
+                          'cat-3'])
+
+        # other platform's links are left as they are
+        inventory.update_platform_info('registry', Catalogue(), ['a'])
+        self.assertEqual(list(inventory.resources.registry_link),
+                         [REGISTRY_RESOURCES_BASE_URL.format('a', 'a-res'),
+                          'reg-2', 'reg-3'])
+        self.assertEqual(str(inventory.datasets.org.dtype), 'category')
+
+    def test_collect_records(self):
+
+        # threads pipeline (fetch, parse, link check, sink), without network
+        resource = {'name': 'Data', 'created': '2020-01-01', 'format': 'CSV',
+                    'resource_type': 'dataset', 'language': ['en', 'fr'],
+                    'name_translated': {'fr': 'Données'}}
+        datasets = {id: {'id': id, 'title': 'Dataset', 'frequency': 'P1Y',
+                         'organization': {'name': 'aafc-aac',
+                                          'title': 'AAFC | AAC'},
+                         'resources': [{**resource, 'id': f'{id}-res{i}',
+                                        'package_id': id,
+                                        'url': f'https://x.ca/{id}/{i}.csv'}
+                                       for i in range(n)]}
+                    for id, n in (('d1', 2), ('d0', 1))}
+
+        class Registry(Catalogue):
+            def get_dataset(self, id):
+                return datasets[id]
+
+        inventory = Inventory(fetch_workers=2, parse_workers=2,
+                              link_workers=2)
+        with mock.patch.object(TenaciousSession, 'get_url_info',
+                               return_value=UrlInfo(200, 12, 'text/csv')
+                               ) as get_url_info, \
+             contextlib.redirect_stdout(io.StringIO()):
+            inventory.inventory(Registry(), ['d1', 'd0'])
+        self.assertEqual(get_url_info.call_count, 3)
+        self.assertEqual(sorted(inventory.datasets['id']), ['d0', 'd1'])
+        resources = inventory.resources.set_index('id')
+        self.assertEqual(sorted(resources.index),
+                         ['d0-res0', 'd1-res0', 'd1-res1'])
+        self.assertEqual(list(resources.loc['d1-res1', ['dataset_id', 'lang',
+                                                        'url_status', 'size',
+                                                        'content_type']]),
+                         ['d1', 'eng/fra', 200, 12, 'text/csv'])
+        self.assertTrue(resources['url_checked'].notna().all())
+        self.assertEqual(list(inventory.pipeline_stats['stage']),
+                         ['fetch', 'parse', 'link check', 'sink'])
+
+    def test_export_spilled(self):
+
+        resource = {'name': 'Data', 'created': '2020-01-01', 'format': 'Odd',
+                    'resource_type': 'dataset', 'url': 'not a url',
+                    'name_translated': {'fr': 'Données'}, 'language': ['en']}
+        datasets = [{'id': id, 'title': 'Dataset', 'frequency': 'P1Y',
+                     'organization': {'name': 'aafc-aac', 
+                                      'title': 'AAFC | AAC'},
+                     'resources': [{**resource, 'id': f'{id}-res',
+                                    'package_id': id}]}
+                    for id in ('d1', 'd0')]
+        search_page = json.dumps({'success': True, 'result': {
+            'count': 2, 'results': datasets}}).encode()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        inventory = Inventory(parse_processes=1, spill_dir=os.path.join(
+            directory.name, 'spill'))
+        inventory.reprocess([search_page])
+        self.assertTrue(inventory.datasets.empty)
+
+        # platform info is applied to the spilled rows when exported
+        inventory.update_platform_info('catalogue', Catalogue(), ['d1'])
+        with self.assertRaises(ValueError):
+            inventory.update_platform_info('registry', Catalogue())
+        output = io.StringIO()
+        with mock.patch('aafc_data_scanner.inventories.SPILL_CHUNK_ROWS', 1), \
+             contextlib.redirect_stdout(output):
+            datasets_path, resources_path = inventory.export_spilled(
+                directory.name, 'ds.csv', 'res.csv',
+                fill_values={'on_catalogue': False})
+        exported = pd.read_csv(datasets_path, encoding='utf-8-sig')
+        self.assertEqual(list(exported.id), ['d0', 'd1'])
+        self.assertEqual(list(exported.on_catalogue), [False, True])
+        self.assertEqual(list(exported.aafc_org_title.fillna('')),
+                         ['', 'Title'])
+        exported = pd.read_csv(resources_path, encoding='utf-8-sig')
+        self.assertEqual(list(exported.catalogue_link.fillna('')),
+                         ['', CATALOGUE_RESOURCES_BASE_URL.format('d1',
+                                                                  'd1-res')])
+        self.assertEqual(list(exported.url_status), [-1, -1])
+
+        # unknown formats of all chunks are reported once
+        self.assertEqual(inventory.unknown_formats.to_dict(), {'Odd': 2})
+        self.assertEqual(
+            output.getvalue().count('unknown to the open formats check'), 1)
+        # (violations' rows are numbered as in the exported files)
+        violations = inventory.violations[
+            inventory.violations.table == 'resources']
+        self.assertEqual(list(zip(violations.row, violations.check)),
+                         [(0, 'format: uri'), (1, 'format: uri')])
+        inventory.discard_spilled()
+
+    def test_records(self):
+
+        record = ResourceRecord()
+        self.assertEqual(len(record.as_tuple()), len(RESOURCES_COLS))
+        self.assertIsNone(record['title_fr'])
+        record['id'] = 'abc'
+        self.assertEqual(record.id, 'abc')
+        self.assertEqual(record.get('not_a_column', 0), 0)
+        with self.assertRaises(KeyError):
+            record['not_a_column'] = 1
+        with self.assertRaises(AttributeError):
+            record.__dict__
+
+        resources = as_dtypes(pd.DataFrame.from_records(
+            [ResourceRecord.from_mapping({'id': 'abc', 'url_status': 200,
+                                          'other': 'ignored'}).as_tuple()],
+            columns=RESOURCES_COLS), RESOURCES_DTYPES)
+        self.assertEqual(list(resources.columns), RESOURCES_COLS)
+        self.assertEqual(resources.loc[0, 'url_status'], 200)
+        self.assertTrue(pd.isna(resources.loc[0, 'metadata_modified']))
+
+    def test_normalize(self):
+
+        datasets = pd.DataFrame(columns=DATASETS_COLS)
+        datasets['published'] = ['2020-01-01T12:30:00-05:00', 'May 3 2018',
+                                 'not a date', None]
+        datasets['notes_en'] = ['a\r\n  b\t', None, 5, '']
+        datasets['maintainer_email'] = ['John.MacDonald@x.ca', None,
+                                        'A-B_C@x', '']
+        datasets['org_title'] = ['Agri | Agri FR', '', None, 'Agri']
+        actual = Inventory.normalize_datasets(datasets)
+        self.assertEqual(list(actual['published']),
+                         ['2020-01-01T17:30:00', '2018-05-03T00:00:00',
+                          'not a date', None])
+        self.assertEqual(list(actual['notes_en']), ['a b', '', '', ''])
+        self.assertEqual(list(actual['maintainer_name']),
+                         ['John MacDonald', '', 'A B C', ''])
+        self.assertEqual(list(actual['org_title'][:2]), ['Agri', ''])
+
+        resources = pd.DataFrame(columns=RESOURCES_COLS)
+        resources['lang'] = [['en', 'fr'], 'fr', [], None]
+        resources['url'] = ['https://x', 'file://x', 'http://x', None]
+        actual = Inventory.normalize_resources(resources)
+        self.assertEqual(list(actual['lang']), ['eng/fra', 'fra', '', ''])
+        self.assertEqual(list(actual['https']), [True, True, False, False])
+
+    def test_reprocess(self):
+
+        resource = {'id': 'r1', 'name': 'Data', 'created': '2020-01-01',
+                    'format': 'CSV', 'package_id': 'd1',
+                    'resource_type': 'dataset', 'url': 'not a url',
+                    'name_translated': {'fr': 'Données'},
+                    'language': ['en', 'fr']}
+        dataset = {'id': 'd1', 'title': 'Dataset', 'frequency': 'P1Y',
+                   'date_published': '2020-01-01 00:00:00',
+                   'organization': {'name': 'aafc-aac', 
+                                    'title': 'AAFC | AAC'},
+                   'resources': [resource]}
+        search_page = json.dumps({'success': True, 'result': {
+            'count': 2, 'results': [dataset, {**dataset, 'id': 'd0',
+                                              'resources': []}]}}).encode()
+        datasets, resources = parse_payloads([search_page])
+        self.assertEqual(list(datasets['id']), ['d1', 'd0'])
+        self.assertEqual(datasets.loc[0, 'org_title'], 'AAFC')
+        self.assertEqual(resources.loc[0, 'lang'], 'eng/fra')
+
+        inventory = Inventory(parse_processes=2)
+        inventory.reprocess([search_page])
+        self.assertEqual(list(inventory.datasets['id']), ['d0', 'd1'])
+        self.assertEqual(inventory.resources.loc[0, 'url_status'], -1)
+        self.assertEqual(inventory.datasets.dtypes.astype(str).to_dict(),
+                         {c: str(pd.api.types.pandas_dtype(d))
+                          for c, d in DATASETS_DTYPES.items()})
 
     # there is no test_inventory
     # no way to plan the whole expected output other than by the code itself
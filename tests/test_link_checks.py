@@ -0,0 +1,204 @@
+"""This code tests the link checks functions and is intended to be run from 
+project's top folder using:
+  py -m unittest tests.test_link_checks
+Use -v for more verbose.
+"""
+
+from aafc_data_scanner.link_checks import *
+from aafc_data_scanner.tools import CircuitBreaker
+
+import http.server
+import os
+import pandas as pd
+import socketserver
+import threading
+import time
+import unittest
+from unittest import mock
+
+
+class TestLinkChecks(unittest.TestCase):
+
+    def test_refresh_url_statuses(self):
+
+        df = pd.DataFrame({
+            'id': ['1', '2', '3', '4'],
+            'url': ['https://example.com/a.csv', 'https://example.com/b.csv',
+                    'https://example.com/a.csv', None],
+            'url_status': ['404', '200', '404', '200'],
+        })
+        statuses = {'https://example.com/a.csv': UrlInfo(200, 12, 'text/csv'),
+                    'https://example.com/b.csv': UrlInfo(503)}
+        with mock.patch('aafc_data_scanner.link_checks.check_url',
+                        side_effect=lambda _, url: statuses[url]) as check:
+            actual = refresh_url_statuses(df, max_workers=2)
+            # each distinct url is only checked once
+            self.assertEqual(check.call_count, 2)
+        self.assertEqual(list(actual['url_status']), ['200', '503', '200', '-1'])
+        self.assertEqual(list(actual['size']), ['12', None, '12', None])
+        self.assertEqual(list(actual['content_type']),
+                         ['text/csv', None, 'text/csv', None])
+
+        self.assertEqual(
+            check_url(TenaciousSession(), '\\\\share\\file.csv').status, -1)
+
+    def test_check_urls_deadline(self):
+
+        # deadline reached while the first urls are checked: no new request
+        def slow_check(_, url):
+            time.sleep(0.2)
+            return UrlInfo(200)
+
+        urls = [f'https://example.com/{i}.csv' for i in range(6)]
+        with mock.patch('aafc_data_scanner.link_checks.check_url',
+                        side_effect=slow_check) as check:
+            actual = check_urls(urls, max_workers=2,
+                                deadline=time.monotonic() + 0.1)
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual(sorted(actual), urls[:2])
+
+    def test_prioritize(self):
+
+        df = pd.DataFrame({
+            'url': ['https://a.ca/ok_recent', 'https://a.ca/ok_old',
+                    'https://a.ca/broken', 'https://a.ca/new',
+                    'https://a.ca/failed', None],
+            'url_status': ['200', '301', '404', None, '-1', '-1'],
+            'url_checked': ['2024-06-02T00:00:00', '2024-06-01T00:00:00',
+                            '2024-06-03T00:00:00', None,
+                            '2024-06-04T00:00:00', None],
+        })
+        self.assertEqual(LinkCheckScheduler.prioritize(df),
+                         ['https://a.ca/new', 'https://a.ca/broken',
+                          'https://a.ca/failed', 'https://a.ca/ok_old',
+                          'https://a.ca/ok_recent'])
+
+    def test_run_out_of_budget(self):
+
+        df = pd.DataFrame({
+            'url': ['https://example.com/a.csv'],
+            'url_status': ['404'],
+            'url_checked': ['2024-06-01T00:00:00'],
+        })
+        with mock.patch('aafc_data_scanner.link_checks.check_url') as check:
+            actual = LinkCheckScheduler(budget=0).run(df)
+            check.assert_not_called()
+        # deferred url keeps its previous status
+        self.assertEqual(list(actual['url_status']), ['404'])
+        self.assertEqual(list(actual['url_checked']), ['2024-06-01T00:00:00'])
+
+    def test_async_link_checker_rules(self):
+
+        # same semantics as TenaciousSession, without network for these urls
+        breaker = CircuitBreaker(threshold=1, cooldown=3600)
+        breaker.record_failure('down.example.com')
+        urls = ['file://intranet/share/data.csv',
+                '\\\\share\\file.csv', 'not a url', None,
+                'https://down.example.com/file.csv']
+        with mock.patch.object(TenaciousSession, 'circuit_breaker', breaker):
+            actual = AsyncLinkChecker().check_all(urls)
+        self.assertEqual({url: info.status for url, info in actual.items()},
+                         {urls[0]: -1, urls[1]: -1, urls[2]: -1, urls[4]: -2})
+
+    def test_async_link_checker_proxy(self):
+
+        # proxy answering 200 to requests and 407 to tunnels
+        request_lines = []
+
+        class Proxy(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline().decode().strip()
+                request_lines.append(line)
+                while self.rfile.readline() not in (b'\r\n', b''):
+                    pass
+                status = '407 Proxy Authentication Required' if (
+                    line.startswith('CONNECT')) else '200 OK'
+                self.wfile.write(f'HTTP/1.1 {status}\r\nContent-Length: 0'
+                                 '\r\nConnection: close\r\n\r\n'.encode())
+
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Proxy)
+        self.addCleanup(server.server_close)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        proxy = f'http://127.0.0.1:{server.server_address[1]}'
+        environ = {'http_proxy': proxy, 'https_proxy': proxy, 'no_proxy': '',
+                   'HTTP_PROXY': proxy, 'HTTPS_PROXY': proxy, 'NO_PROXY': ''}
+        urls = ['http://files.example.com/data.csv?lang=en',
+                'https://secure.example.com/data.csv']
+        with mock.patch.dict(os.environ, environ), \
+             mock.patch.object(TenaciousSession, 'circuit_breaker',
+                               CircuitBreaker()):
+            actual = AsyncLinkChecker(retries=0).check_all(urls)
+        self.assertEqual({url: info.status for url, info in actual.items()},
+                         {urls[0]: 200, urls[1]: -1})
+        self.assertEqual(sorted(request_lines), [
+            'CONNECT secure.example.com:443 HTTP/1.1',
+            'HEAD http://files.example.com/data.csv?lang=en HTTP/1.1'])
+
+    def test_async_link_checker_server(self):
+
+        # server rejecting HEAD on /nohead, redirecting /redir and missing
+        # /missing urls
+        requests_seen = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                requests_seen.append((self.command, self.path,
+                                      self.headers.get('Range')))
+                if self.path.startswith('/nohead') and self.command == 'HEAD':
+                    self.send_response(405)
+                elif self.path == '/redir':
+                    self.send_response(302)
+                    self.send_header('Location', '/file.csv')
+                elif self.path.endswith('/missing'):
+                    self.send_response(404)
+                else:
+                    # answers the ranged GET with its first byte
+                    self.send_response(206)
+                    self.send_header('Content-Range', 'bytes 0-0/1000')
+                    self.send_header('Content-Type', 'text/csv')
+                body = b'x' if self.command == 'GET' else b''
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_HEAD
+
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.addCleanup(server.server_close)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        base = f'http://127.0.0.1:{server.server_address[1]}'
+        urls = [f'{base}/nohead/data.csv', f'{base}/redir',
+                f'{base}/atlas/rest/services/x',
+                f'{base}/atlas/rest/services/missing']
+        environ = {'no_proxy': '*', 'NO_PROXY': '*'}
+        with mock.patch.dict(os.environ, environ), \
+             mock.patch.dict(TenaciousSession.host_methods, clear=True), \
+             mock.patch.object(TenaciousSession, 'circuit_breaker',
+                               CircuitBreaker()):
+            actual = AsyncLinkChecker(max_connections=1).check_all(urls)
+            # GET fallback is remembered for the host
+            self.assertEqual(TenaciousSession.host_methods,
+                             {f'127.0.0.1:{server.server_address[1]}': 'GET'})
+        # (atlas services are found, or missing)
+        self.assertEqual(actual, {urls[0]: UrlInfo(200, 1000, 'text/csv'),
+                                  urls[1]: UrlInfo(200, 1000, 'text/csv'),
+                                  urls[2]: UrlInfo(300),
+                                  urls[3]: UrlInfo(404)})
+        self.assertEqual(requests_seen, [
+            ('HEAD', '/nohead/data.csv', None),
+            ('GET', '/nohead/data.csv', 'bytes=0-0'),
+            ('GET', '/redir', 'bytes=0-0'),
+            ('GET', '/file.csv', 'bytes=0-0'),
+            ('GET', '/atlas/rest/services/x', 'bytes=0-0'),
+            ('GET', '/atlas/rest/services/missing', 'bytes=0-0')])
+
+
+if __name__ == '__main__':
+    unittest.main()
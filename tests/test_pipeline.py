@@ -0,0 +1,74 @@
+"""This code tests the Pipeline class implemented in pipeline.py and is
+intended to be run from project's top folder using:
+  py -m unittest tests.test_pipeline
+Use -v for more verbose.
+"""
+
+from aafc_data_scanner.pipeline import *
+
+import threading
+import unittest
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_run(self):
+
+        sunk = []
+        pipeline = Pipeline([Stage('split', lambda n: [n] * n, 3),
+                             Stage('fail', lambda n: [n // (n - 2)], 4),
+                             Stage('sink', lambda n: sunk.append(n) or [])],
+                            queue_size=2)
+        pipeline.run(range(1, 6))
+        # both copies of 2 fail, other copies go through all stages
+        self.assertEqual(sorted(sunk), [-1] + [1] * 5 + [2] * 4 + [3] * 3)
+        stats = pipeline.stats().set_index('stage')
+        self.assertEqual(stats.loc['split', 'items_out'], 15)
+        self.assertEqual(stats.loc['fail', 'errors'], 2)
+        self.assertEqual(stats.loc['sink', 'items_in'], 13)
+
+    def test_flush(self):
+
+        batch, batches = [], []
+
+        def add(n):
+            batch.append(n)
+            return flush() if len(batch) == 3 else []
+
+        def flush():
+            full_batch = batch.copy()
+            batch.clear()
+            return [full_batch] if full_batch else []
+
+        pipeline = Pipeline([Stage('batch', add, 1, flush),
+                             Stage('sink', lambda b: batches.append(b) or [])])
+        pipeline.run(range(7))
+        self.assertEqual(batches, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_backpressure(self):
+
+        produced = []
+        release = threading.Event()
+
+        def produce(n):
+            produced.append(n)
+            return [n]
+
+        def slow_sink(n):
+            release.wait()
+            return []
+
+        pipeline = Pipeline([Stage('produce', produce),
+                             Stage('sink', slow_sink)], queue_size=1)
+        thread = threading.Thread(target=pipeline.run, args=(range(100),))
+        thread.start()
+        thread.join(0.5)
+        # at most one item waiting per queue, one per worker in each stage
+        self.assertLessEqual(len(produced), 4)
+        release.set()
+        thread.join()
+        self.assertEqual(len(produced), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""This code tests the PreviousInventory class implemented in previous.py and
+is intended to be run from project's top folder using:
+  py -m unittest tests.test_previous
+Use -v for more verbose.
+"""
+
+from aafc_data_scanner.constants import *
+from aafc_data_scanner.previous import *
+
+import datetime as dt
+import os
+import tempfile
+import unittest
+
+
+class TestPreviousInventory(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        datasets = pd.DataFrame([{
+            'id': 'ds-1', 'metadata_modified': '2024-01-01T00:00:00',
+            'title_en': 'Title', 'org': 'aafc-aac', 'on_registry': True,
+            'aafc_org': 'aafc', 'on_catalogue': True, 'num_resources': 2,
+        }], columns=DATASETS_COLS)
+        resources = pd.DataFrame([{
+            'id': 'res-1', 'metadata_modified': '2024-01-02T00:00:00',
+            'url': 'http://a.ca/1.csv', 'dataset_id': 'ds-1',
+            'lang': 'eng/fra', 'url_status': 200,
+            'url_checked': '2024-03-01T10:00:00', 'size': 10,
+            'registry_link': 'reg', 'catalogue_link': 'cat',
+        }, {
+            'id': 'res-2', 'url': 'http://a.ca/2.csv', 'dataset_id': 'ds-1',
+            'lang': 'fra', 'url_status': 404,
+            'url_checked': '2024-01-01T10:00:00',
+            'registry_link': 'reg', 'catalogue_link': 'cat',
+        }], columns=RESOURCES_COLS).astype({'size': 'Int64'})
+        datasets.to_csv(os.path.join(directory.name, 'ds.csv'), index=False,
+                        encoding='utf_8_sig')
+        resources.to_csv(os.path.join(directory.name, 'res.csv'),
+                         index=False, encoding='utf_8_sig')
+        self.previous = PreviousInventory.load(
+            directory.name, 'ds.csv', 'res.csv', dt.datetime(2024, 3, 5))
+
+    def test_load(self):
+
+        self.assertEqual(list(self.previous.datasets),
+                         [('ds-1', '2024-01-01T00:00:00')])
+        self.assertEqual(list(self.previous.resources),
+                         [('res-1', '2024-01-02T00:00:00',
+                           'http://a.ca/1.csv'),
+                          ('res-2', '', 'http://a.ca/2.csv')])
+        row = self.previous.datasets[('ds-1', '2024-01-01T00:00:00')]
+        self.assertIs(row['on_registry'], True)
+        self.assertIsNone(row['published'])
+        # url check of res-2 is too old to be reused
+        self.assertEqual(self.previous.resources[
+            ('res-1', '2024-01-02T00:00:00', 'http://a.ca/1.csv')
+        ]['url_status'], 200)
+        self.assertIsNone(self.previous.resources[
+            ('res-2', '', 'http://a.ca/2.csv')]['url_status'])
+        empty = PreviousInventory.load('./no/such/folder/')
+        self.assertEqual((empty.datasets, empty.resources), ({}, {}))
+
+    def test_records(self):
+
+        dataset = {'id': 'ds-1', 'metadata_modified': '2024-01-01T00:00:00'}
+        record = self.previous.dataset_record(dataset)
+        self.assertEqual((record['title_en'], record['org'],
+                          record['on_registry']), ('Title', 'aafc-aac', True))
+        # other platform's columns are left empty, as when parsing
+        self.assertEqual((record['aafc_org'], record['on_catalogue']),
+                         (None, None))
+        record = self.previous.dataset_record(dataset, from_catalogue=True)
+        self.assertEqual((record['org'], record['aafc_org']),
+                         (None, 'aafc'))
+        self.assertIsNone(self.previous.dataset_record(
+            {'id': 'ds-1', 'metadata_modified': '2024-06-01T00:00:00'}))
+
+        resource = {'id': 'res-1', 'metadata_modified': '2024-01-02T00:00:00',
+                    'url': 'http://a.ca/1.csv'}
+        record = self.previous.resource_record(resource)
+        self.assertEqual((record['lang'], record['url_status'], record['size'],
+                          record['registry_link'], record['catalogue_link']),
+                         ('eng/fra', 200, 10, 'reg', None))
+        self.assertIsNone(self.previous.resource_record(
+            {**resource, 'url': 'http://a.ca/moved.csv'}))
+        record = self.previous.resource_record({'id': 'res-2',
+                                                'url': 'http://a.ca/2.csv'})
+        self.assertIsNone(record['url_status'])
+        self.assertEqual(dict(self.previous.reused),
+                         {'datasets': 2, 'resources': 2, 'url statuses': 1})
+
+    def test_track(self):
+
+        dataset = {'id': 'ds-1', 'metadata_modified': '2024-01-01T00:00:00'}
+        record = self.previous.dataset_record(dataset)
+        fresh = self.previous.resource_record(
+            {'id': 'res-1', 'metadata_modified': '2024-01-02T00:00:00',
+             'url': 'http://a.ca/1.csv'})
+        stale = self.previous.resource_record({'id': 'res-2',
+                                               'url': 'http://a.ca/2.csv'})
+        # res-2's url status is to be checked again
+        self.previous.track(dataset, record, [fresh, stale])
+        # a resource was lost
+        self.previous.track(dataset, record, [fresh])
+        # a resource is new
+        self.previous.track(dataset, record, [fresh, fresh, None])
+        self.previous.track(dataset, None, [fresh, fresh])
+        self.assertEqual(self.previous.unchanged, set())
+        self.previous.track(dataset, record, [fresh, fresh])
+        self.assertEqual(self.previous.unchanged, {'ds-1'})
+
+    def test_reuse_url_statuses(self):
+
+        resources = pd.DataFrame(columns=RESOURCES_COLS,
+                                 index=[5, 7]).astype(RESOURCES_DTYPES)
+        resources[['id', 'metadata_modified', 'url']] = [
+            ['res-1', '2024-01-02T00:00:00', 'http://a.ca/1.csv'],
+            ['res-2', None, 'http://a.ca/2.csv']]
+        resources = self.previous.reuse_url_statuses(resources)
+        self.assertEqual(resources.url_status.tolist(), [200, pd.NA])
+        self.assertEqual(resources.url_checked.tolist(),
+                         ['2024-03-01T10:00:00', pd.NA])
+        self.assertEqual(str(resources.url_status.dtype), 'Int64')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""This code tests the SpillFile and ChunkWriter classes implemented in
+spill.py and is intended to be run from project's top folder using:
+  py -m unittest tests.test_spill
+Use -v for more verbose.
+"""
+
+from aafc_data_scanner.spill import *
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestSpill(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def spill_file(self, name, key, **kwargs):
+        return SpillFile.create(self.directory.name, name, ['id', 'n'],
+                                {'id': 'string', 'n': 'Int64'}, key,
+                                run_rows=4, block_rows=3, **kwargs)
+
+    def test_iter_rows(self):
+
+        spill = self.spill_file('rows', 'id',
+                                normalize=lambda df: df.assign(n=df.n * 10))
+        ids = ['e', 'b', None, 'a', 'd', 'b', 'c', 'a', 'f', 'b']
+        for n, id in enumerate(ids):
+            spill.append((id, n))
+        spill.append_frame(pd.DataFrame({'id': ['c'], 'n': [-1]}))
+        self.assertEqual(spill.rows, 11)
+        self.assertEqual(len(spill.runs), 2)
+        rows = list(spill.iter_rows())
+        self.assertEqual(len(spill.runs), 3)
+        # sorted by id, missing ids last, equal ids in order of appending
+        self.assertEqual([row[0] for row in rows],
+                         ['a', 'a', 'b', 'b', 'b', 'c', 'c', 'd', 'e', 'f',
+                          pd.NA])
+        self.assertEqual([row[1] for row in rows[:-1]
+                          if row[0] in ('b', 'c')],
+                         [10, 50, 90, 60, -1])
+        chunks = list(spill.iter_chunks(4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 3])
+        self.assertEqual(str(chunks[0].n.dtype), 'Int64')
+        spill.remove()
+        self.assertFalse(os.path.exists(spill.directory))
+
+    def test_iter_matched_chunks(self):
+
+        left = self.spill_file('left', 'id')
+        right = self.spill_file('right', 'id')
+        for id in ['c', 'a', 'e', 'b', 'd']:
+            left.append((id, 0))
+        for id in ['e', 'a', 'a', 'z', 'c', 'b', None, 'd', 'e']:
+            right.append((id, 1))
+        matched = [(list(l.id), list(r.id.fillna('-')))
+                   for l, r in iter_matched_chunks(left, right, 2)]
+        self.assertEqual(matched, [(['a', 'b'], ['a', 'a', 'b']),
+                                   (['c', 'd'], ['c', 'd']),
+                                   (['e'], ['e', 'e']),
+                                   ([], ['z', '-'])])
+
+    def test_chunk_writer(self):
+
+        path = os.path.join(self.directory.name, 'out.csv')
+        with ChunkWriter(path) as writer:
+            writer.write(pd.DataFrame({'id': ['é'], 'n': [1]}))
+            writer.write(pd.DataFrame({'id': ['b'], 'n': [2]}))
+        self.assertEqual(writer.chunks, 2)
+        self.assertTrue(pd.read_csv(path, encoding='utf_8_sig').equals(
+            pd.DataFrame({'id': ['é', 'b'], 'n': [1, 2]})))
+
+        # (Parquet files require pyarrow, an optional dependency)
+        path = os.path.join(self.directory.name, 'out.parquet')
+        with mock.patch('aafc_data_scanner.spill.find_spec',
+                        return_value=None):
+            with self.assertRaisesRegex(ImportError, 'pyarrow'):
+                ChunkWriter(path)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
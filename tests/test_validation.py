@@ -0,0 +1,100 @@
+"""This code tests the Validator class implemented in validation.py and is
+intended to be run from project's top folder using:
+  py -m unittest tests.test_validation
+Use -v for more verbose.
+"""
+
+from aafc_data_scanner.validation import *
+
+import json
+import unittest
+
+
+class TestValidator(unittest.TestCase):
+
+    def test_validate(self):
+
+        validator = Validator.compile('things', {
+            'fields': [
+                {'name': 'id', 'type': 'string',
+                 'constraints': {'required': True}},
+                {'name': 'n', 'type': 'integer',
+                 'constraints': {'minimum': 1}},
+                {'name': 'when', 'type': 'datetime'},
+                {'name': 'every', 'type': 'duration'},
+                {'name': 'flag', 'type': 'boolean'},
+                {'name': 'email', 'type': 'string', 'format': 'email'},
+                {'name': 'lang', 'type': 'string',
+                 'constraints': {'pattern': '[a-z]{3}(/[a-z]{3})*',
+                                 'enum': ['eng', 'fra', 'eng/fra']}},
+                {'name': 'absent', 'type': 'string'},
+            ],
+            'primaryKey': 'id'})
+        df = pd.DataFrame({
+            'id': ['a', 'b', 'b', ' '],
+            'n': pd.array([1, 0, None, 3], dtype='Int64'),
+            'when': ['2024-01-01T10:00:00', 'yesterday', None, '2024-02-30'],
+            'every': ['P1Y', 'PT1S', 'not_planned', 'P'],
+            'flag': pd.array([True, None, False, True], dtype='boolean'),
+            'email': ['a@b.ca', 'nobody', '', None],
+            'lang': ['eng/fra', 'en', 'deu', None],
+            'absent': ['x'] * 4,
+        }).drop(columns='absent')
+        violations = validator.validate(df)
+        self.assertEqual(list(violations.columns), VIOLATIONS_COLS)
+        self.assertEqual(
+            sorted(zip(violations.field, violations.check,
+                       [-1 if pd.isna(row) else row
+                        for row in violations.row])),
+            sorted([('id', 'required', 3), ('n', 'minimum: 1', 1),
+                    ('when', 'type: datetime', 1),
+                    ('when', 'type: datetime', 3),
+                    ('every', 'type: duration', 3),
+                    ('email', 'format: email', 1),
+                    ('email', 'format: email', 2),
+                    ('lang', 'pattern: [a-z]{3}(/[a-z]{3})*', 1),
+                    ('lang', 'enum', 1), ('lang', 'enum', 2),
+                    ('absent', 'missing column', -1),
+                    ('id', 'unique', 1), ('id', 'unique', 2)]))
+        self.assertEqual(
+            violations.loc[violations.check == 'minimum: 1', 'id'].item(), 'b')
+
+    def test_validate_inventory(self):
+
+        datasets = pd.DataFrame({'id': ['a'], 'num_resources': [1]})
+        resources = pd.DataFrame({'id': ['r1', 'r2'],
+                                  'dataset_id': ['a', 'z'],
+                                  'lang': ['eng', 'english']})
+        violations = validate_inventory(datasets, resources)
+        checks = violations[violations.check != 'missing column']
+        self.assertEqual(
+            list(zip(checks.table, checks.id, checks.check)),
+            [('resources', 'r2', 'pattern: [a-z]{3}(/[a-z]{3})*'),
+             ('resources', 'r2', 'foreign key')])
+        self.assertIn('frequency', set(violations.field))
+
+    def test_schemas_documentation(self):
+
+        # schemas validated are the documented ones (without the fields'
+        # titles, descriptions, examples and RDF types)
+        documented_keys = ['name', 'type', 'format']
+        constraint_keys = ['required', 'minimum', 'maximum', 'pattern', 'enum']
+        for schema, filename in [
+                (DATASETS_SCHEMA, 'datasets_inventories_schema.json'),
+                (RESOURCES_SCHEMA, 'resources_inventory_schema.json')]:
+            with open(f'documentation/{filename}', encoding='utf-8') as f:
+                documentation = json.load(f)
+            self.assertEqual(schema['primaryKey'],
+                             documentation['primaryKey'])
+            self.assertEqual(
+                [({k: spec[k] for k in documented_keys if k in spec},
+                  {k: v for k, v in spec.get('constraints', {}).items()
+                   if k in constraint_keys})
+                 for spec in documentation['fields']],
+                [({k: spec[k] for k in documented_keys if k in spec},
+                  spec.get('constraints', {}))
+                 for spec in schema['fields']], filename)
+
+
+if __name__ == '__main__':
+    unittest.main()